@@ -1,20 +1,104 @@
-from flask import Flask, render_template, jsonify, request, send_file, make_response
+from flask import Flask, render_template, jsonify, request, send_file, make_response, g, Response, has_request_context, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+from werkzeug.exceptions import HTTPException
 from datetime import datetime, timedelta
 import json
 import os
+import re
+import string
+import logging
 import shutil
 import csv
+import time
+import random
+import cProfile
+import threading
+import socket
+import atexit
+import sqlite3
+from collections import Counter, OrderedDict, defaultdict, deque
+from itertools import chain
 from io import StringIO, BytesIO
 import zipfile
+import gzip
+import hashlib
+import tempfile
+import click
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+try:
+    import numpy as np
+except ImportError:  # Analysen sind optional, der Rest läuft ohne NumPy
+    np = None
 
 # Flask App erstellen
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///kaktus.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('KAKTUS_DATABASE_URI', 'sqlite:///kaktus.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'kaktus-secret-2024'
 
+# Profiling: Anteil der Requests, die mit cProfile aufgezeichnet werden (0 = aus, 1 = alle)
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('KAKTUS_PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_DIR'] = 'profiles'
+
+# SQL-Logging: Schwelle für langsame Statements und Wiederholungen für N+1-Erkennung
+app.config['SLOW_QUERY_MS'] = float(os.environ.get('KAKTUS_SLOW_QUERY_MS', '100'))
+app.config['N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('KAKTUS_N_PLUS_ONE_THRESHOLD', '5'))
+# SQL-Report als Response-Header und unter /api/debug/sql (im Debug-Modus, KAKTUS_DEBUG=1, immer aktiv)
+app.config['SQL_DEBUG'] = os.environ.get('KAKTUS_SQL_DEBUG') == '1'
+
+# SQLite-Schreibkonflikte: Wartezeit auf Sperren, Journal-Modus und Wiederholungen
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = 5000
+app.config['SQLITE_JOURNAL_MODE'] = 'WAL'
+app.config['WRITE_RETRIES'] = 4
+app.config['WRITE_RETRY_BACKOFF'] = 0.05  # Sekunden, verdoppelt sich pro Versuch
+
+# Hintergrund-Jobs: Worker-Threads, Ablage der Ergebnisdateien, Aufbewahrung
+app.config['JOB_WORKERS'] = 2
+app.config['JOB_DIR'] = 'jobs'
+app.config['JOB_RETENTION_DAYS'] = 7
+# Lebenszeichen laufender Jobs; ohne Meldung seit 4 Intervallen gilt ein Job als abgebrochen
+app.config['JOB_HEARTBEAT_SECONDS'] = 30
+
+# Archiv: Tagebucheinträge und Pflegeaktionen älter als ARCHIVE_AFTER_DAYS wandern ins Archiv
+app.config['ARCHIVE_AFTER_DAYS'] = 730
+app.config['ARCHIVE_CHUNK_SIZE'] = 2000
+
+# Backups: Zielordner, Anzahl aufbewahrter Sicherungen, Intervall (0 = kein automatisches Backup)
+app.config['BACKUP_DIR'] = 'backups'
+app.config['BACKUP_KEEP'] = 14
+app.config['BACKUP_INTERVAL_HOURS'] = 24
+app.config['BACKUP_COMPRESS'] = True
+# Seiten pro Kopierschritt und Pause dazwischen, damit Schreibzugriffe nicht warten müssen
+app.config['BACKUP_PAGES_PER_STEP'] = 256
+app.config['BACKUP_STEP_PAUSE'] = 0.01
+
+# Live-Updates (/api/events): gepufferte Commits für Wiederaufnahme, Keepalive und Reconnect-Pause
+app.config['EVENT_BUFFER_SIZE'] = 1000
+app.config['EVENT_KEEPALIVE'] = 15  # Sekunden
+app.config['EVENT_RETRY_MS'] = 3000
+
+# Offline-Sync (/api/batch): maximale Änderungen pro Batch, Aufbewahrung der Idempotenz-Einträge
+app.config['BATCH_MAX_MUTATIONS'] = 200
+app.config['BATCH_RETENTION_DAYS'] = 30
+
+# Telemetrie (/api/telemetry): Schreibpuffer für Sensorwerte - Intervall, sofortiges Schreiben ab n Werten, Werte pro Request
+app.config['TELEMETRY_FLUSH_SECONDS'] = 2
+app.config['TELEMETRY_FLUSH_SIZE'] = 5000
+app.config['TELEMETRY_MAX_BATCH'] = 2000
+
+# Pflegeregeln: saisonale Hinweise, Meilensteine und Sämlingswarnungen (wird beim Start eingelesen)
+app.config['CARE_RULES_FILE'] = os.environ.get('KAKTUS_CARE_RULES', os.path.join(app.root_path, 'care_rules.json'))
+
 # Erweiterungen
 db = SQLAlchemy(app)
 CORS(app)
@@ -33,25 +117,31 @@ class Species(db.Model):
     temperature_max = db.Column(db.Integer, default=30)
     watering_summer = db.Column(db.String(200), default='Mäßig, wenn Substrat trocken')
     watering_winter = db.Column(db.String(200), default='Sehr sparsam bis gar nicht')
+    # Aus den Gießtexten abgeleitet (parse_watering_interval): Tage zwischen Gießvorgängen, 0 = trocken halten
+    water_days_summer = db.Column(db.Integer)
+    water_days_winter = db.Column(db.Integer)
+    # Aus germination_time abgeleitet (parse_germination_window): erwartetes Keimfenster in Tagen
+    germination_min_days = db.Column(db.Integer)
+    germination_max_days = db.Column(db.Integer)
     light_requirements = db.Column(db.String(200), default='Hell, aber keine pralle Mittagssonne')
     special_care = db.Column(db.Text)
     user_created = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Beziehungen
-    sowings = db.relationship('Sowing', backref='species', lazy=True, cascade='all, delete-orphan')
-    plants = db.relationship('Plant', backref='species', lazy=True, cascade='all, delete-orphan')
+    # Beziehungen - gelöscht wird per ON DELETE CASCADE in der Datenbank, nicht Zeile für Zeile im ORM
+    sowings = db.relationship('Sowing', backref='species', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    plants = db.relationship('Plant', backref='species', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
 
 class Sowing(db.Model):
     """Aussaat-Tracking"""
     id = db.Column(db.Integer, primary_key=True)
-    species_id = db.Column(db.Integer, db.ForeignKey('species.id'), nullable=False)
-    sowing_date = db.Column(db.Date, nullable=False)
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), nullable=False)
+    sowing_date = db.Column(db.Date, nullable=False, index=True)
     seed_count = db.Column(db.Integer, nullable=False)
     pot_number = db.Column(db.String(50), nullable=False)
-    germinated = db.Column(db.Boolean, default=False)
-    germination_date = db.Column(db.Date)
+    germinated = db.Column(db.Boolean, default=False, index=True)
+    germination_date = db.Column(db.Date, index=True)
     germinated_count = db.Column(db.Integer, default=0)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -75,13 +165,15 @@ class Sowing(db.Model):
 class Plant(db.Model):
     """Pflanzenbestand"""
     id = db.Column(db.Integer, primary_key=True)
-    species_id = db.Column(db.Integer, db.ForeignKey('species.id'), nullable=False)
-    purchase_date = db.Column(db.Date, nullable=False)
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), nullable=False)
+    purchase_date = db.Column(db.Date, nullable=False, index=True)
     location = db.Column(db.String(200))
     substrate = db.Column(db.String(200))
     notes = db.Column(db.Text)
-    last_watered = db.Column(db.Date)
+    last_watered = db.Column(db.Date, index=True)
     last_fertilized = db.Column(db.Date)
+    from_sowing = db.Column(db.Boolean, default=False)
+    sowing_id = db.Column(db.Integer, db.ForeignKey('sowing.id', ondelete='SET NULL'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     @property
@@ -98,14 +190,697 @@ class DiaryEntry(db.Model):
     """Tagebucheinträge"""
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
-    species_id = db.Column(db.Integer, db.ForeignKey('species.id'))
-    species = db.relationship('Species', backref='diary_entries')
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='SET NULL'))
+    species = db.relationship('Species', backref=db.backref('diary_entries', passive_deletes=True))
     note = db.Column(db.Text, nullable=False)
-    entry_type = db.Column(db.String(50), default='general')  # general, watering, fertilizing, repotting
+    entry_type = db.Column(db.String(50), default='general')  # general, watering, fertilizing, repotting; gesicherte Historie: water, fertilize, repot, germination
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class CacheVersion(db.Model):
+    """Versionszähler pro Cache-Bereich für prozessübergreifende Invalidierung"""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class Job(db.Model):
+    """Hintergrund-Jobs (Exporte, Backups, Wartung, Importe)"""
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    progress = db.Column(db.Integer, default=0)  # Prozent
+    message = db.Column(db.String(200))
+    params = db.Column(db.Text)  # JSON
+    result = db.Column(db.Text)  # JSON
+    result_file = db.Column(db.String(300))
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    owner = db.Column(db.String(100))  # Prozess, der den Job ausführt (Host:PID:Kennung)
+    heartbeat_at = db.Column(db.DateTime)  # letztes Lebenszeichen dieses Prozesses
+
+# ==================== MONITORING ====================
+
+# Histogramm-Grenzen für Request-Latenzen (Sekunden)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class RequestMetrics:
+    """Latenz-Histogramme, SQL-Zähler und DB-Zeit pro Endpoint (threadsicher)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._lock_wait = {'buckets': [0] * len(buckets), 'count': 0, 'sum': 0.0}
+        self._counters = {}
+
+    def observe(self, endpoint, method, status, duration, sql_count, sql_time):
+        with self._lock:
+            entry = self._endpoints.get((endpoint, method))
+            if entry is None:
+                entry = self._endpoints[(endpoint, method)] = {
+                    'buckets': [0] * len(self.buckets),
+                    'count': 0,
+                    'sum': 0.0,
+                    'sql_statements': 0,
+                    'sql_seconds': 0.0,
+                    'status': {}
+                }
+            # Buckets sind kumulativ (Prometheus-Konvention)
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    entry['buckets'][i] += 1
+            entry['count'] += 1
+            entry['sum'] += duration
+            entry['sql_statements'] += sql_count
+            entry['sql_seconds'] += sql_time
+            entry['status'][status] = entry['status'].get(status, 0) + 1
+
+    def observe_lock_wait(self, duration):
+        """Wartezeit auf die SQLite-Schreibsperre (BEGIN IMMEDIATE)"""
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    self._lock_wait['buckets'][i] += 1
+            self._lock_wait['count'] += 1
+            self._lock_wait['sum'] += duration
+
+    def inc(self, name, help_text, amount=1):
+        """Einfacher Zähler, z.B. für Wiederholungen nach Sperrfehlern"""
+        with self._lock:
+            value, _ = self._counters.get(name, (0, help_text))
+            self._counters[name] = (value + amount, help_text)
+
+    def render_prometheus(self):
+        """Metriken im Prometheus-Textformat"""
+        with self._lock:
+            items = sorted((key, {**entry, 'buckets': list(entry['buckets']), 'status': dict(entry['status'])})
+                           for key, entry in self._endpoints.items())
+
+        lines = [
+            '# HELP kaktus_request_duration_seconds Request-Latenz pro Endpoint',
+            '# TYPE kaktus_request_duration_seconds histogram'
+        ]
+        for (endpoint, method), entry in items:
+            labels = f'endpoint="{endpoint}",method="{method}"'
+            for bound, count in zip(self.buckets, entry['buckets']):
+                lines.append(f'kaktus_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'kaktus_request_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+            lines.append(f'kaktus_request_duration_seconds_sum{{{labels}}} {entry["sum"]:.6f}')
+            lines.append(f'kaktus_request_duration_seconds_count{{{labels}}} {entry["count"]}')
+
+        lines += [
+            '# HELP kaktus_requests_total Anzahl Requests pro Endpoint und Statuscode',
+            '# TYPE kaktus_requests_total counter'
+        ]
+        for (endpoint, method), entry in items:
+            for status, count in sorted(entry['status'].items()):
+                lines.append(f'kaktus_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            '# HELP kaktus_sql_statements_total Ausgeführte SQL-Statements pro Endpoint',
+            '# TYPE kaktus_sql_statements_total counter'
+        ]
+        for (endpoint, method), entry in items:
+            lines.append(f'kaktus_sql_statements_total{{endpoint="{endpoint}",method="{method}"}} {entry["sql_statements"]}')
+
+        lines += [
+            '# HELP kaktus_sql_duration_seconds_total Summierte DB-Zeit pro Endpoint',
+            '# TYPE kaktus_sql_duration_seconds_total counter'
+        ]
+        for (endpoint, method), entry in items:
+            lines.append(f'kaktus_sql_duration_seconds_total{{endpoint="{endpoint}",method="{method}"}} {entry["sql_seconds"]:.6f}')
+
+        with self._lock:
+            lock_wait = {**self._lock_wait, 'buckets': list(self._lock_wait['buckets'])}
+            counters = sorted(self._counters.items())
+        lines += [
+            '# HELP kaktus_sqlite_lock_wait_seconds Wartezeit auf die SQLite-Schreibsperre',
+            '# TYPE kaktus_sqlite_lock_wait_seconds histogram'
+        ]
+        for bound, count in zip(self.buckets, lock_wait['buckets']):
+            lines.append(f'kaktus_sqlite_lock_wait_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f'kaktus_sqlite_lock_wait_seconds_bucket{{le="+Inf"}} {lock_wait["count"]}')
+        lines.append(f'kaktus_sqlite_lock_wait_seconds_sum {lock_wait["sum"]:.6f}')
+        lines.append(f'kaktus_sqlite_lock_wait_seconds_count {lock_wait["count"]}')
+
+        for name, (value, help_text) in counters:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name} {value}']
+
+        lines += [
+            '# HELP kaktus_uptime_seconds Laufzeit des Prozesses',
+            '# TYPE kaktus_uptime_seconds gauge',
+            f'kaktus_uptime_seconds {time.time() - self.started_at:.0f}'
+        ]
+        return '\n'.join(lines) + '\n'
+
+metrics = RequestMetrics()
+
+sql_logger = logging.getLogger('kaktus.sql')
+
+# Letzte SQL-Reports für das Debug-Panel
+recent_sql_reports = deque(maxlen=50)
+
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_PARAM_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SQL_WHITESPACE = re.compile(r'\s+')
+
+def statement_shape(statement):
+    """Normalisiert ein SQL-Statement (Literale und IN-Listen) für den Vergleich"""
+    shape = _SQL_LITERALS.sub('?', statement)
+    shape = _SQL_PARAM_LISTS.sub('(?)', shape)
+    return _SQL_WHITESPACE.sub(' ', shape).strip()
+
+def sql_debug_enabled():
+    return app.debug or app.config['SQL_DEBUG']
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    elapsed_ms = elapsed * 1000
+    sql_logger.debug('%.2f ms: %s', elapsed_ms, statement)
+    if elapsed_ms >= app.config['SLOW_QUERY_MS']:
+        sql_logger.warning('Langsames SQL (%.1f ms, %s): %s', elapsed_ms,
+                           request.endpoint if has_request_context() else '-', statement)
+
+    if has_request_context():
+        g.sql_count = g.get('sql_count', 0) + 1
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+        g.setdefault('sql_queries', []).append((statement, elapsed_ms))
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_sql_error(exception_context):
+    # Startzeit des fehlgeschlagenen Statements verwerfen
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_start_time'):
+        conn.info['query_start_time'].pop()
+
+@app.before_request
+def _start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.sql_count = 0
+    g.sql_time = 0.0
+
+    sample_rate = app.config['PROFILE_SAMPLE_RATE']
+    if sample_rate > 0 and random.random() < sample_rate:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+        except ValueError:
+            # Ein anderer Profiler ist in diesem Thread bereits aktiv
+            pass
+
+@app.after_request
+def _report_request_sql(response):
+    # Statuscode für _record_request_metrics merken; die SQL-Header brauchen die Antwort
+    g.response_status = response.status_code
+    _report_sql(response, request.endpoint or 'unmatched')
+    return response
+
+@app.teardown_request
+def _record_request_metrics(exc):
+    """Latenz zählen und Profiler stoppen - auch wenn die View mit einer Exception abbricht"""
+    duration = time.perf_counter() - g.get('request_start', time.perf_counter())
+    # Nicht zugeordnete URLs zusammenfassen, damit die Label-Anzahl begrenzt bleibt
+    endpoint = request.endpoint or 'unmatched'
+    # Ohne Antwort (after_request nicht erreicht) wird der Request als 500 gezählt
+    status = 500 if exc is not None else g.pop('response_status', 500)
+    metrics.observe(endpoint, request.method, status, duration,
+                    g.get('sql_count', 0), g.get('sql_time', 0.0))
+
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+        filename = f'{endpoint}_{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}.prof'
+        profiler.dump_stats(os.path.join(app.config['PROFILE_DIR'], filename))
+
+def _report_sql(response, endpoint):
+    """Langsame Statements und N+1-Muster eines Requests melden"""
+    queries = g.get('sql_queries', [])
+    if not queries:
+        return
+
+    slow_ms = app.config['SLOW_QUERY_MS']
+    slow = [(stmt, ms) for stmt, ms in queries if ms >= slow_ms]
+    shapes = Counter(statement_shape(stmt) for stmt, _ in queries)
+    repeated = [(shape, count) for shape, count in shapes.most_common()
+                if count >= app.config['N_PLUS_ONE_THRESHOLD']]
+
+    for shape, count in repeated:
+        sql_logger.warning('Mögliches N+1 in %s: %dx %s', endpoint, count, shape)
+
+    if sql_debug_enabled():
+        total_ms = sum(ms for _, ms in queries)
+        response.headers['X-SQL-Queries'] = str(len(queries))
+        response.headers['X-SQL-Time-Ms'] = f'{total_ms:.2f}'
+        response.headers['X-SQL-Slow'] = str(len(slow))
+        response.headers['X-SQL-N-Plus-One'] = str(len(repeated))
+        recent_sql_reports.append({
+            'timestamp': datetime.now().isoformat(),
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'query_count': len(queries),
+            'total_ms': round(total_ms, 2),
+            'slow_queries': [{'statement': stmt, 'ms': round(ms, 2)} for stmt, ms in slow],
+            'n_plus_one': [{'statement': shape, 'count': count} for shape, count in repeated],
+            'queries': [{'statement': stmt, 'ms': round(ms, 2)} for stmt, ms in queries]
+        })
+
+# ==================== CACHE ====================
+
+# Welche Tabellen welchen Cache-Bereich ungültig machen
+CACHE_DEPENDENCIES = {
+    'species': {'species'},
+    'views': {'species', 'sowing', 'plant', 'diary_entry', 'plant_action', 'care_checklist_item', 'checklist_template',
+              'diary_entry_archive', 'plant_action_archive', 'action_rollup', 'diary_rollup', 'care_threshold',
+              'sensor'},  # Temperaturwarnungen in /api/care-alerts hängen an den Sensor-Standorten
+    'watering': {'species', 'plant', 'plant_action', 'plant_action_archive'},
+    'germination': {'species', 'sowing'},
+    'compliance': {'species', 'sensor'},
+}
+
+class VersionedCache:
+    """LRU-Cache mit Ablaufzeit, der bei Schreibzugriffen verworfen wird
+
+    Schreibende Transaktionen erhöhen den Zähler des Bereichs in `cache_version`.
+    Jeder Prozess prüft den Zähler höchstens alle `check_interval` Sekunden per
+    Primärschlüssel-Lookup, dadurch bleiben mehrere Worker-Prozesse konsistent.
+    """
+
+    def __init__(self, name, maxsize=64, ttl=300, check_interval=2.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+        _cache_registry.setdefault(name, []).append(self)
+
+    def _read_version(self):
+        row = db.session.execute(
+            text('SELECT version FROM cache_version WHERE name = :name'), {'name': self.name}
+        ).first()
+        return row[0] if row else 0
+
+    def _refresh_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._version
+        version = self._read_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+        return version
+
+    def get_or_compute(self, key, compute):
+        version = self._refresh_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        value = compute()
+        with self._lock:
+            # Nur speichern, wenn zwischenzeitlich nicht invalidiert wurde
+            if version == self._version:
+                self._entries[key] = (version, now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._checked_at = 0.0
+
+    def refresh(self):
+        """Zähler sofort prüfen statt nach `check_interval`; True, wenn der Bereich inzwischen verworfen wurde"""
+        previous = self._version
+        self._checked_at = 0.0
+        return self._refresh_version() != previous
+
+_cache_registry = {}
+_cache_table_checked = False
+
+def _bump_cache_versions(connection, names):
+    global _cache_table_checked
+    if not _cache_table_checked:
+        # Ältere Datenbanken (z.B. aus Hilfsskripten ohne init_db) haben die Tabelle noch nicht
+        CacheVersion.__table__.create(bind=connection, checkfirst=True)
+        _cache_table_checked = True
+    if names:
+        connection.execute(text(
+            'INSERT INTO cache_version (name, version) VALUES (:name, 1) '
+            'ON CONFLICT(name) DO UPDATE SET version = version + 1'
+        ), [{'name': name} for name in names])
+
+def _mark_invalidated(session, names):
+    # Pro Transaktion nur einmal hochzählen; das Leeren folgt nach dem Commit
+    pending = session.info.setdefault('invalidated_caches', set())
+    new_names = set(names) - pending
+    if new_names:
+        _bump_cache_versions(session.connection(), sorted(new_names))
+        pending |= new_names
+
+def invalidate_caches(*names):
+    """Cache-Bereiche in der laufenden Transaktion explizit verwerfen"""
+    _mark_invalidated(db.session(), names)
+
+@event.listens_for(Session, 'after_flush')
+def _track_cache_writes(session, flush_context):
+    tables = {obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)
+              if hasattr(obj, '__table__')}
+    _mark_invalidated(session, {name for name, deps in CACHE_DEPENDENCIES.items() if deps & tables})
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_writes(orm_execute_state):
+    # Massen-UPDATE/DELETE/INSERT über die Session laufen am Flush vorbei
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _mark_invalidated(orm_execute_state.session,
+                              {name for name, deps in CACHE_DEPENDENCIES.items() if table.name in deps})
+
+@event.listens_for(Session, 'after_commit')
+def _clear_invalidated_caches(session):
+    if session.in_nested_transaction():
+        return  # nur Savepoint freigegeben, die äußere Transaktion läuft noch
+    for name in session.info.pop('invalidated_caches', ()):
+        for cache in _cache_registry.get(name, ()):
+            cache.clear()
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_invalidated_caches(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop('invalidated_caches', None)
+
+species_cache = VersionedCache('species')
+
+def serialize_species(s):
+    return {
+        'id': s.id,
+        'name': s.name,
+        'substrate': s.substrate,
+        'temperature': s.temperature,
+        'germination_time': s.germination_time,
+        'care_notes': s.care_notes,
+        'temperature_min': s.temperature_min,
+        'temperature_max': s.temperature_max,
+        'watering_summer': s.watering_summer,
+        'watering_winter': s.watering_winter,
+        'light_requirements': s.light_requirements,
+        'special_care': s.special_care,
+        'user_created': s.user_created
+    }
+
+def get_species_payload():
+    """Serialisierte Artenliste aus dem Cache"""
+    return species_cache.get_or_compute(
+        'payload', lambda: [serialize_species(s) for s in Species.query.order_by(Species.id).all()]
+    )
+
+def get_species_map():
+    """Arten als id → Daten-Dict aus dem Cache"""
+    return species_cache.get_or_compute('by_id', lambda: {s['id']: s for s in get_species_payload()})
+
+views_cache = VersionedCache('views', maxsize=32, ttl=3600)
+
+class _UncachedResponse(Exception):
+    """Fehlerantwort aus cached_view, die am Cache vorbei zurückgegeben wird"""
+
+    def __init__(self, response):
+        self.response = response
+
+def cached_view(f):
+    """Cacht die JSON-Antwort einer berechneten Ansicht pro Tag und Query-String
+
+    Der Tag ist Teil des Schlüssels, damit Tagesgrenzen (z.B. "seit X Tagen") ohne
+    Invalidierung korrekt bleiben; Schreibzugriffe verwerfen den Bereich `views`.
+    Nur Antworten mit Status 200 landen im Cache.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        key = (f.__name__, datetime.now().date().isoformat(), request.query_string,
+               tuple(sorted(kwargs.items())))
+        hit = True
+
+        def compute():
+            nonlocal hit
+            hit = False
+            response = app.make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                raise _UncachedResponse(response)
+            return response.get_data(), response.mimetype, response.status_code
+
+        try:
+            body, mimetype, status = views_cache.get_or_compute(key, compute)
+        except _UncachedResponse as e:
+            e.response.headers['X-Cache'] = 'MISS'
+            return e.response
+        response = Response(body, status=status, mimetype=mimetype)
+        response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    return wrapper
+
+def species_name(species_id):
+    """Artname aus dem Cache; bei unbekannter ID nur neu laden, wenn sich die Arten inzwischen geändert haben"""
+    entry = get_species_map().get(species_id)
+    # Eine neue Art aus einem anderen Prozess ist erst nach der Versionsprüfung sichtbar;
+    # eine ID, die es nicht gibt, kostet so nur den Primärschlüssel-Lookup auf cache_version
+    if entry is None and species_cache.refresh():
+        entry = get_species_map().get(species_id)
+    return entry['name'] if entry else None
+
+# ==================== LIVE-UPDATES ====================
+
+# Tabellen, deren Änderungen an verbundene Geräte gemeldet werden
+EVENT_ENTITIES = {'species', 'sowing', 'plant', 'diary_entry', 'plant_action', 'care_checklist_item', 'checklist_template'}
+
+class ChangeFeed:
+    """Begrenzter Puffer der letzten Commits, an dem beliebig viele SSE-Verbindungen warten
+
+    Jeder Commit mit relevanten Änderungen wird ein Event mit fortlaufender Version.
+    Event-IDs enthalten zusätzlich eine Kennung des Prozesses, damit ein Client nach
+    einem Neustart nicht mit einer fremden Version weitermacht.
+    """
+
+    def __init__(self, size):
+        self.boot = uuid.uuid4().hex[:8]
+        self._events = deque(maxlen=size)
+        self._version = 0
+        self._condition = threading.Condition()
+
+    def publish(self, changes):
+        with self._condition:
+            self._version += 1
+            self._events.append({'version': self._version, 'changes': changes})
+            self._condition.notify_all()
+            return self._version
+
+    def event_id(self, version):
+        return f'{self.boot}-{version}'
+
+    def resume_version(self, event_id):
+        """Version zu einer Last-Event-ID oder None, wenn sie nicht von diesem Prozess stammt"""
+        boot, _, version = (event_id or '').partition('-')
+        if boot != self.boot or not version.isdigit():
+            return None
+        return int(version)
+
+    @property
+    def version(self):
+        return self._version
+
+    def since(self, version):
+        """Events nach `version`; None, wenn der Puffer sie nicht mehr lückenlos enthält"""
+        with self._condition:
+            if version > self._version:
+                return None
+            if version < self._version and self._events[0]['version'] > version + 1:
+                return None
+            return [event for event in self._events if event['version'] > version]
+
+    def wait(self, version, timeout):
+        with self._condition:
+            if self._version == version:
+                self._condition.wait(timeout)
+        return self.since(version)
+
+change_feed = ChangeFeed(app.config['EVENT_BUFFER_SIZE'])
+
+def record_change(entity, id=None, op='bulk', session=None):
+    """Änderung für das nächste Commit-Event vormerken (id=None: mehrere Zeilen, Client lädt die Liste neu)"""
+    pending = (session or db.session()).info.setdefault('pending_changes', {})
+    key = (entity, id)
+    # insert + update bleibt insert, insert + delete fällt ganz weg
+    if pending.get(key) == 'insert' and op != 'delete':
+        return
+    if pending.get(key) == 'insert' and op == 'delete':
+        del pending[key]
+        return
+    pending[key] = op
+
+@event.listens_for(Session, 'after_flush')
+def _track_changes(session, flush_context):
+    for op, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            table = getattr(obj, '__table__', None)
+            if table is None or table.name not in EVENT_ENTITIES:
+                continue
+            if op == 'update' and not session.is_modified(obj):
+                continue
+            record_change(table.name, obj.id, op, session)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and table.name in EVENT_ENTITIES:
+            record_change(table.name, session=orm_execute_state.session)
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop('pending_changes', None)
+    if pending:
+        change_feed.publish([{'entity': entity, 'id': id, 'op': op} for (entity, id), op in pending.items()])
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changes(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop('pending_changes', None)
+
+def _sse(data, event_id=None, event_type=None):
+    lines = []
+    if event_id:
+        lines.append(f'id: {event_id}')
+    if event_type:
+        lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+@app.route('/api/events')
+def event_stream():
+    """Server-Sent Events: {version, changes: [{entity, id, op}]} pro Commit
+
+    Mit Last-Event-ID (Header oder ?last_event_id=) werden verpasste Events nachgeliefert.
+    Sind sie nicht mehr im Puffer, kommt ein `reset`-Event und der Client lädt alles neu.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    keepalive = app.config['EVENT_KEEPALIVE']
+
+    def generate():
+        version = change_feed.resume_version(last_event_id) if last_event_id else change_feed.version
+        yield f'retry: {app.config["EVENT_RETRY_MS"]}\n\n'
+        while True:
+            if version is None:
+                version = change_feed.version
+                yield _sse({'version': version}, change_feed.event_id(version), 'reset')
+            events = change_feed.wait(version, keepalive)
+            if events is None:
+                version = None
+                continue
+            for item in events:
+                version = item['version']
+                yield _sse(item, change_feed.event_id(version))
+            if not events:
+                yield ': keepalive\n\n'
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# ==================== SQLITE-SCHREIBZUGRIFFE ====================
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    # Transaktionen selbst steuern (siehe _begin_transaction), statt pysqlite zu überlassen
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f'PRAGMA busy_timeout = {int(app.config["SQLITE_BUSY_TIMEOUT_MS"])}')
+    if app.config['SQLITE_JOURNAL_MODE']:
+        cursor.execute(f'PRAGMA journal_mode = {app.config["SQLITE_JOURNAL_MODE"]}')
+    # Fremdschlüssel prüfen und ON DELETE CASCADE / SET NULL ausführen (SQLite: pro Verbindung, Standard aus)
+    cursor.execute('PRAGMA foreign_keys = ON')
+    cursor.close()
+
+@event.listens_for(Engine, 'begin')
+def _begin_transaction(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    writing = (has_request_context() and request.method in WRITE_METHODS) or \
+              (has_app_context() and g.get('write_transaction', False))
+    if writing:
+        # Schreibsperre sofort holen: kein Lese→Schreib-Upgrade, das ohne Wartezeit scheitert
+        start = time.perf_counter()
+        try:
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+        finally:
+            metrics.observe_lock_wait(time.perf_counter() - start)
+    else:
+        conn.exec_driver_sql('BEGIN')
+
+def is_lock_error(error):
+    """SQLITE_BUSY / SQLITE_LOCKED: vorübergehend, Wiederholung sinnvoll"""
+    message = str(getattr(error, 'orig', error)).lower()
+    return 'database is locked' in message or 'database is busy' in message or 'database table is locked' in message
+
+def write_transaction(f):
+    """Wiederholt eine schreibende Route bei Sperrfehlern mit exponentiellem Backoff
+
+    Die ganze Route wird wiederholt, nicht nur das Commit: nach einem fehlgeschlagenen
+    Flush ist die Session zurückgerollt und die Änderungen müssen neu aufgebaut werden.
+    Nach dem letzten Versuch gibt es 503 mit Retry-After statt eines 500.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        retries = app.config['WRITE_RETRIES']
+        for attempt in range(retries + 1):
+            try:
+                return f(*args, **kwargs)
+            except OperationalError as e:
+                if not is_lock_error(e):
+                    raise
+                db.session.rollback()
+                if attempt == retries:
+                    metrics.inc('kaktus_sqlite_lock_failures_total', 'Schreibzugriffe, die nach allen Wiederholungen gesperrt blieben')
+                    app.logger.error(f'{request.endpoint}: Datenbank gesperrt, {retries} Wiederholungen erfolglos')
+                    response = jsonify({'error': 'Datenbank ist gerade ausgelastet, bitte erneut versuchen'})
+                    response.status_code = 503
+                    response.headers['Retry-After'] = '1'
+                    return response
+                metrics.inc('kaktus_sqlite_lock_retries_total', 'Wiederholte Schreibzugriffe nach Sperrfehlern')
+                delay = app.config['WRITE_RETRY_BACKOFF'] * (2 ** attempt) * random.uniform(0.5, 1.5)
+                app.logger.warning(f'{request.endpoint}: Datenbank gesperrt, Versuch {attempt + 1}/{retries}, warte {delay:.2f} s')
+                time.sleep(delay)
+    return wrapper
+
 # ==================== ROUTEN ====================
 
+def arg_flag(name):
+    """Boolescher Query-Parameter (?name=1/true/ja)"""
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes', 'ja')
+
 @app.route('/')
 def index():
     """Hauptseite"""
@@ -113,33 +888,52 @@ def index():
 
 @app.route('/api/health')
 def health_check():
-    """Health-Check für Sync-Status"""
+    """Health-Check für Sync-Status inkl. DB-Latenz und Pool-Status"""
+    db_ok = True
+    start = time.perf_counter()
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception as e:
+        db_ok = False
+        app.logger.error(f'Health-Check: Datenbank nicht erreichbar: {e}')
+    db_latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    pool = db.engine.pool
+    pool_stats = {'class': type(pool).__name__, 'status': pool.status()}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        value = getattr(pool, name, None)
+        if callable(value):
+            pool_stats[name] = value()
+
     return jsonify({
-        'status': 'online',
+        'status': 'online' if db_ok else 'degraded',
         'server': 'Flask Kaktus-Center',
-        'timestamp': datetime.now().isoformat()
-    })
+        'timestamp': datetime.now().isoformat(),
+        'database': {
+            'ok': db_ok,
+            'latency_ms': db_latency_ms,
+            'pool': pool_stats
+        }
+    }), 200 if db_ok else 503
+
+@app.route('/api/metrics')
+def show_metrics():
+    """Request- und SQL-Metriken im Prometheus-Format"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/debug/sql')
+def show_sql_reports():
+    """SQL-Reports der letzten Requests (nur im Debug-Modus)"""
+    if not sql_debug_enabled():
+        return jsonify({'error': 'Nur im Debug-Modus verfügbar'}), 404
+    return jsonify(list(reversed(recent_sql_reports)))
 
 @app.route('/api/species', methods=['GET', 'POST'])
+@write_transaction
 def handle_species():
     """Arten verwalten"""
     if request.method == 'GET':
-        species = Species.query.all()
-        return jsonify([{
-            'id': s.id,
-            'name': s.name,
-            'substrate': s.substrate,
-            'temperature': s.temperature,
-            'germination_time': s.germination_time,
-            'care_notes': s.care_notes,
-            'temperature_min': s.temperature_min,
-            'temperature_max': s.temperature_max,
-            'watering_summer': s.watering_summer,
-            'watering_winter': s.watering_winter,
-            'light_requirements': s.light_requirements,
-            'special_care': s.special_care,
-            'user_created': s.user_created
-        } for s in species])
+        return jsonify(get_species_payload())
 
     elif request.method == 'POST':
         data = request.json
@@ -167,96 +961,139 @@ def handle_species():
         return jsonify({'id': species.id, 'status': 'created'})
 
 @app.route('/api/species/<int:species_id>', methods=['DELETE'])
+@write_transaction
 def delete_species(species_id):
     """Art löschen (nur user_created)"""
     species = Species.query.get_or_404(species_id)
     if not species.user_created:
         return jsonify({'error': 'Standard-Arten können nicht gelöscht werden'}), 403
 
+    # Ein DELETE; Aussaaten, Pflanzen samt Aktionen und Checklisten löscht die Datenbank mit.
+    # Pflegehistorie und Keimungen bleiben als Tagebucheinträge (ohne Art) erhalten.
+    preserve_timeline(Plant.species_id == species_id)
     db.session.delete(species)
+    for entity in ('sowing', 'plant', 'diary_entry', 'checklist_template'):
+        record_change(entity)
     db.session.commit()
     return jsonify({'status': 'deleted'})
 
+def serialize_sowing(s):
+    return {
+        'id': s.id,
+        'species': s.species_id,
+        'species_name': species_name(s.species_id),
+        'sowing_date': s.sowing_date.isoformat(),
+        'seed_count': s.seed_count,
+        'pot_number': s.pot_number,
+        'germinated': s.germinated,
+        'germination_date': s.germination_date.isoformat() if s.germination_date else None,
+        'germinated_count': s.germinated_count,
+        'germination_rate': s.germination_rate,
+        'days_since_sowing': s.days_since_sowing,
+        'days_until_germination': s.days_until_germination,
+        'notes': s.notes
+    }
+
+def existing_species_id(value):
+    """Art-ID aus einem Request prüfen - eine unbekannte Art ist ein Fehler der Anfrage (400), keine Fremdschlüssel-Verletzung"""
+    if isinstance(value, bool) or not (isinstance(value, int) or (isinstance(value, str) and value.isdigit())):
+        raise ValueError(f'Ungültige Art-ID: {value!r}')
+    if db.session.get(Species, int(value)) is None:
+        raise ValueError(f'Unbekannte Art-ID: {value}')
+    return int(value)
+
+def create_sowing(data):
+    sowing = Sowing(
+        species_id=existing_species_id(data['species']),
+        sowing_date=datetime.strptime(data['sowing_date'], '%Y-%m-%d').date(),
+        seed_count=int(data['seed_count']),
+        pot_number=data['pot_number'],
+        notes=data.get('notes', '')
+    )
+    db.session.add(sowing)
+    return sowing
+
 @app.route('/api/sowings', methods=['GET', 'POST'])
+@write_transaction
 def handle_sowings():
     """Aussaaten verwalten"""
     if request.method == 'GET':
-        sowings = Sowing.query.all()
-        return jsonify([{
-            'id': s.id,
-            'species': s.species_id,
-            'species_name': s.species.name,
-            'sowing_date': s.sowing_date.isoformat(),
-            'seed_count': s.seed_count,
-            'pot_number': s.pot_number,
-            'germinated': s.germinated,
-            'germination_date': s.germination_date.isoformat() if s.germination_date else None,
-            'germinated_count': s.germinated_count,
-            'germination_rate': s.germination_rate,
-            'days_since_sowing': s.days_since_sowing,
-            'days_until_germination': s.days_until_germination,
-            'notes': s.notes
-        } for s in sowings])
+        return jsonify([serialize_sowing(s) for s in Sowing.query.all()])
 
     elif request.method == 'POST':
-        data = request.json
-        sowing = Sowing(
-            species_id=data['species'],
-            sowing_date=datetime.strptime(data['sowing_date'], '%Y-%m-%d').date(),
-            seed_count=int(data['seed_count']),
-            pot_number=data['pot_number'],
-            notes=data.get('notes', '')
-        )
-        db.session.add(sowing)
+        try:
+            sowing = create_sowing(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         db.session.commit()
         return jsonify({'id': sowing.id, 'status': 'created'})
 
-@app.route('/api/sowings/<int:sowing_id>', methods=['DELETE'])
+@app.route('/api/sowings/<int:sowing_id>', methods=['GET', 'DELETE'])
+@write_transaction
 def delete_sowing(sowing_id):
-    """Aussaat löschen"""
+    """Einzelne Aussaat abrufen oder löschen"""
     sowing = Sowing.query.get_or_404(sowing_id)
+    if request.method == 'GET':
+        return jsonify(serialize_sowing(sowing))
+
+    # Die Pflanzen bleiben, nur ihre Keimung fällt aus der Zeitleiste
+    preserve_timeline(Plant.sowing_id == sowing_id, actions=False)
     db.session.delete(sowing)
     db.session.commit()
     return jsonify({'status': 'deleted'})
 
+def serialize_plant(p):
+    return {
+        'id': p.id,
+        'species': p.species_id,
+        'species_name': species_name(p.species_id),
+        'purchase_date': p.purchase_date.isoformat(),
+        'location': p.location,
+        'substrate': p.substrate,
+        'notes': p.notes,
+        'days_in_collection': p.days_in_collection,
+        'last_watered': p.last_watered.isoformat() if p.last_watered else None,
+        'last_fertilized': p.last_fertilized.isoformat() if p.last_fertilized else None,
+        'days_since_watering': p.days_since_watering
+    }
+
+def create_plant(data):
+    plant = Plant(
+        species_id=existing_species_id(data['species']),
+        purchase_date=datetime.strptime(data['purchase_date'], '%Y-%m-%d').date(),
+        location=data['location'],
+        substrate=data['substrate'],
+        notes=data.get('notes', '')
+    )
+    db.session.add(plant)
+    return plant
+
 @app.route('/api/plants', methods=['GET', 'POST'])
+@write_transaction
 def handle_plants():
     """Pflanzen verwalten"""
     if request.method == 'GET':
-        plants = Plant.query.all()
-        return jsonify([{
-            'id': p.id,
-            'species': p.species_id,
-            'species_name': p.species.name,
-            'purchase_date': p.purchase_date.isoformat(),
-            'location': p.location,
-            'substrate': p.substrate,
-            'notes': p.notes,
-            'days_in_collection': p.days_in_collection,
-            'last_watered': p.last_watered.isoformat() if p.last_watered else None,
-            'last_fertilized': p.last_fertilized.isoformat() if p.last_fertilized else None,
-            'days_since_watering': p.days_since_watering
-        } for p in plants])
+        return jsonify([serialize_plant(p) for p in Plant.query.all()])
 
     elif request.method == 'POST':
-        data = request.json
-        plant = Plant(
-            species_id=data['species'],
-            purchase_date=datetime.strptime(data['purchase_date'], '%Y-%m-%d').date(),
-            location=data['location'],
-            substrate=data['substrate'],
-            notes=data.get('notes', '')
-        )
-        db.session.add(plant)
+        try:
+            plant = create_plant(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         db.session.commit()
         return jsonify({'id': plant.id, 'status': 'created'})
 
-@app.route('/api/plants/<int:plant_id>', methods=['DELETE', 'PATCH'])
+@app.route('/api/plants/<int:plant_id>', methods=['GET', 'DELETE', 'PATCH'])
+@write_transaction
 def manage_plant(plant_id):
-    """Pflanze löschen oder aktualisieren"""
+    """Pflanze abrufen, löschen oder aktualisieren"""
     plant = Plant.query.get_or_404(plant_id)
 
-    if request.method == 'DELETE':
+    if request.method == 'GET':
+        return jsonify(serialize_plant(plant))
+
+    elif request.method == 'DELETE':
+        preserve_timeline(Plant.id == plant_id)
         db.session.delete(plant)
         db.session.commit()
         return jsonify({'status': 'deleted'})
@@ -270,33 +1107,139 @@ def manage_plant(plant_id):
         db.session.commit()
         return jsonify({'status': 'updated'})
 
+# Pflegeaktionen erscheinen im Tagebuch mit dem Eintragstyp (= action_type) und Text, den früher eine eigene Zeile hatte
+ACTION_DIARY_LABELS = {'water': '💧 Gegossen', 'fertilize': '🌿 Gedüngt', 'repot': '🪴 Umgetopft'}
+
+def _timeline_actions(model, archived):
+    return db.select(
+        model.id,
+        model.action_date.label('date'),
+        Plant.species_id,
+        (db.case(ACTION_DIARY_LABELS, value=model.action_type, else_='🪴 Umgetopft')
+         + ': ' + db.func.coalesce(db.func.nullif(model.notes, ''), 'Standard')).label('note'),
+        model.action_type.label('entry_type'),
+        db.literal('action').label('source'),
+        db.literal(archived).label('archived')
+    ).outerjoin(Plant, Plant.id == model.plant_id)
+
+def _timeline_germinations():
+    return db.select(
+        Plant.id,
+        Sowing.germination_date.label('date'),
+        Sowing.species_id,
+        ('🌱 Keimung: ' + db.cast(Sowing.germinated_count, db.String) + ' von '
+         + db.cast(Sowing.seed_count, db.String) + ' Samen gekeimt. Automatisch zum Bestand hinzugefügt.').label('note'),
+        db.literal('germination').label('entry_type'),
+        db.literal('germination').label('source'),
+        db.literal(False).label('archived')
+    ).join(Sowing, Sowing.id == Plant.sowing_id).where(Sowing.germination_date.isnot(None))
+
+# Einträge pro Seite für GET /api/diary ohne ?limit=
+DIARY_PAGE_SIZE = 200
+
+TIMELINE_SOURCES = ('diary', 'action', 'germination')
+
+def timeline_cursor(e):
+    """Position einer Zeile in der Zeitleiste für ?before= - Datum, Quelle und ID, da IDs je Quelle zählen"""
+    return f'{e.date.isoformat()}.{e.source}.{e.id}'
+
+def parse_timeline_cursor(value):
+    day, source, entry_id = value.split('.')
+    if source not in TIMELINE_SOURCES or not entry_id.isdigit():
+        raise ValueError(f'Ungültige Position: {value}')
+    return datetime.strptime(day, '%Y-%m-%d').date(), source, int(entry_id)
+
+def diary_timeline(include_archive=False, limit=None, before=None):
+    """Tagebuch als Zeitleiste: eigene Einträge, Pflegeaktionen und Keimungen aus Aussaaten
+
+    Aktionen und Keimungen werden nur einmal gespeichert und hier per UNION ALL eingeblendet.
+    Seitenweise über `limit` und `before` (Keyset auf Datum, Quelle und ID aus parse_timeline_cursor).
+    """
+    entries = lambda model, archived: db.select(
+        model.id, model.date, model.species_id, model.note, model.entry_type,
+        db.literal('diary').label('source'), db.literal(archived).label('archived'))
+
+    parts = [entries(DiaryEntry, False), _timeline_actions(PlantAction, False), _timeline_germinations()]
+    if include_archive:
+        parts += [entries(DiaryEntryArchive, True), _timeline_actions(PlantActionArchive, True)]
+    timeline = db.union_all(*parts).subquery()
+    key = (timeline.c.date, timeline.c.source, timeline.c.id)
+    query = db.select(timeline).order_by(*(column.desc() for column in key))
+    if before is not None:
+        query = query.where(db.tuple_(*key) < db.tuple_(*before))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def preserve_timeline(condition, actions=True):
+    """Abgeleitete Tagebuchzeilen der betroffenen Pflanzen vor dem Löschen als eigene Einträge sichern
+
+    Aktionen löscht die Datenbank mit der Pflanze, Keimungen fallen mit Pflanze oder Aussaat
+    aus der Zeitleiste. Ein INSERT … SELECT schreibt sie vorher nach diary_entry, damit die
+    Pflegehistorie im Tagebuch bleibt wie früher (ältere Zeilen verschiebt das Archiv später).
+    """
+    parts = [_timeline_germinations().where(condition)]
+    if actions:
+        parts += [_timeline_actions(PlantAction, False).where(condition),
+                  _timeline_actions(PlantActionArchive, True).where(condition)]
+    derived = db.union_all(*parts).subquery()
+    return db.session.execute(db.insert(DiaryEntry).from_select(
+        ['date', 'species_id', 'note', 'entry_type', 'created_at'],
+        db.select(derived.c.date, derived.c.species_id, derived.c.note, derived.c.entry_type,
+                  db.literal(datetime.utcnow(), db.DateTime))
+    )).rowcount
+
+def serialize_timeline_entry(e):
+    return {
+        # Nur eigene Einträge haben eine löschbare ID, der Rest ist abgeleitet
+        'id': e.id if e.source == 'diary' else f'{e.source}-{e.id}',
+        'date': e.date.isoformat(),
+        'species': e.species_id,
+        'species_name': species_name(e.species_id) if e.species_id else 'Allgemein',
+        'note': e.note,
+        'entry_type': e.entry_type,
+        'source': e.source,
+        'archived': bool(e.archived)
+    }
+
+def create_diary_entry(data):
+    entry = DiaryEntry(
+        date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
+        species_id=existing_species_id(data['species']) if data.get('species') else None,
+        note=data['note'],
+        entry_type=data.get('entry_type', 'general')
+    )
+    db.session.add(entry)
+    return entry
+
 @app.route('/api/diary', methods=['GET', 'POST'])
+@write_transaction
 def handle_diary():
     """Tagebuch verwalten"""
     if request.method == 'GET':
-        entries = DiaryEntry.query.order_by(DiaryEntry.date.desc()).all()
-        return jsonify([{
-            'id': e.id,
-            'date': e.date.isoformat(),
-            'species': e.species_id,
-            'species_name': e.species.name if e.species else 'Allgemein',
-            'note': e.note,
-            'entry_type': e.entry_type
-        } for e in entries])
+        # Archivierte Einträge nur auf Wunsch (?include_archive=1); seitenweise über ?limit= und ?before=
+        limit = min(max(request.args.get('limit', DIARY_PAGE_SIZE, type=int), 1), 1000)
+        try:
+            before = parse_timeline_cursor(request.args['before']) if request.args.get('before') else None
+        except ValueError:
+            return jsonify({'error': 'before muss eine Position aus X-Next-Before sein'}), 400
+        # Eine Zeile mehr lesen, um zu wissen, ob es eine weitere Seite gibt
+        entries = db.session.execute(diary_timeline(arg_flag('include_archive'), limit + 1, before)).all()
+        response = jsonify([serialize_timeline_entry(e) for e in entries[:limit]])
+        if len(entries) > limit:
+            response.headers['X-Next-Before'] = timeline_cursor(entries[limit - 1])
+        return response
 
     elif request.method == 'POST':
-        data = request.json
-        entry = DiaryEntry(
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-            species_id=data.get('species') or None,
-            note=data['note'],
-            entry_type=data.get('entry_type', 'general')
-        )
-        db.session.add(entry)
+        try:
+            entry = create_diary_entry(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         db.session.commit()
         return jsonify({'id': entry.id, 'status': 'created'})
 
 @app.route('/api/diary/<int:entry_id>', methods=['DELETE'])
+@write_transaction
 def delete_diary_entry(entry_id):
     """Tagebucheintrag löschen"""
     entry = DiaryEntry.query.get_or_404(entry_id)
@@ -304,18 +1247,22 @@ def delete_diary_entry(entry_id):
     db.session.commit()
     return jsonify({'status': 'deleted'})
 
-@app.route('/api/sowings/<int:sowing_id>/germinate', methods=['POST'])
-def update_germination(sowing_id):
-    """Keimung aktualisieren"""
-    data = request.json
-    sowing = Sowing.query.get_or_404(sowing_id)
+def record_germination(sowing, data):
     sowing.germinated = True
     sowing.germination_date = datetime.strptime(data['germination_date'], '%Y-%m-%d').date()
     sowing.germinated_count = int(data['germinated_count'])
+    return sowing
+
+@app.route('/api/sowings/<int:sowing_id>/germinate', methods=['POST'])
+@write_transaction
+def update_germination(sowing_id):
+    """Keimung aktualisieren"""
+    record_germination(Sowing.query.get_or_404(sowing_id), request.json)
     db.session.commit()
     return jsonify({'status': 'updated'})
 
 @app.route('/api/care-schedule')
+@cached_view
 def care_schedule():
     """Pflegeplan für alle Pflanzen"""
     schedule = {
@@ -325,165 +1272,182 @@ def care_schedule():
         'seasonal': []
     }
 
-    # Tägliche Aufgaben
-    for sowing in Sowing.query.filter(Sowing.germinated == False).all():
-        days = sowing.days_since_sowing
-        if days <= 14:
+    today = datetime.now().date()
+
+    # Tägliche Aufgaben: Aussaaten im Keimfenster der Art; überfällige einmal pro Woche prüfen
+    monitor = pending_sowings_query(today)
+    for sowing in db.session.execute(db.select(monitor).where(monitor.c.status != 'early')
+                                     .order_by(monitor.c.sowing_date)):
+        details = (f'Ausgesät vor {sowing.age_days} Tagen. '
+                   f'Erwartete Keimdauer: {get_species_map()[sowing.species_id]["germination_time"]}')
+        if sowing.status == 'expected':
             schedule['daily'].append({
                 'type': 'check',
                 'priority': 'high',
-                'task': f'Keimung prüfen: {sowing.species.name} (Topf {sowing.pot_number})',
-                'details': f'Ausgesät vor {days} Tagen. Erwartete Keimdauer: {sowing.species.germination_time}'
+                'task': f'Keimung prüfen: {species_name(sowing.species_id)} (Topf {sowing.pot_number})',
+                'details': details
             })
-
-    # Wöchentliche Aufgaben
-    for plant in Plant.query.all():
-        if plant.days_since_watering and plant.days_since_watering >= 7:
+        else:
             schedule['weekly'].append({
-                'type': 'watering',
+                'type': 'check',
                 'priority': 'medium',
-                'task': f'Gießen prüfen: {plant.species.name} ({plant.location})',
-                'details': f'Zuletzt vor {plant.days_since_watering} Tagen gegossen'
+                'task': f'Keimung überfällig: {species_name(sowing.species_id)} (Topf {sowing.pot_number})',
+                'details': f'{details} - Bedingungen prüfen'
             })
 
-    # Monatliche Aufgaben
-    for plant in Plant.query.all():
-        if plant.last_fertilized:
-            days_since = (datetime.now().date() - plant.last_fertilized).days
-            if days_since >= 30:
-                schedule['monthly'].append({
-                    'type': 'fertilizing',
-                    'priority': 'low',
-                    'task': f'Düngen: {plant.species.name} ({plant.location})',
-                    'details': f'Zuletzt vor {days_since} Tagen gedüngt'
-                })
+    # Gießen, Düngen und saisonale Hinweise kommen aus den Pflegeregeln (care_rules.json)
+    for bucket in schedule:
+        for rule, row in evaluate_care_rules(f'schedule.{bucket}', today):
+            schedule[bucket].append(rule.render(row))
+
+    return jsonify(schedule)
+
+DASHBOARD_SECTIONS = ('overview', 'recent', 'care_alerts')
+DASHBOARD_ALERT_LIMIT = 10
+
+def _count(model, *criteria):
+    """Zähl-Subquery, damit mehrere Zählungen in einem Statement laufen"""
+    query = db.select(db.func.count()).select_from(model)
+    if criteria:
+        query = query.where(*criteria)
+    return query.scalar_subquery()
+
+def _dashboard_overview(today):
+    row = db.session.execute(db.select(
+        _count(Species).label('total_species'),
+        _count(Sowing).label('total_sowings'),
+        _count(Sowing, Sowing.germinated == False).label('active_sowings'),
+        _count(Plant).label('total_plants'),
+        _count(Plant, Plant.from_sowing == True).label('plants_from_sowings'),
+        (_count(DiaryEntry) + _count(DiaryEntryArchive)).label('total_diary_entries'),
+        (_count(PlantAction) + _count(PlantActionArchive)).label('total_actions')
+    )).one()
+    return dict(row._mapping)
+
+def _dashboard_recent(today):
+    month_ago = today - timedelta(days=30)
+    row = db.session.execute(db.select(
+        _count(Sowing, Sowing.sowing_date >= month_ago).label('sowings_this_month'),
+        _count(Sowing, Sowing.germination_date >= month_ago).label('germinations_this_month'),
+        _count(Plant, Plant.purchase_date >= month_ago).label('plants_added_this_month'),
+        _count(PlantAction, PlantAction.action_date >= today - timedelta(days=7)).label('actions_this_week')
+    )).one()
+    return dict(row._mapping)
+
+def _dashboard_care_alerts(today):
+    alerts = []
+
+    # Keimungs-Meilensteine aus den Pflegeregeln
+    for rule, row in evaluate_care_rules('dashboard', today):
+        alerts.append(rule.render(row))
+
+    # Gießwarnungen nach Schwellwert der Art und Saison, die ältesten zuerst
+    limits = ThresholdLimits(today)
+    for plant in Plant.query.outerjoin(limits.table, limits.join).filter(limits.water_due) \
+                            .order_by(Plant.last_watered.asc()).limit(DASHBOARD_ALERT_LIMIT).all():
+        if plant.last_watered:
+            message = f'⚠️ {species_name(plant.species_id)} ({plant.location}) seit {(today - plant.last_watered).days} Tagen nicht gegossen!'
         else:
-            schedule['monthly'].append({
-                'type': 'fertilizing',
-                'priority': 'low',
-                'task': f'Düngen: {plant.species.name} ({plant.location})',
-                'details': 'Noch nie gedüngt'
-            })
+            message = f'⚠️ {species_name(plant.species_id)} ({plant.location}) wurde noch nie gegossen!'
+        alerts.append({'type': 'warning', 'message': message})
 
-    # Saisonale Aufgaben
-    current_month = datetime.now().month
-    if current_month in [10, 11]:  # Oktober/November
-        schedule['seasonal'].append({
-            'type': 'season',
-            'priority': 'high',
-            'task': 'Winterruhe vorbereiten',
-            'details': 'Gießen reduzieren, kühleren Standort suchen'
-        })
-    elif current_month in [3, 4]:  # März/April
-        schedule['seasonal'].append({
-            'type': 'season',
-            'priority': 'high',
-            'task': 'Wachstumsperiode beginnen',
-            'details': 'Gießen langsam steigern, umtopfen wenn nötig'
+    # Keimungsüberwachung: über das Keimfenster der Art hinaus ohne Keimung
+    monitor = pending_sowings_query(today)
+    for sowing in db.session.execute(db.select(monitor).where(monitor.c.status == 'overdue')
+                                     .order_by(monitor.c.sowing_date).limit(DASHBOARD_ALERT_LIMIT)):
+        alerts.append({
+            'type': 'info',
+            'message': f'📍 {species_name(sowing.species_id)} (Topf {sowing.pot_number}) seit {sowing.age_days} Tagen ohne Keimung'
         })
 
-    return jsonify(schedule)
+    return alerts[:DASHBOARD_ALERT_LIMIT]
+
+_DASHBOARD_BUILDERS = {
+    'overview': _dashboard_overview,
+    'recent': _dashboard_recent,
+    'care_alerts': _dashboard_care_alerts,
+}
+
+def compute_dashboard_stats(sections=DASHBOARD_SECTIONS, today=None):
+    """Berechnet die angefragten Dashboard-Bereiche"""
+    today = today or datetime.now().date()
+    return {section: _DASHBOARD_BUILDERS[section](today) for section in sections}
 
 @app.route('/api/dashboard-stats')
-def dashboard_stats():
-    """Dashboard-Statistiken"""
-    now = datetime.now()
-    month_ago = now - timedelta(days=30)
-
-    # Pflegeerinnerungen
-    care_alerts = []
-    germinated_sowings = Sowing.query.filter(Sowing.germinated == True).all()
-
-    for sowing in germinated_sowings:
-        if sowing.germination_date:
-            days = (now.date() - sowing.germination_date).days
-            if days == 14:
-                care_alerts.append({
-                    'type': 'info',
-                    'message': f'{sowing.species.name} (Topf {sowing.pot_number}): 2 Wochen alt - Abhärtung vorbereiten'
-                })
-            elif days == 42:
-                care_alerts.append({
-                    'type': 'warning',
-                    'message': f'{sowing.species.name} (Topf {sowing.pot_number}): 6 Wochen alt - Deckel entfernen'
-                })
-            elif days == 70:
-                care_alerts.append({
-                    'type': 'success',
-                    'message': f'{sowing.species.name} (Topf {sowing.pot_number}): 10 Wochen alt - Erste Düngung möglich'
-                })
+@cached_view
+def show_dashboard_stats():
+    """Dashboard-Statistiken (optional nur ausgewählte Bereiche: ?sections=overview,care_alerts)"""
+    sections = request.args.get('sections')
+    if sections:
+        sections = [name.strip() for name in sections.split(',') if name.strip()]
+        unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            return jsonify({'error': f'Unbekannte Bereiche: {", ".join(unknown)}',
+                            'available': list(DASHBOARD_SECTIONS)}), 400
+    else:
+        sections = DASHBOARD_SECTIONS
 
-    stats = {
-        'overview': {
-            'total_species': Species.query.count(),
-            'total_sowings': Sowing.query.count(),
-            'total_plants': Plant.query.count(),
-            'total_diary_entries': DiaryEntry.query.count(),
-        },
-        'recent': {
-            'sowings_this_month': Sowing.query.filter(Sowing.sowing_date >= month_ago.date()).count(),
-            'germinations_this_month': Sowing.query.filter(
-                Sowing.germination_date >= month_ago.date()
-            ).count(),
-        },
-        'care_alerts': care_alerts
-    }
-    return jsonify(stats)
+    return jsonify(compute_dashboard_stats(sections))
 
-@app.route('/api/export/all')
-def export_all():
-    """Alle Daten als ZIP mit CSVs exportieren"""
-    # ZIP-Datei im Speicher erstellen
-    zip_buffer = BytesIO()
+def _csv_bytes(header, rows):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8-sig')
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+def write_export_zip(target, progress=None):
+    """Schreibt alle Daten als ZIP mit CSVs nach `target` (Pfad oder Datei-Objekt)"""
+    def report(percent, message):
+        if progress:
+            progress(percent, message)
+
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zip_file:
         # Arten exportieren
-        species_csv = StringIO()
-        writer = csv.writer(species_csv)
-        writer.writerow(['Name', 'Substrat', 'Temperatur', 'Keimdauer', 'Pflegehinweise',
-                        'Gießen Sommer', 'Gießen Winter', 'Lichtbedarf'])
-        for s in Species.query.all():
-            writer.writerow([s.name, s.substrate, s.temperature, s.germination_time,
-                           s.care_notes, s.watering_summer, s.watering_winter, s.light_requirements])
-        zip_file.writestr('arten.csv', species_csv.getvalue().encode('utf-8-sig'))
+        report(5, 'Arten')
+        zip_file.writestr('arten.csv', _csv_bytes(
+            ['Name', 'Substrat', 'Temperatur', 'Keimdauer', 'Pflegehinweise',
+             'Gießen Sommer', 'Gießen Winter', 'Lichtbedarf'],
+            ([s.name, s.substrate, s.temperature, s.germination_time,
+              s.care_notes, s.watering_summer, s.watering_winter, s.light_requirements]
+             for s in Species.query.yield_per(1000))))
 
         # Aussaaten exportieren
-        sowings_csv = StringIO()
-        writer = csv.writer(sowings_csv)
-        writer.writerow(['Art', 'Aussaat-Datum', 'Topf Nr.', 'Anzahl Samen', 'Gekeimt',
-                        'Keim-Datum', 'Anzahl gekeimt', 'Keimrate %', 'Tage bis Keimung'])
-        for s in Sowing.query.all():
-            writer.writerow([
-                s.species.name, s.sowing_date, s.pot_number, s.seed_count,
-                'Ja' if s.germinated else 'Nein', s.germination_date or '',
-                s.germinated_count, s.germination_rate,
-                s.days_until_germination or ''
-            ])
-        zip_file.writestr('aussaaten.csv', sowings_csv.getvalue().encode('utf-8-sig'))
+        report(20, 'Aussaaten')
+        zip_file.writestr('aussaaten.csv', _csv_bytes(
+            ['Art', 'Aussaat-Datum', 'Topf Nr.', 'Anzahl Samen', 'Gekeimt',
+             'Keim-Datum', 'Anzahl gekeimt', 'Keimrate %', 'Tage bis Keimung'],
+            ([species_name(s.species_id), s.sowing_date, s.pot_number, s.seed_count,
+              'Ja' if s.germinated else 'Nein', s.germination_date or '',
+              s.germinated_count, s.germination_rate,
+              s.days_until_germination or '']
+             for s in Sowing.query.yield_per(1000))))
 
         # Pflanzen exportieren
-        plants_csv = StringIO()
-        writer = csv.writer(plants_csv)
-        writer.writerow(['Art', 'Kaufdatum', 'Standort', 'Substrat', 'Tage im Bestand',
-                        'Zuletzt gegossen', 'Zuletzt gedüngt'])
-        for p in Plant.query.all():
-            writer.writerow([
-                p.species.name, p.purchase_date, p.location, p.substrate,
-                p.days_in_collection, p.last_watered or 'Nie', p.last_fertilized or 'Nie'
-            ])
-        zip_file.writestr('pflanzenbestand.csv', plants_csv.getvalue().encode('utf-8-sig'))
+        report(40, 'Pflanzenbestand')
+        zip_file.writestr('pflanzenbestand.csv', _csv_bytes(
+            ['Art', 'Kaufdatum', 'Standort', 'Substrat', 'Tage im Bestand',
+             'Zuletzt gegossen', 'Zuletzt gedüngt'],
+            ([species_name(p.species_id), p.purchase_date, p.location, p.substrate,
+              p.days_in_collection, p.last_watered or 'Nie', p.last_fertilized or 'Nie']
+             for p in Plant.query.yield_per(1000))))
 
         # Tagebuch exportieren
-        diary_csv = StringIO()
-        writer = csv.writer(diary_csv)
-        writer.writerow(['Datum', 'Art', 'Typ', 'Notiz'])
-        for e in DiaryEntry.query.all():
-            writer.writerow([
-                e.date, e.species.name if e.species else 'Allgemein',
-                e.entry_type, e.note
-            ])
-        zip_file.writestr('tagebuch.csv', diary_csv.getvalue().encode('utf-8-sig'))
+        report(60, 'Tagebuch')
+        zip_file.writestr('tagebuch.csv', _csv_bytes(
+            ['Datum', 'Art', 'Typ', 'Notiz'],
+            ([e.date, species_name(e.species_id) if e.species_id else 'Allgemein', e.entry_type, e.note]
+             for e in db.session.execute(diary_timeline(include_archive=True),
+                                         execution_options={'yield_per': 1000}))))
+
+    report(100, 'Fertig')
 
+@app.route('/api/export/all')
+def export_all():
+    """Alle Daten als ZIP mit CSVs exportieren (für große Bestände besser als Job: POST /api/jobs)"""
+    # ZIP-Datei im Speicher erstellen
+    zip_buffer = BytesIO()
+    write_export_zip(zip_buffer)
     zip_buffer.seek(0)
 
     return send_file(
@@ -493,39 +1457,612 @@ def export_all():
         download_name=f'kaktus_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
     )
 
-# ==================== INITIALISIERUNG ====================
+# ==================== HINTERGRUND-JOBS ====================
 
-def init_db():
-    """Datenbank initialisieren mit allen 36 Arten"""
+# Registrierte Job-Arten: kind → (Funktion, schreibt in die Datenbank)
+JOB_HANDLERS = {}
+
+# Wiederkehrende Jobs: kind → Funktion, die prüft, ob der Job wieder fällig ist
+PERIODIC_JOBS = {}
+
+_job_executor = None
+_job_executor_lock = threading.Lock()
+_process_boot = uuid.uuid4().hex[:8]
+
+def job_owner():
+    """Kennung dieses Prozesses; die PID zur Laufzeit, damit geforkte Worker eigene Kennungen haben"""
+    return f'{socket.gethostname()}:{os.getpid()}:{_process_boot}'
+
+def job_handler(kind, writes=False):
+    """Registriert eine Funktion als Job-Art; sie erhält (JobContext, params) und liefert ein Ergebnis-Dict"""
+    def decorator(f):
+        JOB_HANDLERS[kind] = (f, writes)
+        return f
+    return decorator
+
+def periodic_job(kind):
+    """Registriert eine Fälligkeitsprüfung; der Scheduler startet den Job, sobald sie True liefert"""
+    def decorator(f):
+        PERIODIC_JOBS[kind] = f
+        return f
+    return decorator
+
+def start_scheduler(check_interval=600):
+    """Hintergrund-Thread, der fällige wiederkehrende Jobs (Backups, Wartung) startet"""
+    def loop():
+        while True:
+            for kind, is_due in PERIODIC_JOBS.items():
+                try:
+                    with app.app_context():
+                        if is_due():
+                            submit_job(kind)
+                except Exception:
+                    app.logger.exception(f'Wiederkehrender Job {kind} konnte nicht gestartet werden')
+            time.sleep(check_interval)
+
+    thread = threading.Thread(target=loop, name='kaktus-scheduler', daemon=True)
+    thread.start()
+    return thread
+
+def ran_today(kind):
+    """Wurde heute (UTC) schon ein Job dieser Art angelegt?"""
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    return db.session.scalar(db.select(Job.id).where(Job.kind == kind, Job.created_at >= today).limit(1)) is not None
+
+# Fortschritt laufender Jobs in diesem Prozess: job_id → (Prozent, Meldung)
+_job_progress = {}
+
+class JobContext:
+    """Fortschritt melden und Ergebnisdateien ablegen aus einem laufenden Job"""
+
+    def __init__(self, job_id, writes):
+        self.job_id = job_id
+        self.writes = writes
+        self.result_file = None
+
+    def progress(self, percent, message=None):
+        _job_progress[self.job_id] = (int(percent), message)
+        # Über eine eigene Verbindung speichern, damit andere Prozesse den Fortschritt sehen.
+        # Hält der Job gerade selbst die Schreibsperre, bleibt es bei der Meldung im Speicher.
+        if not (self.writes and db.session().in_transaction()):
+            _update_job(self.job_id, progress=int(percent), message=message)
+
+    def result_path(self, filename):
+        os.makedirs(app.config['JOB_DIR'], exist_ok=True)
+        self.result_file = os.path.abspath(os.path.join(app.config['JOB_DIR'], f'{self.job_id}_{filename}'))
+        return self.result_file
+
+def _get_job_executor():
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(max_workers=app.config['JOB_WORKERS'],
+                                               thread_name_prefix='kaktus-job')
+            threading.Thread(target=_job_heartbeat_loop, name='kaktus-job-heartbeat', daemon=True).start()
+        return _job_executor
+
+def _job_heartbeat_loop():
+    """Lebenszeichen für die Jobs dieses Prozesses, damit andere Prozesse sie nicht als abgebrochen werten"""
+    while True:
+        time.sleep(app.config['JOB_HEARTBEAT_SECONDS'])
+        try:
+            with app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(db.update(Job)
+                                 .where(Job.owner == job_owner(), Job.status.in_(['queued', 'running']))
+                                 .values(heartbeat_at=datetime.utcnow()))
+        except Exception:
+            app.logger.exception('Lebenszeichen der Jobs konnte nicht gespeichert werden')
+
+def _update_job(job_id, **values):
+    # Eigene, kurze Schreibtransaktion (das UPDATE als erstes Statement wartet per busy_timeout)
+    with db.engine.begin() as conn:
+        conn.execute(db.update(Job).where(Job.id == job_id).values(**values))
+
+def _run_job(job_id):
     with app.app_context():
-        # Tabellen erstellen
-        db.create_all()
+        job = db.session.get(Job, job_id)
+        kind = job.kind
+        handler, writes = JOB_HANDLERS[kind]
+        params = json.loads(job.params) if job.params else {}
+        db.session.commit()
+        _update_job(job_id, status='running', started_at=datetime.utcnow())
 
-        # Prüfen ob schon Arten existieren
-        if Species.query.count() == 0:
-            print("🌱 Lade alle Kakteen-Arten...")
+        g.write_transaction = writes
+        context = JobContext(job_id, writes)
+        try:
+            result = handler(context, params) or {}
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception(f'Job {job_id} ({kind}) fehlgeschlagen')
+            _update_job(job_id, status='failed', error=str(e), finished_at=datetime.utcnow())
+        else:
+            _update_job(job_id, status='done', progress=100, message='Fertig', finished_at=datetime.utcnow(),
+                        result=json.dumps(result, default=str), result_file=context.result_file)
+        finally:
+            _job_progress.pop(job_id, None)
+            db.session.remove()
 
-            # Vollständige Artenliste mit erweiterten Pflegeinfos
-            all_species = {
-                'Ancistrocactus pallidus': {
-                    'substrate': 'Mineralisch, kiesig',
-                    'temperature': '20-28°C',
-                    'germination_time': '2-4 Wochen',
-                    'care_notes': 'Gute Drainage, kühle Überwinterung bei 5-10°C.',
-                    'temperature_min': 20,
-                    'temperature_max': 28,
-                    'watering_summer': 'Mäßig, alle 2 Wochen',
-                    'watering_winter': 'Trocken halten',
-                    'light_requirements': 'Vollsonne',
-                    'special_care': 'Frosthart bis -7°C'
-                },
-                'Ariocarpus Mischung': {
-                    'substrate': 'Rein mineralisch, kalkhaltig',
-                    'temperature': '20-30°C',
-                    'germination_time': '1-4 Wochen',
-                    'care_notes': 'Sehr langsam wachsend, extrem fäulnisempfindlich, tiefe Töpfe.',
-                    'temperature_min': 20,
-                    'temperature_max': 30,
+def purge_old_jobs():
+    """Abgeschlossene Jobs nach JOB_RETENTION_DAYS entfernen, ihre Dateien erst nach dem Commit"""
+    cutoff = datetime.utcnow() - timedelta(days=app.config['JOB_RETENTION_DAYS'])
+    old_jobs = Job.query.filter(Job.status.in_(['done', 'failed']), Job.created_at < cutoff).all()
+    # Scheitert der Commit, bleiben Zeilen und Dateien zusammen erhalten
+    files = [job.result_file for job in old_jobs if job.result_file]
+    for job in old_jobs:
+        db.session.delete(job)
+    db.session.commit()
+    for path in files:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return len(old_jobs)
+
+@job_handler('purge_jobs', writes=True)
+def run_purge_jobs_job(context, params):
+    """Alte Jobs und ihre Ergebnisdateien entfernen"""
+    return {'removed': purge_old_jobs()}
+
+@periodic_job('purge_jobs')
+def _job_purge_due():
+    return not ran_today('purge_jobs')
+
+def submit_job(kind, params=None):
+    """Legt einen Job an und startet ihn im Hintergrund"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unbekannte Job-Art: {kind}')
+    job = Job(id=uuid.uuid4().hex, kind=kind, status='queued', progress=0,
+              params=json.dumps(params or {}), owner=job_owner(), heartbeat_at=datetime.utcnow())
+    db.session.add(job)
+    db.session.commit()
+    _get_job_executor().submit(_run_job, job.id)
+    return job
+
+def recover_interrupted_jobs():
+    """Beim Start: Jobs ohne aktuelles Lebenszeichen als fehlgeschlagen markieren
+
+    Jobs anderer laufender Prozesse (weitere Worker, Hilfsskripte mit init_db) melden sich
+    alle JOB_HEARTBEAT_SECONDS und bleiben unangetastet.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=4 * app.config['JOB_HEARTBEAT_SECONDS'])
+    last_seen = db.func.coalesce(Job.heartbeat_at, Job.started_at, Job.created_at)
+    count = Job.query.filter(Job.status.in_(['queued', 'running']), last_seen < cutoff).update(
+        {'status': 'failed', 'error': 'Abgebrochen: ausführender Prozess ohne Lebenszeichen', 'finished_at': datetime.utcnow()},
+        synchronize_session=False)
+    db.session.commit()
+    if count:
+        print(f"⚠️  {count} unterbrochene Jobs als fehlgeschlagen markiert")
+
+def serialize_job(job):
+    progress, message = _job_progress.get(job.id, (job.progress, job.message))
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': progress,
+        'message': message,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'download_url': f'/api/jobs/{job.id}/download' if job.result_file and job.status == 'done' else None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@job_handler('export')
+def run_export_job(context, params):
+    """Kompletter CSV-Export als ZIP-Datei"""
+    path = context.result_path(f'kaktus_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip')
+    write_export_zip(path, progress=context.progress)
+    return {'file': os.path.basename(path), 'size': os.path.getsize(path)}
+
+@job_handler('recompute_alerts')
+def run_recompute_alerts_job(context, params):
+    """Berechnete Ansichten in allen Prozessen verwerfen und neu aufbauen"""
+    invalidate_caches('views')
+    db.session.commit()
+    warmed = []
+    for path in ('/api/care-schedule', '/api/care-alerts', '/api/dashboard-stats'):
+        with app.test_request_context(path):
+            app.view_functions[request.url_rule.endpoint]()
+        warmed.append(path)
+        context.progress(100 * len(warmed) // 3, path)
+    return {'warmed': warmed}
+
+def _import_species_id(value, names, ids):
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        species_id = int(value)
+        if species_id not in ids:
+            raise ValueError(f'Unbekannte Art-ID: {value}')
+        return species_id
+    species_id = names.get(value)
+    if species_id is None:
+        raise ValueError(f'Unbekannte Art: {value}')
+    return species_id
+
+@job_handler('import', writes=True)
+def run_import_job(context, params):
+    """Massenimport von Pflanzen, Aussaaten und Tagebucheinträgen (Format wie die POST-Routen)"""
+    names = {s['name']: s['id'] for s in get_species_payload()}
+    ids = set(names.values())
+    parse_date = lambda value: datetime.strptime(value, '%Y-%m-%d').date()
+    builders = {
+        'plants': lambda d: Plant(
+            species_id=_import_species_id(d['species'], names, ids),
+            purchase_date=parse_date(d['purchase_date']),
+            location=d.get('location', ''),
+            substrate=d.get('substrate', ''),
+            notes=d.get('notes', '')
+        ),
+        'sowings': lambda d: Sowing(
+            species_id=_import_species_id(d['species'], names, ids),
+            sowing_date=parse_date(d['sowing_date']),
+            seed_count=int(d['seed_count']),
+            pot_number=d['pot_number'],
+            notes=d.get('notes', '')
+        ),
+        'diary': lambda d: DiaryEntry(
+            date=parse_date(d['date']),
+            species_id=_import_species_id(d['species'], names, ids) if d.get('species') else None,
+            note=d['note'],
+            entry_type=d.get('entry_type', 'general')
+        ),
+    }
+
+    # Erst alles prüfen (auch, ob die Arten existieren), damit ungültige Daten früh auffallen
+    objects = []
+    for key, build in builders.items():
+        for index, row in enumerate(params.get(key) or []):
+            try:
+                objects.append((key, build(row)))
+            except (KeyError, ValueError, TypeError) as e:
+                raise ValueError(f'{key}[{index}]: ungültiger Datensatz ({e})')
+
+    # Eine Transaktion, in Blöcken geflusht: scheitert ein Datensatz in der Datenbank, wird nichts importiert
+    counts = {key: 0 for key in builders}
+    for start in range(0, len(objects), 500):
+        chunk = objects[start:start + 500]
+        db.session.add_all([obj for _, obj in chunk])
+        db.session.flush()
+        for key, _ in chunk:
+            counts[key] += 1
+        context.progress(100 * (start + len(chunk)) // len(objects), f'{start + len(chunk)}/{len(objects)} Datensätze')
+    db.session.commit()
+    return {'imported': counts}
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+@write_transaction
+def handle_jobs():
+    """Hintergrund-Jobs auflisten oder starten"""
+    if request.method == 'GET':
+        jobs = Job.query.order_by(Job.created_at.desc()).limit(50).all()
+        return jsonify([serialize_job(job) for job in jobs])
+
+    elif request.method == 'POST':
+        data = request.json or {}
+        kind = data.get('kind')
+        if kind not in JOB_HANDLERS:
+            return jsonify({'error': 'Unbekannte Job-Art', 'available': sorted(JOB_HANDLERS)}), 400
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params muss ein Objekt sein'}), 400
+        if kind == 'backup' and not valid_backup_label(params.get('label')):
+            return jsonify({'error': BACKUP_LABEL_ERROR}), 400
+        job = submit_job(kind, params)
+        return jsonify(serialize_job(job)), 202
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Status und Fortschritt eines Jobs"""
+    return jsonify(serialize_job(Job.query.get_or_404(job_id)))
+
+@app.route('/api/jobs/<job_id>/download')
+def download_job_result(job_id):
+    """Ergebnisdatei eines abgeschlossenen Jobs herunterladen"""
+    job = Job.query.get_or_404(job_id)
+    if job.status != 'done' or not job.result_file or not os.path.exists(job.result_file):
+        return jsonify({'error': 'Kein Ergebnis verfügbar', 'status': job.status}), 404
+    return send_file(job.result_file, as_attachment=True,
+                     download_name=os.path.basename(job.result_file).split('_', 1)[1])
+
+# ==================== BACKUPS ====================
+
+BACKUP_PREFIX = 'kaktus_'
+# Zusatz im Dateinamen: nur Buchstaben, Ziffern, _ und - (keine Pfadanteile)
+BACKUP_LABEL = re.compile(r'[A-Za-z0-9_-]{1,40}')
+BACKUP_LABEL_ERROR = 'label: 1-40 Zeichen aus A-Z, a-z, 0-9, _ und -'
+
+def valid_backup_label(label):
+    return label is None or (isinstance(label, str) and BACKUP_LABEL.fullmatch(label) is not None)
+
+def database_path():
+    """Absoluter Pfad der SQLite-Datei"""
+    return db.engine.url.database
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _online_copy(source_path, target_path, progress=None):
+    """Konsistente Kopie über die SQLite-Backup-API
+
+    Schreibt eine andere Verbindung zwischen zwei Schritten, beginnt SQLite die Kopie von vorn -
+    auch bei der Fortschrittsmeldung des Backup-Jobs. Im WAL-Modus hält ein Lesezugriff Schreiber
+    nicht auf, dort wird in einem Schritt kopiert. Sonst in kleinen Schritten mit Pausen, damit die
+    App weiter schreiben kann, und der Fortschritt erst am Ende.
+    """
+    pause = app.config['BACKUP_STEP_PAUSE']
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            source.backup(target)
+        else:
+            source.backup(target, pages=app.config['BACKUP_PAGES_PER_STEP'], progress=lambda *args: time.sleep(pause))
+    finally:
+        target.close()
+        source.close()
+    if progress:
+        progress(100)
+
+def _integrity_ok(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+    finally:
+        connection.close()
+
+def list_backups():
+    """Vorhandene Backups, neueste zuerst"""
+    backup_dir = app.config['BACKUP_DIR']
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [name for name in os.listdir(backup_dir)
+             if name.startswith(BACKUP_PREFIX) and (name.endswith('.db') or name.endswith('.db.gz'))]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+def rotate_backups():
+    """Nur die neuesten BACKUP_KEEP Backups behalten"""
+    removed = []
+    for path in list_backups()[app.config['BACKUP_KEEP']:]:
+        for file in (path, path + '.sha256'):
+            if os.path.exists(file):
+                os.remove(file)
+        removed.append(os.path.basename(path))
+    return removed
+
+# Backups dieses Prozesses nacheinander: gleichzeitige teilten sich Dateiname (sekundengenau) und .partial-Datei
+_backup_lock = threading.Lock()
+
+def create_backup(label=None, compress=None, progress=None):
+    """Online-Backup der Datenbank mit Integritätsprüfung, Kompression, Prüfsumme und Rotation"""
+    with _backup_lock:
+        return _create_backup(label, compress, progress)
+
+def _create_backup(label, compress, progress):
+    compress = app.config['BACKUP_COMPRESS'] if compress is None else compress
+    backup_dir = app.config['BACKUP_DIR']
+    os.makedirs(backup_dir, exist_ok=True)
+
+    if not valid_backup_label(label):
+        raise ValueError(BACKUP_LABEL_ERROR)
+    name = f'{BACKUP_PREFIX}{datetime.now().strftime("%Y%m%d_%H%M%S")}{"_" + label if label else ""}.db'
+    target = os.path.join(backup_dir, name)
+    if os.path.dirname(os.path.realpath(target)) != os.path.realpath(backup_dir):
+        raise ValueError(f'Backup-Ziel außerhalb von {backup_dir}: {name}')
+    partial = target + '.partial'
+    start = time.perf_counter()
+
+    try:
+        _online_copy(database_path(), partial, progress=lambda p: progress(p * 0.8, 'Kopiere Seiten') if progress else None)
+        if not _integrity_ok(partial):
+            raise RuntimeError('Integritätsprüfung der Kopie fehlgeschlagen')
+
+        if compress:
+            if progress:
+                progress(85, 'Komprimiere')
+            target += '.gz'
+            with open(partial, 'rb') as source, gzip.open(target, 'wb', compresslevel=6) as compressed:
+                shutil.copyfileobj(source, compressed, 1024 * 1024)
+            os.remove(partial)
+        else:
+            os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    checksum = _sha256(target)
+    with open(target + '.sha256', 'w') as f:
+        f.write(f'{checksum}  {os.path.basename(target)}\n')
+
+    removed = rotate_backups()
+    return {
+        'file': os.path.basename(target),
+        'size': os.path.getsize(target),
+        'sha256': checksum,
+        'seconds': round(time.perf_counter() - start, 2),
+        'rotated': removed
+    }
+
+def _extract_backup(path, target):
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as compressed, open(target, 'wb') as out:
+            shutil.copyfileobj(compressed, out, 1024 * 1024)
+    else:
+        shutil.copyfile(path, target)
+
+def verify_backup(path):
+    """Prüfsumme und Integrität eines Backups prüfen; liefert (ok, Meldung)"""
+    checksum_file = path + '.sha256'
+    if not os.path.exists(checksum_file):
+        return False, 'Prüfsummendatei fehlt'
+    with open(checksum_file) as f:
+        expected = f.read().split()[0]
+    if _sha256(path) != expected:
+        return False, 'Prüfsumme stimmt nicht'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        extracted = os.path.join(tmp, 'verify.db')
+        _extract_backup(path, extracted)
+        if not _integrity_ok(extracted):
+            return False, 'Integritätsprüfung fehlgeschlagen'
+    return True, 'OK'
+
+def restore_backup(path):
+    """Backup prüfen und per Backup-API in die laufende Datenbank zurückspielen
+
+    Vorher wird der aktuelle Stand als eigenes Backup gesichert.
+    """
+    ok, message = verify_backup(path)
+    if not ok:
+        raise RuntimeError(f'Backup ungültig: {message}')
+
+    safety = create_backup(label='vor_wiederherstellung')
+    # Cache-Versionen merken: das Backup bringt ältere Stände mit, die andere Prozesse schon kennen
+    versions = dict(db.session.execute(db.select(CacheVersion.name, CacheVersion.version)).all())
+    db.session.commit()
+    with tempfile.TemporaryDirectory() as tmp:
+        extracted = os.path.join(tmp, 'restore.db')
+        _extract_backup(path, extracted)
+        source = sqlite3.connect(extracted)
+        target = sqlite3.connect(database_path(), timeout=app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+    # Verbindungen und Caches aller Prozesse auf den neuen Stand bringen; ältere Backups ans aktuelle Schema anpassen
+    db.engine.dispose()
+    upgrade_database()
+    with db.engine.begin() as conn:
+        CacheVersion.__table__.create(bind=conn, checkfirst=True)
+        for name in CACHE_DEPENDENCIES:
+            conn.execute(text(
+                'INSERT INTO cache_version (name, version) VALUES (:name, :version) '
+                'ON CONFLICT(name) DO UPDATE SET version = MAX(version, :version)'
+            ), {'name': name, 'version': versions.get(name, 0) + 1})
+    for caches in _cache_registry.values():
+        for cache in caches:
+            cache.clear()
+    # Verbundene Geräte laden alles neu
+    change_feed.publish([{'entity': '*', 'id': None, 'op': 'reset'}])
+    return {'restored': os.path.basename(path), 'safety_backup': safety['file']}
+
+@job_handler('backup')
+def run_backup_job(context, params):
+    """Online-Backup als Hintergrund-Job"""
+    return create_backup(label=params.get('label'), compress=params.get('compress'),
+                         progress=lambda percent, message='Kopiere Seiten': context.progress(percent, message))
+
+@periodic_job('backup')
+def _backup_due():
+    if app.config['BACKUP_INTERVAL_HOURS'] <= 0:
+        return False
+    backups = list_backups()
+    if not backups:
+        return True
+    age = time.time() - os.path.getmtime(backups[0])
+    return age >= app.config['BACKUP_INTERVAL_HOURS'] * 3600
+
+@app.route('/api/backups', methods=['GET', 'POST'])
+@write_transaction
+def handle_backups():
+    """Backups auflisten oder ein neues Backup als Job starten"""
+    if request.method == 'GET':
+        return jsonify([{
+            'file': os.path.basename(path),
+            'size': os.path.getsize(path),
+            'created_at': datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+            'has_checksum': os.path.exists(path + '.sha256')
+        } for path in list_backups()])
+
+    elif request.method == 'POST':
+        params = request.get_json(silent=True) or {}
+        if not isinstance(params, dict) or not valid_backup_label(params.get('label')):
+            return jsonify({'error': BACKUP_LABEL_ERROR}), 400
+        job = submit_job('backup', params)
+        return jsonify(serialize_job(job)), 202
+
+def _check_backup_label(ctx, param, value):
+    if not valid_backup_label(value):
+        raise click.BadParameter(BACKUP_LABEL_ERROR)
+    return value
+
+@app.cli.command('backup')
+@click.option('--label', callback=_check_backup_label, help='Zusatz im Dateinamen (A-Z, a-z, 0-9, _ und -)')
+@click.option('--no-compress', is_flag=True, help='Nicht komprimieren')
+def backup_command(label, no_compress):
+    """Online-Backup der Datenbank erstellen"""
+    result = create_backup(label=label, compress=False if no_compress else None)
+    click.echo(f"✅ Backup erstellt: {result['file']} ({result['size']} Bytes, {result['seconds']} s)")
+    if result['rotated']:
+        click.echo(f"🗑️  Entfernt: {', '.join(result['rotated'])}")
+
+@app.cli.command('verify-backup')
+@click.argument('path', required=False)
+def verify_backup_command(path):
+    """Backup prüfen (Standard: neuestes)"""
+    paths = [path] if path else list_backups()[:1]
+    if not paths:
+        raise click.ClickException('Keine Backups vorhanden')
+    ok, message = verify_backup(paths[0])
+    click.echo(f"{'✅' if ok else '❌'} {os.path.basename(paths[0])}: {message}")
+    if not ok:
+        raise SystemExit(1)
+
+@app.cli.command('restore')
+@click.argument('path')
+@click.option('--yes', is_flag=True, help='Ohne Rückfrage wiederherstellen')
+def restore_command(path, yes):
+    """Datenbank aus einem Backup wiederherstellen"""
+    if not os.path.exists(path):
+        path = os.path.join(app.config['BACKUP_DIR'], path)
+    if not yes:
+        click.confirm(f'Aktuelle Daten durch {os.path.basename(path)} ersetzen?', abort=True)
+    result = restore_backup(path)
+    click.echo(f"✅ Wiederhergestellt: {result['restored']} (vorheriger Stand gesichert als {result['safety_backup']})")
+
+# ==================== INITIALISIERUNG ====================
+
+def init_db():
+    """Datenbank initialisieren mit allen 36 Arten"""
+    with app.app_context():
+        # Tabellen erstellen und bestehende Datenbanken erweitern
+        db.create_all()
+        upgrade_database()
+        recover_interrupted_jobs()
+
+        # Prüfen ob schon Arten existieren
+        if Species.query.count() == 0:
+            print("🌱 Lade alle Kakteen-Arten...")
+
+            # Vollständige Artenliste mit erweiterten Pflegeinfos
+            all_species = {
+                'Ancistrocactus pallidus': {
+                    'substrate': 'Mineralisch, kiesig',
+                    'temperature': '20-28°C',
+                    'germination_time': '2-4 Wochen',
+                    'care_notes': 'Gute Drainage, kühle Überwinterung bei 5-10°C.',
+                    'temperature_min': 20,
+                    'temperature_max': 28,
+                    'watering_summer': 'Mäßig, alle 2 Wochen',
+                    'watering_winter': 'Trocken halten',
+                    'light_requirements': 'Vollsonne',
+                    'special_care': 'Frosthart bis -7°C'
+                },
+                'Ariocarpus Mischung': {
+                    'substrate': 'Rein mineralisch, kalkhaltig',
+                    'temperature': '20-30°C',
+                    'germination_time': '1-4 Wochen',
+                    'care_notes': 'Sehr langsam wachsend, extrem fäulnisempfindlich, tiefe Töpfe.',
+                    'temperature_min': 20,
+                    'temperature_max': 30,
                     'watering_summer': 'Sehr sparsam, nur bei Schrumpfung',
                     'watering_winter': 'Absolut trocken',
                     'light_requirements': 'Hell, leichte Schattierung',
@@ -1539,28 +3076,6 @@ def init_db():
             db.session.commit()
             print(f"✅ {len(all_species)} Arten erfolgreich geladen!")
 
-# ==================== APP STARTEN ====================
-
-if __name__ == '__main__':
-    # Backup-Ordner erstellen
-    if not os.path.exists('backups'):
-        os.makedirs('backups')
-
-    # Static-Ordner erstellen
-    if not os.path.exists('static'):
-        os.makedirs('static')
-
-    # Datenbank initialisieren
-    init_db()
-
-    # Server starten
-    print("\n🌵 Kaktus-Center startet...")
-    print(f"📍 Zugriff über: http://localhost:5000")
-    print(f"📍 Oder im Netzwerk: http://[PI-IP]:5000\n")
-
-    # Debug-Modus für Entwicklung, False für Produktion
-    app.run(host='0.0.0.0', port=5000, debug=True)
-
 # Erweiterte app.py - Fügen Sie diese neuen Routen zu Ihrer bestehenden app.py hinzu
 
 # ==================== NEUE MODELLE ====================
@@ -1569,63 +3084,82 @@ if __name__ == '__main__':
 class PlantAction(db.Model):
     """Pflegeaktionen für Pflanzen"""
     id = db.Column(db.Integer, primary_key=True)
-    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id'), nullable=False)
+    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id', ondelete='CASCADE'), nullable=False)
     action_type = db.Column(db.String(50), nullable=False)  # water, fertilize, repot
-    action_date = db.Column(db.Date, nullable=False)
+    action_date = db.Column(db.Date, nullable=False, index=True)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    plant = db.relationship('Plant', backref='actions')
+    plant = db.relationship('Plant', backref=db.backref('actions', cascade='all, delete-orphan', passive_deletes=True))
+
+    # Für "letzte Aktionen einer Pflanze" (ORDER BY action_date DESC LIMIT n) und Zählungen pro Pflanze
+    __table_args__ = (db.Index('ix_plant_action_plant_date', 'plant_id', 'action_date'),)
 
 class CareChecklistItem(db.Model):
-    """Individuelle Pflege-Checklisten"""
+    """Individuelle Pflege-Checklisten
+
+    Aufgaben aus Vorlagen gibt es nur virtuell; eine Zeile entsteht erst beim Abhaken oder
+    Ausblenden (template_id gesetzt) oder für eigene Aufgaben einer Pflanze (template_id leer).
+    """
     id = db.Column(db.Integer, primary_key=True)
-    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id'), nullable=False)
+    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id', ondelete='CASCADE'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('checklist_template.id', ondelete='CASCADE'))
     task = db.Column(db.String(200), nullable=False)
     frequency = db.Column(db.String(50))  # daily, weekly, monthly
     completed = db.Column(db.Boolean, default=False)
     completed_date = db.Column(db.Date)
+    next_due = db.Column(db.Date, index=True)  # ab diesem Tag gilt die Aufgabe wieder als offen
+    hidden = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    plant = db.relationship('Plant', backref='checklist_items')
+    plant = db.relationship('Plant', backref=db.backref('checklist_items', cascade='all, delete-orphan', passive_deletes=True))
+
+    __table_args__ = (db.Index('ix_checklist_plant_template', 'plant_id', 'template_id', unique=True),)
+
+class ChecklistTemplate(db.Model):
+    """Checklisten-Vorlagen: für alle Pflanzen (species_id leer) oder für eine Art"""
+    id = db.Column(db.Integer, primary_key=True)
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), index=True)
+    task = db.Column(db.String(200), nullable=False)
+    frequency = db.Column(db.String(50))  # daily, weekly, monthly
+    sort_order = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 # ==================== NEUE API ENDPOINTS ====================
 # Fügen Sie diese zu Ihrer app.py hinzu:
 
-@app.route('/api/plants/<int:plant_id>/action', methods=['POST'])
-def add_plant_action(plant_id):
-    """Pflegeaktion hinzufügen (Gießen, Düngen, Umtopfen)"""
-    plant = Plant.query.get_or_404(plant_id)
-    data = request.json
+PLANT_ACTION_TYPES = ('water', 'fertilize', 'repot')
 
-    action_type = data.get('action_type')
-    if action_type not in ['water', 'fertilize', 'repot']:
-        return jsonify({'error': 'Ungültiger Aktionstyp'}), 400
-
-    # Neue Aktion erstellen
+def record_plant_action(plant, data):
+    """Aktion anlegen und last_watered/last_fertilized der Pflanze nachziehen"""
     action = PlantAction(
-        plant_id=plant_id,
-        action_type=action_type,
+        plant_id=plant.id,
+        action_type=data['action_type'],
         action_date=datetime.strptime(data.get('date', datetime.now().strftime('%Y-%m-%d')), '%Y-%m-%d').date(),
         notes=data.get('notes', '')
     )
     db.session.add(action)
 
-    # Update last_watered/last_fertilized in Plant model
-    if action_type == 'water':
+    if action.action_type == 'water':
         plant.last_watered = action.action_date
-    elif action_type == 'fertilize':
+    elif action.action_type == 'fertilize':
         plant.last_fertilized = action.action_date
 
-    # Automatisch Tagebucheintrag erstellen
-    diary_entry = DiaryEntry(
-        date=action.action_date,
-        species_id=plant.species_id,
-        note=f"{'💧 Gegossen' if action_type == 'water' else '🌿 Gedüngt' if action_type == 'fertilize' else '🪴 Umgetopft'}: {action.notes or 'Standard'}",
-        entry_type=action_type
-    )
-    db.session.add(diary_entry)
+    # Kein eigener Tagebucheintrag mehr: die Aktion erscheint über diary_timeline() im Tagebuch
+    return action
+
+@app.route('/api/plants/<int:plant_id>/action', methods=['POST'])
+@write_transaction
+def add_plant_action(plant_id):
+    """Pflegeaktion hinzufügen (Gießen, Düngen, Umtopfen)"""
+    plant = Plant.query.get_or_404(plant_id)
+    data = request.json
+
+    action_type = data.get('action_type')
+    if action_type not in PLANT_ACTION_TYPES:
+        return jsonify({'error': 'Ungültiger Aktionstyp'}), 400
 
+    action = record_plant_action(plant, data)
     db.session.commit()
 
     return jsonify({
@@ -1636,17 +3170,25 @@ def add_plant_action(plant_id):
 
 @app.route('/api/plants/<int:plant_id>/actions', methods=['GET'])
 def get_plant_actions(plant_id):
-    """Alle Aktionen einer Pflanze abrufen"""
-    actions = PlantAction.query.filter_by(plant_id=plant_id).order_by(PlantAction.action_date.desc()).all()
+    """Alle Aktionen einer Pflanze abrufen (?include_archive=1 inkl. Archiv)"""
+    columns = lambda model: db.select(model.id, model.action_type, model.action_date, model.notes,
+                                      db.literal(model is PlantActionArchive).label('archived')
+                                      ).where(model.plant_id == plant_id)
+    query = columns(PlantAction)
+    if arg_flag('include_archive'):
+        query = db.union_all(query, columns(PlantActionArchive))
+    actions = db.session.execute(query.order_by(db.text('action_date DESC'))).all()
 
     return jsonify([{
         'id': a.id,
         'type': a.action_type,
         'date': a.action_date.isoformat(),
-        'notes': a.notes
+        'notes': a.notes,
+        'archived': bool(a.archived)
     } for a in actions])
 
 @app.route('/api/sowings/<int:sowing_id>/auto-transfer', methods=['POST'])
+@write_transaction
 def auto_transfer_to_plants(sowing_id):
     """Automatischer Transfer von Keimung zu Pflanzenbestand"""
     sowing = Sowing.query.get_or_404(sowing_id)
@@ -1669,15 +3211,7 @@ def auto_transfer_to_plants(sowing_id):
     )
     db.session.add(plant)
 
-    # Tagebucheintrag
-    diary = DiaryEntry(
-        date=sowing.germination_date,
-        species_id=sowing.species_id,
-        note=f"🌱 Keimung: {sowing.germinated_count} von {sowing.seed_count} Samen gekeimt. Automatisch zum Bestand hinzugefügt.",
-        entry_type='germination'
-    )
-    db.session.add(diary)
-
+    # Die Keimung erscheint über diary_timeline() im Tagebuch
     db.session.commit()
 
     return jsonify({
@@ -1686,121 +3220,313 @@ def auto_transfer_to_plants(sowing_id):
         'message': f'{sowing.germinated_count} Sämlinge wurden zum Bestand hinzugefügt'
     })
 
+# Nach so vielen Tagen ist eine erledigte Aufgabe wieder fällig
+CHECKLIST_INTERVALS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+CHECKLIST_FREQUENCIES = tuple(CHECKLIST_INTERVALS)
+DEFAULT_CHECKLIST = [
+    ('Auf Schädlinge kontrollieren', 'daily'),
+    ('Temperatur prüfen', 'daily'),
+    ('Lichtverhältnisse optimal?', 'daily'),
+    ('Substratfeuchtigkeit prüfen', 'weekly'),
+    ('Auf neue Triebe/Knospen prüfen', 'weekly'),
+    ('Platzbedarf prüfen', 'monthly')
+]
+
+def checklist_templates_for(species_id):
+    """Vorlagen für eine Art; eine Art-Vorlage ersetzt die gleichnamige allgemeine Vorlage"""
+    templates = ChecklistTemplate.query.filter(
+        db.or_(ChecklistTemplate.species_id.is_(None), ChecklistTemplate.species_id == species_id)
+    ).order_by(ChecklistTemplate.sort_order, ChecklistTemplate.id).all()
+    specific = {t.task.lower() for t in templates if t.species_id is not None}
+    return [t for t in templates if t.species_id is not None or t.task.lower() not in specific]
+
+def next_due_date(frequency, completed_date):
+    interval = CHECKLIST_INTERVALS.get(frequency)
+    return completed_date + timedelta(days=interval) if interval and completed_date else None
+
+def is_checklist_done(row, today):
+    """Erledigt gilt nur bis zur nächsten Fälligkeit, auch wenn der tägliche Reset noch nicht lief"""
+    return bool(row and row.completed and (row.next_due is None or row.next_due > today))
+
+def serialize_checklist_item(item_id, task, frequency, row, template_id=None, today=None):
+    today = today or datetime.now().date()
+    return {
+        'id': item_id,
+        'task': task,
+        'frequency': frequency,
+        'completed': is_checklist_done(row, today),
+        'completed_date': row.completed_date.isoformat() if row and row.completed_date else None,
+        'next_due': row.next_due.isoformat() if row and row.next_due else None,
+        'template_id': template_id
+    }
+
+def resolve_checklist(plant):
+    """Checkliste einer Pflanze aus Vorlagen plus gespeicherten Abweichungen zusammensetzen"""
+    rows = CareChecklistItem.query.filter_by(plant_id=plant.id).all()
+    overrides = {row.template_id: row for row in rows if row.template_id is not None}
+
+    items = []
+    for template in checklist_templates_for(plant.species_id):
+        row = overrides.get(template.id)
+        if row is None or not row.hidden:
+            items.append(serialize_checklist_item(f't-{template.id}', template.task, template.frequency, row, template.id))
+    items.extend(serialize_checklist_item(row.id, row.task, row.frequency, row)
+                 for row in rows if row.template_id is None and not row.hidden)
+    return items
+
+def _checklist_row(plant, item_id):
+    """Gespeicherte Zeile zu einer (ggf. virtuellen) Checklisten-ID, legt sie bei Vorlagen bei Bedarf an"""
+    if isinstance(item_id, str) and item_id.startswith('t-'):
+        template_id = int(item_id[2:])
+        template = next((t for t in checklist_templates_for(plant.species_id) if t.id == template_id), None)
+        if template is None:
+            return None
+        row = CareChecklistItem.query.filter_by(plant_id=plant.id, template_id=template_id).first()
+        if row is None:
+            row = CareChecklistItem(plant_id=plant.id, template_id=template_id,
+                                    task=template.task, frequency=template.frequency)
+            db.session.add(row)
+        return row
+    return CareChecklistItem.query.filter_by(id=int(item_id), plant_id=plant.id).first()
+
 @app.route('/api/plants/<int:plant_id>/checklist', methods=['GET', 'POST'])
+@write_transaction
 def handle_plant_checklist(plant_id):
     """Individuelle Pflege-Checkliste verwalten"""
     plant = Plant.query.get_or_404(plant_id)
 
     if request.method == 'GET':
-        # Checkliste abrufen
-        items = CareChecklistItem.query.filter_by(plant_id=plant_id).all()
-
-        # Wenn keine Items, Standard-Checkliste erstellen
-        if not items:
-            default_tasks = [
-                ('Auf Schädlinge kontrollieren', 'daily'),
-                ('Temperatur prüfen', 'daily'),
-                ('Lichtverhältnisse optimal?', 'daily'),
-                ('Substratfeuchtigkeit prüfen', 'weekly'),
-                ('Auf neue Triebe/Knospen prüfen', 'weekly'),
-                ('Platzbedarf prüfen', 'monthly')
-            ]
-
-            for task, freq in default_tasks:
-                item = CareChecklistItem(
-                    plant_id=plant_id,
-                    task=task,
-                    frequency=freq
-                )
-                db.session.add(item)
-            db.session.commit()
-            items = CareChecklistItem.query.filter_by(plant_id=plant_id).all()
-
-        return jsonify([{
-            'id': item.id,
-            'task': item.task,
-            'frequency': item.frequency,
-            'completed': item.completed,
-            'completed_date': item.completed_date.isoformat() if item.completed_date else None
-        } for item in items])
+        # Vorlagen werden beim Lesen aufgelöst, es wird nichts geschrieben
+        return jsonify(resolve_checklist(plant))
 
     elif request.method == 'POST':
-        # Checklist-Item abhaken
         data = request.json
-        item_id = data.get('item_id')
-        completed = data.get('completed', False)
 
-        item = CareChecklistItem.query.get_or_404(item_id)
-        item.completed = completed
-        item.completed_date = datetime.now().date() if completed else None
+        # Eigene Aufgabe nur für diese Pflanze
+        if data.get('item_id') is None:
+            if not data.get('task') or data.get('frequency') not in CHECKLIST_FREQUENCIES:
+                return jsonify({'error': 'task und frequency (daily, weekly, monthly) erforderlich'}), 400
+            item = CareChecklistItem(plant_id=plant_id, task=data['task'], frequency=data['frequency'])
+            db.session.add(item)
+            db.session.commit()
+            return jsonify({'id': item.id, 'status': 'created'})
+
+        # Checklist-Item abhaken oder ausblenden
+        try:
+            item = _checklist_row(plant, data['item_id'])
+        except ValueError:
+            item = None
+        if item is None:
+            return jsonify({'error': 'Checklisten-Eintrag nicht gefunden'}), 404
+
+        if 'completed' in data:
+            completed = bool(data['completed'])
+            item.completed = completed
+            item.completed_date = datetime.now().date() if completed else None
+            item.next_due = next_due_date(item.frequency, item.completed_date)
+        if 'hidden' in data:
+            item.hidden = bool(data['hidden'])
 
         db.session.commit()
         return jsonify({'status': 'success'})
 
+def reset_due_checklist_items(today=None):
+    """Alle wieder fälligen Aufgaben in einem UPDATE zurücksetzen (über den Index auf next_due)"""
+    today = today or datetime.now().date()
+    return db.session.execute(
+        db.update(CareChecklistItem)
+        .where(CareChecklistItem.completed == True, CareChecklistItem.next_due <= today)
+        .values(completed=False),
+        execution_options={'synchronize_session': False}).rowcount
+
+@job_handler('reset_checklists', writes=True)
+def run_reset_checklists_job(context, params):
+    """Täglicher Reset erledigter Checklisten-Aufgaben nach ihrer Häufigkeit"""
+    reset = reset_due_checklist_items()
+    db.session.commit()
+    return {'reset': reset}
+
+@periodic_job('reset_checklists')
+def _checklist_reset_due():
+    return not ran_today('reset_checklists')
+
+def due_checklist_query(today, frequency=None):
+    """Alle offenen Aufgaben der Sammlung: Vorlagen je Pflanze plus eigene Aufgaben, als ein Statement"""
+    row = db.aliased(CareChecklistItem)
+    override = db.aliased(ChecklistTemplate)
+    open_row = db.or_(row.id.is_(None),
+                      db.and_(row.hidden == False,
+                              db.or_(row.completed != True, row.next_due <= today)))
+    from_templates = db.select(
+        Plant.id.label('plant_id'), Plant.species_id, Plant.location,
+        db.literal_column("'t-' || checklist_template.id").label('item_id'),
+        ChecklistTemplate.task, ChecklistTemplate.frequency, row.completed_date, row.next_due
+    ).join(ChecklistTemplate, db.or_(ChecklistTemplate.species_id.is_(None),
+                                     ChecklistTemplate.species_id == Plant.species_id)
+    ).outerjoin(row, db.and_(row.plant_id == Plant.id, row.template_id == ChecklistTemplate.id)
+    ).where(open_row, ~db.exists().where(
+        # Art-Vorlage ersetzt die gleichnamige allgemeine Vorlage
+        ChecklistTemplate.species_id.is_(None),
+        override.species_id == Plant.species_id,
+        db.func.lower(override.task) == db.func.lower(ChecklistTemplate.task)))
+    custom = db.select(
+        Plant.id.label('plant_id'), Plant.species_id, Plant.location,
+        db.cast(CareChecklistItem.id, db.String).label('item_id'),
+        CareChecklistItem.task, CareChecklistItem.frequency, CareChecklistItem.completed_date, CareChecklistItem.next_due
+    ).join(Plant, Plant.id == CareChecklistItem.plant_id).where(
+        CareChecklistItem.template_id.is_(None), CareChecklistItem.hidden == False,
+        db.or_(CareChecklistItem.completed != True, CareChecklistItem.next_due <= today))
+    if frequency:
+        from_templates = from_templates.where(ChecklistTemplate.frequency == frequency)
+        custom = custom.where(CareChecklistItem.frequency == frequency)
+    return db.union_all(from_templates, custom).subquery()
+
+@app.route('/api/checklist/due')
+@cached_view
+def checklist_due():
+    """Heute fällige Checklisten-Aufgaben über alle Pflanzen (?frequency=, ?limit=, ?offset=)"""
+    today = datetime.now().date()
+    frequency = request.args.get('frequency')
+    if frequency and frequency not in CHECKLIST_FREQUENCIES:
+        return jsonify({'error': f'frequency muss eine von {", ".join(CHECKLIST_FREQUENCIES)} sein'}), 400
+    limit = min(request.args.get('limit', 200, type=int), 1000)
+    offset = request.args.get('offset', 0, type=int)
+
+    due = due_checklist_query(today, frequency)
+    by_task = db.session.execute(db.select(due.c.task, due.c.frequency, db.func.count().label('count'))
+                                 .group_by(due.c.task, due.c.frequency).order_by(db.desc('count'))).all()
+    rows = db.session.execute(db.select(due).order_by(due.c.plant_id, due.c.item_id).limit(limit).offset(offset)).all()
+    return jsonify({
+        'date': today.isoformat(),
+        'total': sum(r.count for r in by_task),
+        'by_task': [dict(r._mapping) for r in by_task],
+        'items': [{
+            'plant_id': r.plant_id,
+            'species_name': species_name(r.species_id),
+            'location': r.location,
+            'id': r.item_id if r.item_id.startswith('t-') else int(r.item_id),
+            'task': r.task,
+            'frequency': r.frequency,
+            'last_completed': r.completed_date.isoformat() if r.completed_date else None,
+            'next_due': r.next_due.isoformat() if r.next_due else None
+        } for r in rows]
+    })
+
+@app.route('/api/checklist-templates', methods=['GET', 'POST'])
+@write_transaction
+def handle_checklist_templates():
+    """Checklisten-Vorlagen verwalten (allgemein oder pro Art)"""
+    if request.method == 'GET':
+        query = ChecklistTemplate.query
+        if 'species_id' in request.args:
+            query = query.filter(ChecklistTemplate.species_id == request.args.get('species_id', type=int))
+        return jsonify([{
+            'id': t.id,
+            'species': t.species_id,
+            'species_name': species_name(t.species_id) if t.species_id else 'Alle Arten',
+            'task': t.task,
+            'frequency': t.frequency,
+            'sort_order': t.sort_order
+        } for t in query.order_by(ChecklistTemplate.species_id, ChecklistTemplate.sort_order, ChecklistTemplate.id)])
+
+    elif request.method == 'POST':
+        data = request.json
+        if not data.get('task') or data.get('frequency') not in CHECKLIST_FREQUENCIES:
+            return jsonify({'error': 'task und frequency (daily, weekly, monthly) erforderlich'}), 400
+        try:
+            species_id = existing_species_id(data['species']) if data.get('species') else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        template = ChecklistTemplate(
+            species_id=species_id,
+            task=data['task'],
+            frequency=data['frequency'],
+            sort_order=data.get('sort_order', 0)
+        )
+        db.session.add(template)
+        db.session.commit()
+        return jsonify({'id': template.id, 'status': 'created'})
+
+@app.route('/api/checklist-templates/<int:template_id>', methods=['DELETE'])
+@write_transaction
+def delete_checklist_template(template_id):
+    """Vorlage löschen, inklusive gespeicherter Häkchen der Pflanzen"""
+    template = ChecklistTemplate.query.get_or_404(template_id)
+    db.session.execute(db.delete(CareChecklistItem).where(CareChecklistItem.template_id == template_id),
+                       execution_options={'synchronize_session': False})
+    db.session.delete(template)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
 @app.route('/api/care-alerts')
+@cached_view
 def get_care_alerts():
-    """Pflegewarnungen für alle Pflanzen"""
+    """Pflegewarnungen für alle Pflanzen, mit den Schwellwerten der jeweiligen Art und Saison"""
     alerts = []
-    plants = Plant.query.all()
     today = datetime.now().date()
+    limits = ThresholdLimits(today)
+    days_since_water = days_since(Plant.last_watered, today)
+    days_since_fertilize = days_since(Plant.last_fertilized, today)
 
-    for plant in plants:
+    # Nur auffällige Pflanzen laden - die Schwellwerte vergleicht SQLite
+    rows = db.session.execute(
+        db.select(Plant.id, Plant.species_id, Plant.location, Plant.last_watered,
+                  days_since_water.label('days_since_water'), days_since_fertilize.label('days_since_fertilize'),
+                  limits.water_warn.label('water_warn'), limits.water_urgent.label('water_urgent'),
+                  limits.fertilize.label('fertilize'))
+        .select_from(Plant).outerjoin(limits.table, limits.join)
+        .where(db.or_(limits.water_due, limits.fertilize_due))
+    ).all()
+
+    for plant in rows:
+        name = species_name(plant.species_id)
         # Gießwarnung
-        if plant.last_watered:
-            days_since_water = (today - plant.last_watered).days
-            if days_since_water > 14:  # Standard 2 Wochen
+        if plant.water_warn is not None:
+            if plant.last_watered is None:
                 alerts.append({
                     'type': 'water',
-                    'priority': 'high' if days_since_water > 21 else 'medium',
+                    'priority': 'high',
                     'plant_id': plant.id,
-                    'species': plant.species.name,
-                    'message': f'{plant.species.name} seit {days_since_water} Tagen nicht gegossen!',
-                    'location': plant.location
+                    'species': name,
+                    'message': f'{name} wurde noch nie gegossen!',
+                    'location': plant.location,
+                    'threshold_days': plant.water_warn
                 })
-        else:
+            elif plant.days_since_water > plant.water_warn:
+                days = int(plant.days_since_water)
+                alerts.append({
+                    'type': 'water',
+                    'priority': 'high' if days > plant.water_urgent else 'medium',
+                    'plant_id': plant.id,
+                    'species': name,
+                    'message': f'{name} seit {days} Tagen nicht gegossen!',
+                    'location': plant.location,
+                    'threshold_days': plant.water_warn
+                })
+
+        # Düngwarnung
+        if plant.fertilize is not None and plant.days_since_fertilize is not None \
+                and plant.days_since_fertilize > plant.fertilize:
             alerts.append({
-                'type': 'water',
-                'priority': 'high',
+                'type': 'fertilize',
+                'priority': 'low',
                 'plant_id': plant.id,
-                'species': plant.species.name,
-                'message': f'{plant.species.name} wurde noch nie gegossen!',
-                'location': plant.location
+                'species': name,
+                'message': f'{name} könnte gedüngt werden (vor {int(plant.days_since_fertilize)} Tagen)',
+                'location': plant.location,
+                'threshold_days': plant.fertilize
             })
 
-        # Düngwarnung
-        if plant.last_fertilized:
-            days_since_fertilize = (today - plant.last_fertilized).days
-            if days_since_fertilize > 30:  # Standard 1 Monat
-                alerts.append({
-                    'type': 'fertilize',
-                    'priority': 'low',
-                    'plant_id': plant.id,
-                    'species': plant.species.name,
-                    'message': f'{plant.species.name} könnte gedüngt werden (vor {days_since_fertilize} Tagen)',
-                    'location': plant.location
-                })
+    # Weitere Warnungen (z.B. Sämlinge) aus den Pflegeregeln
+    for rule, row in evaluate_care_rules('alerts', today):
+        alert = rule.render(row)
+        alert['species'] = species_name(row['species_id'])
+        if rule.target == 'plant':
+            alert.update(plant_id=row['id'], location=row['location'])
+        alerts.append(alert)
 
-        # Sämlingswarnung
-        if hasattr(plant, 'from_sowing') and plant.from_sowing:
-            age_days = (today - plant.purchase_date).days
-            if age_days == 14:
-                alerts.append({
-                    'type': 'seedling',
-                    'priority': 'medium',
-                    'plant_id': plant.id,
-                    'species': plant.species.name,
-                    'message': f'Sämlinge {plant.species.name} sind 2 Wochen alt - Abhärtung beginnen',
-                    'location': plant.location
-                })
-            elif age_days == 60:
-                alerts.append({
-                    'type': 'seedling',
-                    'priority': 'medium',
-                    'plant_id': plant.id,
-                    'species': plant.species.name,
-                    'message': f'Sämlinge {plant.species.name} sind 2 Monate alt - Umtopfen prüfen',
-                    'location': plant.location
-                })
+    # Standorte, deren Sensoren außerhalb des Temperaturbereichs der Art lagen
+    alerts.extend(temperature_alerts(today))
 
     # Nach Priorität sortieren
     priority_order = {'high': 0, 'medium': 1, 'low': 2}
@@ -1808,108 +3534,1640 @@ def get_care_alerts():
 
     return jsonify(alerts)
 
-@app.route('/api/plant-care-stats/<int:plant_id>')
-def get_plant_care_stats(plant_id):
-    """Detaillierte Pflegestatistiken für eine Pflanze"""
-    plant = Plant.query.get_or_404(plant_id)
-    actions = PlantAction.query.filter_by(plant_id=plant_id).all()
+PLANT_STATS_RECENT = 5
+PLANT_STATS_MAX_IDS = 500
 
-    # Statistiken berechnen
-    water_actions = [a for a in actions if a.action_type == 'water']
-    fertilize_actions = [a for a in actions if a.action_type == 'fertilize']
-    repot_actions = [a for a in actions if a.action_type == 'repot']
+def _recent_actions(plant_ids):
+    """Die letzten Aktionen je Pflanze, bei mehreren Pflanzen per ROW_NUMBER in einem Statement"""
+    columns = (PlantAction.plant_id, PlantAction.action_type, PlantAction.action_date, PlantAction.notes)
+    order = (PlantAction.action_date.desc(), PlantAction.id.desc())
+    if len(plant_ids) == 1:
+        query = db.select(*columns).where(PlantAction.plant_id == plant_ids[0]).order_by(*order).limit(PLANT_STATS_RECENT)
+    else:
+        ranked = db.select(*columns, db.func.row_number().over(partition_by=PlantAction.plant_id, order_by=order)
+                           .label('rank')).where(PlantAction.plant_id.in_(plant_ids)).subquery()
+        query = db.select(ranked.c.plant_id, ranked.c.action_type, ranked.c.action_date, ranked.c.notes) \
+            .where(ranked.c.rank <= PLANT_STATS_RECENT).order_by(ranked.c.plant_id, ranked.c.rank)
 
-    today = datetime.now().date()
+    recent = {plant_id: [] for plant_id in plant_ids}
+    for row in db.session.execute(query):
+        recent[row.plant_id].append({'type': row.action_type, 'date': row.action_date.isoformat(), 'notes': row.notes})
+    return recent
+
+def compute_plant_care_stats(plants, today=None):
+    """Pflegestatistiken für mehrere Pflanzen mit einer Handvoll Abfragen, unabhängig von der Anzahl"""
+    today = today or datetime.now().date()
+    plant_ids = [plant.id for plant in plants]
 
-    stats = {
-        'plant_id': plant_id,
-        'species': plant.species.name,
+    # Zählungen aus den aktuellen Aktionen und den Monatssummen des Archivs
+    totals = Counter()
+    counts = db.union_all(
+        db.select(PlantAction.plant_id, PlantAction.action_type, db.func.count().label('count'))
+        .where(PlantAction.plant_id.in_(plant_ids)).group_by(PlantAction.plant_id, PlantAction.action_type),
+        db.select(ActionRollup.plant_id, ActionRollup.action_type, db.func.sum(ActionRollup.count).label('count'))
+        .where(ActionRollup.plant_id.in_(plant_ids)).group_by(ActionRollup.plant_id, ActionRollup.action_type))
+    for plant_id, action_type, count in db.session.execute(counts):
+        totals[plant_id, action_type] += count
+
+    recent = _recent_actions(plant_ids)
+    species = get_species_map()
+    return {plant.id: {
+        'plant_id': plant.id,
+        'species': species_name(plant.species_id),
         'age_days': (today - plant.purchase_date).days,
         'location': plant.location,
-        'total_waterings': len(water_actions),
-        'total_fertilizations': len(fertilize_actions),
-        'total_repottings': len(repot_actions),
+        'total_waterings': totals[plant.id, 'water'],
+        'total_fertilizations': totals[plant.id, 'fertilize'],
+        'total_repottings': totals[plant.id, 'repot'],
         'days_since_water': (today - plant.last_watered).days if plant.last_watered else None,
         'days_since_fertilize': (today - plant.last_fertilized).days if plant.last_fertilized else None,
-        'from_sowing': hasattr(plant, 'from_sowing') and plant.from_sowing,
-        'recommended_water_interval': plant.species.watering_summer if hasattr(plant.species, 'watering_summer') else '14 Tage',
-        'recent_actions': [{
-            'type': a.action_type,
-            'date': a.action_date.isoformat(),
-            'notes': a.notes
-        } for a in sorted(actions, key=lambda x: x.action_date, reverse=True)[:5]]
+        'from_sowing': bool(plant.from_sowing),
+        'recommended_water_interval': (species.get(plant.species_id) or {}).get('watering_summer') or '14 Tage',
+        'recent_actions': recent[plant.id]
+    } for plant in plants}
+
+@app.route('/api/plant-care-stats/<int:plant_id>')
+def get_plant_care_stats(plant_id):
+    """Detaillierte Pflegestatistiken für eine Pflanze"""
+    plant = Plant.query.get_or_404(plant_id)
+    return jsonify(compute_plant_care_stats([plant])[plant_id])
+
+@app.route('/api/plant-care-stats')
+def get_plant_care_stats_batch():
+    """Pflegestatistiken für mehrere Pflanzen auf einmal (?ids=1,2,3), z.B. für die Bestandsliste"""
+    try:
+        plant_ids = sorted({int(value) for value in request.args.get('ids', '').split(',') if value.strip()})
+    except ValueError:
+        return jsonify({'error': 'ids muss eine Liste von Zahlen sein, z.B. ?ids=1,2,3'}), 400
+    if not plant_ids:
+        return jsonify({'error': 'Keine Pflanzen angegeben (?ids=1,2,3)'}), 400
+    if len(plant_ids) > PLANT_STATS_MAX_IDS:
+        return jsonify({'error': f'Maximal {PLANT_STATS_MAX_IDS} Pflanzen pro Abfrage'}), 400
+
+    plants = Plant.query.filter(Plant.id.in_(plant_ids)).all()
+    stats = compute_plant_care_stats(plants)
+    return jsonify({
+        'stats': {str(plant_id): stats[plant_id] for plant_id in plant_ids if plant_id in stats},
+        'missing': [plant_id for plant_id in plant_ids if plant_id not in stats]
+    })
+
+# ==================== ARCHIV ====================
+# Alte Tagebucheinträge und Pflegeaktionen wandern in eigene Archivtabellen.
+# Für Statistiken bleiben Monatssummen (pro Pflanze bzw. pro Eintragstyp) erhalten.
+
+class DiaryEntryArchive(db.Model):
+    """Archivierte Tagebucheinträge (ursprüngliche ID bleibt erhalten)"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    date = db.Column(db.Date, nullable=False, index=True)
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='SET NULL'))
+    note = db.Column(db.Text, nullable=False)
+    entry_type = db.Column(db.String(50), default='general')
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class PlantActionArchive(db.Model):
+    """Archivierte Pflegeaktionen (ursprüngliche ID bleibt erhalten)"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id', ondelete='CASCADE'), nullable=False, index=True)
+    action_type = db.Column(db.String(50), nullable=False)
+    action_date = db.Column(db.Date, nullable=False, index=True)
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ActionRollup(db.Model):
+    """Archivierte Pflegeaktionen pro Pflanze, Monat und Aktionstyp"""
+    plant_id = db.Column(db.Integer, db.ForeignKey('plant.id', ondelete='CASCADE'), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    action_type = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    first_date = db.Column(db.Date)
+    last_date = db.Column(db.Date)
+
+class DiaryRollup(db.Model):
+    """Archivierte Tagebucheinträge pro Monat und Eintragstyp"""
+    month = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    entry_type = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+def _month(column):
+    return db.func.strftime('%Y-%m', column)
+
+def _archive_actions(last_id, before):
+    criteria = (PlantAction.action_date < before, PlantAction.id <= last_id)
+    columns = ['id', 'plant_id', 'action_type', 'action_date', 'notes', 'created_at']
+    db.session.execute(db.insert(PlantActionArchive).from_select(
+        columns, db.select(*(getattr(PlantAction, c) for c in columns)).where(*criteria)))
+
+    rollup = sqlite_insert(ActionRollup).from_select(
+        ['plant_id', 'month', 'action_type', 'count', 'first_date', 'last_date'],
+        db.select(PlantAction.plant_id, _month(PlantAction.action_date), PlantAction.action_type,
+                  db.func.count(), db.func.min(PlantAction.action_date), db.func.max(PlantAction.action_date))
+        .where(*criteria)
+        .group_by(PlantAction.plant_id, _month(PlantAction.action_date), PlantAction.action_type))
+    db.session.execute(rollup.on_conflict_do_update(
+        index_elements=['plant_id', 'month', 'action_type'],
+        set_={'count': ActionRollup.count + rollup.excluded['count'],
+              'first_date': db.func.min(ActionRollup.first_date, rollup.excluded.first_date),
+              'last_date': db.func.max(ActionRollup.last_date, rollup.excluded.last_date)}))
+
+    return db.session.execute(db.delete(PlantAction).where(*criteria),
+                              execution_options={'synchronize_session': False}).rowcount
+
+def _archive_diary(last_id, before):
+    criteria = (DiaryEntry.date < before, DiaryEntry.id <= last_id)
+    columns = ['id', 'date', 'species_id', 'note', 'entry_type', 'created_at']
+    db.session.execute(db.insert(DiaryEntryArchive).from_select(
+        columns, db.select(*(getattr(DiaryEntry, c) for c in columns)).where(*criteria)))
+
+    rollup = sqlite_insert(DiaryRollup).from_select(
+        ['month', 'entry_type', 'count'],
+        db.select(_month(DiaryEntry.date), db.func.coalesce(DiaryEntry.entry_type, 'general'), db.func.count())
+        .where(*criteria)
+        .group_by(_month(DiaryEntry.date), db.func.coalesce(DiaryEntry.entry_type, 'general')))
+    db.session.execute(rollup.on_conflict_do_update(
+        index_elements=['month', 'entry_type'],
+        set_={'count': DiaryRollup.count + rollup.excluded['count']}))
+
+    return db.session.execute(db.delete(DiaryEntry).where(*criteria),
+                              execution_options={'synchronize_session': False}).rowcount
+
+ARCHIVE_SOURCES = (
+    ('plant_actions', PlantAction, PlantAction.action_date, _archive_actions),
+    ('diary_entries', DiaryEntry, DiaryEntry.date, _archive_diary),
+)
+
+def archive_history(before, progress=None):
+    """Einträge vor `before` blockweise ins Archiv verschieben, jeder Block in eigener Transaktion"""
+    chunk_size = app.config['ARCHIVE_CHUNK_SIZE']
+    totals = {key: db.session.scalar(db.select(db.func.count()).select_from(model).where(date_column < before))
+              for key, model, date_column, _ in ARCHIVE_SOURCES}
+    db.session.commit()
+    overall = sum(totals.values())
+    moved = {key: 0 for key in totals}
+
+    for key, model, date_column, archive_chunk in ARCHIVE_SOURCES:
+        while True:
+            # Obergrenze des Blocks über die ID, damit keine lange IN-Liste entsteht
+            chunk = db.select(model.id).where(date_column < before).order_by(model.id).limit(chunk_size).subquery()
+            last_id = db.session.scalar(db.select(db.func.max(chunk.c.id)))
+            if last_id is None:
+                db.session.commit()
+                break
+            count = archive_chunk(last_id, before)
+            # Massen-Statements laufen am Flush vorbei, daher explizit
+            invalidate_caches('views')
+            record_change(model.__table__.name)
+            db.session.commit()
+
+            moved[key] += count
+            if progress and overall:
+                done = sum(moved.values())
+                progress(100 * done // overall, f'{done}/{overall} Einträge archiviert')
+    return {'before': before.isoformat(), 'archived': moved}
+
+@job_handler('archive', writes=True)
+def run_archive_job(context, params):
+    """Alte Tagebucheinträge und Pflegeaktionen archivieren"""
+    days = int(params.get('days', app.config['ARCHIVE_AFTER_DAYS']))
+    return archive_history(datetime.now().date() - timedelta(days=days), progress=context.progress)
+
+@app.route('/api/archive', methods=['GET', 'POST'])
+@write_transaction
+def handle_archive():
+    """Archiv-Übersicht mit Monatssummen oder Archivierung als Job starten"""
+    if request.method == 'GET':
+        plant_id = request.args.get('plant_id', type=int)
+        actions = db.select(ActionRollup.month, ActionRollup.action_type, db.func.sum(ActionRollup.count).label('count'))
+        if plant_id is not None:
+            actions = actions.where(ActionRollup.plant_id == plant_id)
+        actions = actions.group_by(ActionRollup.month, ActionRollup.action_type).order_by(ActionRollup.month)
+        diary = db.select(DiaryRollup.month, DiaryRollup.entry_type, DiaryRollup.count).order_by(DiaryRollup.month)
+        if plant_id is not None:
+            diary = diary.where(db.false())
+
+        counts = db.session.execute(db.select(
+            _count(DiaryEntryArchive).label('diary_entries'),
+            _count(PlantActionArchive).label('plant_actions'),
+            db.select(db.func.min(PlantActionArchive.action_date)).scalar_subquery().label('oldest_action'),
+            db.select(db.func.max(PlantActionArchive.action_date)).scalar_subquery().label('newest_action')
+        )).one()
+        return jsonify({
+            'archived': {'diary_entries': counts.diary_entries, 'plant_actions': counts.plant_actions},
+            'oldest_action': counts.oldest_action.isoformat() if counts.oldest_action else None,
+            'newest_action': counts.newest_action.isoformat() if counts.newest_action else None,
+            'actions_by_month': [dict(row._mapping) for row in db.session.execute(actions)],
+            'diary_by_month': [dict(row._mapping) for row in db.session.execute(diary)]
+        })
+
+    elif request.method == 'POST':
+        job = submit_job('archive', request.get_json(silent=True) or {})
+        return jsonify(serialize_job(job)), 202
+
+@app.cli.command('archive')
+@click.option('--days', type=int, help='Einträge älter als so viele Tage archivieren')
+def archive_command(days):
+    """Alte Tagebucheinträge und Pflegeaktionen ins Archiv verschieben"""
+    days = days if days is not None else app.config['ARCHIVE_AFTER_DAYS']
+    g.write_transaction = True
+    result = archive_history(datetime.now().date() - timedelta(days=days),
+                             progress=lambda percent, message: click.echo(f'   {percent}% {message}'))
+    click.echo(f"✅ Archiviert vor {result['before']}: {result['archived']}")
+
+# ==================== ANALYSEN ====================
+
+# Gießhinweise der Arten als Richtwert in Tagen; 0 = trocken halten. Reihenfolge zählt: erster Treffer gilt.
+WATERING_KEYWORDS = [
+    (r'fast trocken', 42),
+    # Nur ausdrückliches Trockenhalten - "Mäßig, wenn Substrat trocken" heißt gießen, sobald es abgetrocknet ist
+    (r'knochentrocken|absolut trocken|trocken halten|^trocken(?! werden)|\bund trocken\b|nebeln statt', 0),
+    (r'minimal', 42),
+    (r'sehr sparsam|sehr vorsichtig', 28),
+    (r'sparsam|vorsichtig', 21),
+    (r'\bmäßig|\bwenn\b.*\btrocken\b', 14),
+    (r'reichlich|durchdringend|regelmäßig|gleichmäßig|feucht', 7),
+]
+WATERING_UNITS = {'tag': 1, 'woche': 7, 'monat': 30}
+SUMMER_MONTHS = (4, 5, 6, 7, 8, 9)  # Wachstumszeit, sonst gilt watering_winter
+WATERING_ROLLING_WINDOW = 5
+
+def parse_watering_interval(text):
+    """Gießhinweis ('Mäßig, alle 2 Wochen', 'Trocken halten', ...) in Tage übersetzen
+
+    Liefert 0 für "trocken halten" und None, wenn der Text keinen Hinweis enthält.
+    """
+    if not text:
+        return None
+    text = text.lower()
+    explicit = re.search(r'alle\s+(\d+)\s*(tag|woche|monat)', text)
+    if explicit:
+        return int(explicit.group(1)) * WATERING_UNITS[explicit.group(2)]
+    for pattern, days in WATERING_KEYWORDS:
+        if re.search(pattern, text):
+            return days
+    return None
+
+def _load_waterings(include_archive):
+    """Gieß-Historie spaltenweise: Pflanze, Art, Tag (julianday) und Monat, sortiert nach Pflanze und Datum"""
+    parts = [db.select(model.plant_id, model.action_date).where(model.action_type == 'water')
+             for model in ([PlantAction, PlantActionArchive] if include_archive else [PlantAction])]
+    actions = db.union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    query = db.select(
+        actions.c.plant_id, Plant.species_id,
+        db.func.julianday(actions.c.action_date), db.cast(db.func.strftime('%m', actions.c.action_date), db.Integer)
+    ).join(Plant, Plant.id == actions.c.plant_id).order_by(actions.c.plant_id, actions.c.action_date)
+
+    # Core statt ORM-Ergebnis und fromiter statt Zeilenobjekten: ein Puffer für alle Werte
+    rows = db.session.connection().execute(query).fetchall()
+    data = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=4 * len(rows)).reshape(-1, 4)
+    return data[:, 0].astype(np.int64), data[:, 1].astype(np.int64), data[:, 2], data[:, 3].astype(np.int64)
+
+def _grouped_stats(keys, values):
+    """Anzahl, Mittelwert, Median und Varianz je Schlüssel ohne Python-Schleife über die Werte"""
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    sums = np.add.reduceat(values, starts)
+    means = sums / counts
+    variances = np.add.reduceat(values ** 2, starts) / counts - means ** 2
+    # Median: Werte sind je Gruppe sortiert, also Mitte bzw. Mittel der beiden mittleren Werte
+    medians = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    return groups, counts, means, medians, np.maximum(variances, 0)
+
+def _rolling_last_mean(keys, values, window):
+    """Mittel der letzten `window` Werte je Schlüssel (Werte in zeitlicher Reihenfolge)"""
+    groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    ends = starts + counts
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    begin = np.maximum(starts, ends - window)
+    return groups, (cumulative[ends] - cumulative[begin]) / (ends - begin)
+
+def compute_watering_analytics(by='species', include_archive=False):
+    """Tatsächliche Gießintervalle je Art oder Pflanze und Saison, verglichen mit dem Gießhinweis der Art"""
+    plants, species, days, months = _load_waterings(include_archive)
+
+    # Intervalle zwischen aufeinanderfolgenden Gießvorgängen derselben Pflanze; doppelte Tage zählen nicht
+    same_plant = plants[1:] == plants[:-1]
+    intervals = np.diff(days)
+    valid = same_plant & (intervals > 0)
+    intervals = intervals[valid]
+    interval_plants, interval_species = plants[1:][valid], species[1:][valid]
+    summer = np.isin(months[1:][valid], SUMMER_MONTHS)
+
+    species_map = get_species_map()
+    keys = interval_species if by == 'species' else interval_plants
+    results = {}
+
+    for season, mask in (('summer', summer), ('winter', ~summer)):
+        if not mask.any():
+            continue
+        groups, counts, means, medians, variances = _grouped_stats(keys[mask], intervals[mask])
+        for key, count, mean, median, variance in zip(groups.tolist(), counts.tolist(), means.tolist(),
+                                                      medians.tolist(), variances.tolist()):
+            results.setdefault(key, {})[season] = {
+                'intervals': count,
+                'mean_days': round(mean, 1),
+                'median_days': round(median, 1),
+                'variance': round(variance, 1)
+            }
+
+    # Aktueller Trend: Mittel der letzten Intervalle je Pflanze
+    if by == 'plant' and len(intervals):
+        groups, recent = _rolling_last_mean(interval_plants, intervals, WATERING_ROLLING_WINDOW)
+        for key, value in zip(groups.tolist(), recent.tolist()):
+            results[key]['recent_mean_days'] = round(value, 1)
+
+    owner_species = dict(zip(interval_plants.tolist(), interval_species.tolist())) if by == 'plant' else {}
+    entries = []
+    for key, seasons in results.items():
+        species_id = key if by == 'species' else owner_species[key]
+        info = species_map.get(species_id) or {}
+        for season, stats in seasons.items():
+            if season not in ('summer', 'winter'):
+                continue
+            guidance = info.get(f'watering_{season}')
+            guidance_days = parse_watering_interval(guidance)
+            stats['guidance'] = guidance
+            stats['guidance_days'] = guidance_days
+            # Abweichung vom Richtwert in Tagen; bei "trocken halten" (0) gibt es kein Soll-Intervall,
+            # dort zählt jedes Gießen als Abweichung
+            if guidance_days is None or guidance_days == 0:
+                stats['drift_days'] = None
+            else:
+                stats['drift_days'] = round(stats['median_days'] - guidance_days, 1)
+            if guidance_days == 0:
+                stats['waterings_against_guidance'] = stats['intervals']
+        entry = {'species_id': species_id, 'species': info.get('name'), **seasons}
+        if by == 'plant':
+            entry = {'plant_id': key, **entry}
+        entries.append(entry)
+
+    return {
+        'by': by,
+        'summer_months': list(SUMMER_MONTHS),
+        'waterings': int(len(days)),
+        'intervals': int(len(intervals)),
+        'results': entries
     }
 
-    return jsonify(stats)
+analytics_cache = VersionedCache('watering', maxsize=16, ttl=86400)
 
-# ==================== ERWEITERTE DASHBOARD STATS ====================
-# Ersetzen Sie die bestehende dashboard-stats Route:
+@app.route('/api/analytics/watering')
+def watering_analytics():
+    """Gießintervalle je Art (?by=species) oder Pflanze (?by=plant), Sommer/Winter getrennt"""
+    if np is None:
+        return jsonify({'error': 'Für Analysen wird NumPy benötigt (pip install numpy)'}), 501
+    by = request.args.get('by', 'species')
+    if by not in ('species', 'plant'):
+        return jsonify({'error': "by muss 'species' oder 'plant' sein"}), 400
+    include_archive = arg_flag('include_archive')
 
-@app.route('/api/dashboard-stats')
-def show_dashboard_stats():
-    """Erweiterte Dashboard-Statistiken"""
-    now = datetime.now()
-    today = now.date()
-    month_ago = now - timedelta(days=30)
+    # Bleibt gültig, bis neue Aktionen (oder Pflanzen/Arten) geschrieben werden
+    result = analytics_cache.get_or_compute(('watering', by, include_archive),
+                                            lambda: compute_watering_analytics(by, include_archive))
+    return jsonify(result)
 
-    # Pflegeerinnerungen
-    care_alerts = []
+# Keimungs-Statistik: laufende Summen, die bei jedem Flush einer Aussaat mitgeführt werden
 
-    # Prüfe alle Pflanzen auf Pflegebedarf
-    plants = Plant.query.all()
-    for plant in plants:
-        if plant.last_watered:
-            days_since = (today - plant.last_watered).days
-            if days_since > 14:
-                care_alerts.append({
-                    'type': 'warning',
-                    'message': f'⚠️ {plant.species.name} ({plant.location}) seit {days_since} Tagen nicht gegossen!'
-                })
+GERMINATION_MAX_DAYS = 365
+GERMINATION_PERCENTILES = (25, 50, 75, 90)
+
+class GerminationStat(db.Model):
+    """Laufende Keimungs-Summen pro Art und Aussaatmonat"""
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)  # 1-12
+    sowings = db.Column(db.Integer, nullable=False, default=0)
+    germinated = db.Column(db.Integer, nullable=False, default=0)
+    seeds = db.Column(db.Integer, nullable=False, default=0)
+    seeds_germinated = db.Column(db.Integer, nullable=False, default=0)
+    days_sum = db.Column(db.Integer, nullable=False, default=0)
+    days_count = db.Column(db.Integer, nullable=False, default=0)
+
+class GerminationHistogram(db.Model):
+    """Verteilungen pro Art: Tage bis Keimung ('days') und Keimrate in 10%-Stufen ('rate')"""
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), primary_key=True)
+    kind = db.Column(db.String(10), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+GERMINATION_FIELDS = ('species_id', 'sowing_date', 'seed_count', 'germinated', 'germination_date', 'germinated_count')
+
+def _sowing_values(sowing, previous):
+    """Aktuelle oder (previous=True) zuletzt gespeicherte Werte einer Aussaat"""
+    state = db.inspect(sowing)
+    values = {}
+    for name in GERMINATION_FIELDS:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if previous and history.deleted else getattr(sowing, name)
+    return values
+
+def _germination_contribution(values, sign):
+    """Beitrag einer Aussaat zu den Summen als (Tabelle, Schlüssel, Spalte, Wert)"""
+    if values['species_id'] is None or values['sowing_date'] is None:
+        return []
+    species_id = values['species_id']
+    seeds = values['seed_count'] or 0
+    germinated = bool(values['germinated'])
+    germinated_count = (values['germinated_count'] or 0) if germinated else 0
+    key = (species_id, values['sowing_date'].month)
+    items = [('stat', key, 'sowings', sign), ('stat', key, 'seeds', sign * seeds)]
+    if germinated:
+        items += [('stat', key, 'germinated', sign), ('stat', key, 'seeds_germinated', sign * germinated_count)]
+        if seeds > 0:
+            items.append(('histogram', (species_id, 'rate', min(germinated_count * 10 // seeds, 10)), 'count', sign))
+        if values['germination_date']:
+            days = (values['germination_date'] - values['sowing_date']).days
+            if days >= 0:
+                items += [('stat', key, 'days_sum', sign * days), ('stat', key, 'days_count', sign),
+                          ('histogram', (species_id, 'days', min(days, GERMINATION_MAX_DAYS)), 'count', sign)]
+    return items
+
+def _apply_germination_deltas(connection, deltas):
+    stats, histograms = {}, {}
+    for (table, key, column), value in deltas.items():
+        if value:
+            (stats if table == 'stat' else histograms).setdefault(key, {})[column] = value
+
+    for (species_id, month), values in stats.items():
+        insert = sqlite_insert(GerminationStat).values(species_id=species_id, month=month, **values)
+        connection.execute(insert.on_conflict_do_update(
+            index_elements=['species_id', 'month'],
+            set_={column: getattr(GerminationStat, column) + value for column, value in values.items()}))
+    for (species_id, kind, bucket), values in histograms.items():
+        insert = sqlite_insert(GerminationHistogram).values(species_id=species_id, kind=kind, bucket=bucket, **values)
+        connection.execute(insert.on_conflict_do_update(
+            index_elements=['species_id', 'kind', 'bucket'],
+            set_={'count': GerminationHistogram.count + values['count']}))
+
+@event.listens_for(Session, 'after_flush')
+def _track_germination_stats(session, flush_context):
+    # Alten Beitrag abziehen, neuen addieren - deckt Anlegen, Keimung, Transfer, Import und Löschen ab
+    deltas = Counter()
+    for sowing in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(sowing, Sowing):
+            continue
+        if sowing in session.dirty and not session.is_modified(sowing):
+            continue
+        if sowing not in session.new:
+            for table, key, column, value in _germination_contribution(_sowing_values(sowing, previous=True), -1):
+                deltas[table, key, column] += value
+        if sowing not in session.deleted:
+            for table, key, column, value in _germination_contribution(_sowing_values(sowing, previous=False), 1):
+                deltas[table, key, column] += value
+    if deltas:
+        _apply_germination_deltas(session.connection(), deltas)
+
+def rebuild_germination_stats(connection):
+    """Summen komplett aus den Aussaaten neu berechnen (nach Massenimporten per SQL)"""
+    days = ("CASE WHEN germinated AND germination_date IS NOT NULL "
+            "AND julianday(germination_date) >= julianday(sowing_date) "
+            "THEN CAST(julianday(germination_date) - julianday(sowing_date) AS INTEGER) END")
+    connection.execute(text('DELETE FROM germination_stat'))
+    connection.execute(text('DELETE FROM germination_histogram'))
+    connection.execute(text(
+        'INSERT INTO germination_stat (species_id, month, sowings, germinated, seeds, seeds_germinated, days_sum, days_count) '
+        "SELECT species_id, CAST(strftime('%m', sowing_date) AS INTEGER), COUNT(*), "
+        'COALESCE(SUM(germinated), 0), COALESCE(SUM(seed_count), 0), '
+        'COALESCE(SUM(CASE WHEN germinated THEN COALESCE(germinated_count, 0) ELSE 0 END), 0), '
+        f'COALESCE(SUM({days}), 0), COUNT({days}) FROM sowing GROUP BY 1, 2'
+    ))
+    connection.execute(text(
+        'INSERT INTO germination_histogram (species_id, kind, bucket, count) '
+        f"SELECT species_id, 'days', MIN({days}, {GERMINATION_MAX_DAYS}), COUNT(*) FROM sowing "
+        f'WHERE {days} IS NOT NULL GROUP BY 1, 3'
+    ))
+    connection.execute(text(
+        'INSERT INTO germination_histogram (species_id, kind, bucket, count) '
+        "SELECT species_id, 'rate', MIN(COALESCE(germinated_count, 0) * 10 / seed_count, 10), COUNT(*) FROM sowing "
+        'WHERE germinated AND seed_count > 0 GROUP BY 1, 3'
+    ))
+
+@job_handler('rebuild_germination_stats', writes=True)
+def run_rebuild_germination_stats_job(context, params):
+    """Keimungs-Statistik neu aufbauen"""
+    rebuild_germination_stats(db.session.connection())
+    invalidate_caches('germination')
+    return {'sowings': db.session.scalar(db.select(db.func.count()).select_from(Sowing))}
+
+def _histogram_percentiles(groups, buckets, counts, percentiles):
+    """Perzentile (Rangverfahren) je Gruppe aus einem nach Gruppe und Stufe sortierten Histogramm"""
+    keys, starts = np.unique(groups, return_index=True)
+    cumulative = np.cumsum(counts)
+    totals = np.add.reduceat(counts, starts)
+    offsets = cumulative[starts] - counts[starts]
+    result = {}
+    for percentile in percentiles:
+        targets = offsets + np.ceil(percentile / 100 * totals)
+        result[percentile] = buckets[np.searchsorted(cumulative, targets)]
+    return keys, totals, result
+
+def _germination_summary(row):
+    return {
+        'sowings': row.sowings,
+        'germinated_sowings': row.germinated,
+        'germination_rate': round(100 * row.germinated / row.sowings, 1) if row.sowings else 0,
+        'seed_efficiency': round(100 * row.seeds_germinated / row.seeds, 1) if row.seeds else 0,
+        'seeds': row.seeds,
+        'seeds_germinated': row.seeds_germinated,
+        'mean_days': round(row.days_sum / row.days_count, 1) if row.days_count else None
+    }
+
+def compute_germination_analytics(species_id=None):
+    """Keimraten, Saatgut-Ausbeute und Keimdauer-Perzentile je Art und Aussaatmonat"""
+    columns = [db.func.sum(getattr(GerminationStat, name)).label(name)
+               for name in ('sowings', 'germinated', 'seeds', 'seeds_germinated', 'days_sum', 'days_count')]
+    criteria = [GerminationStat.species_id == species_id] if species_id else []
+    by_species = db.session.execute(db.select(GerminationStat.species_id, *columns).where(*criteria)
+                                    .group_by(GerminationStat.species_id)).all()
+    by_month = db.session.execute(db.select(GerminationStat.month, *columns).where(*criteria)
+                                  .group_by(GerminationStat.month).order_by(GerminationStat.month)).all()
+
+    histogram_criteria = [GerminationHistogram.species_id == species_id] if species_id else []
+    histograms = {}
+    for kind in ('days', 'rate'):
+        rows = db.session.connection().execute(
+            db.select(GerminationHistogram.species_id, GerminationHistogram.bucket, GerminationHistogram.count)
+            .where(GerminationHistogram.kind == kind, GerminationHistogram.count > 0, *histogram_criteria)
+            .order_by(GerminationHistogram.species_id, GerminationHistogram.bucket)).fetchall()
+        data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=3 * len(rows)).reshape(-1, 3)
+        histograms[kind] = data
+
+    # Keimdauer-Perzentile für alle Arten auf einmal
+    days = histograms['days']
+    day_percentiles = {}
+    if len(days):
+        keys, _, values = _histogram_percentiles(days[:, 0], days[:, 1], days[:, 2], GERMINATION_PERCENTILES)
+        for index, key in enumerate(keys.tolist()):
+            day_percentiles[key] = {f'p{p}': int(values[p][index]) for p in GERMINATION_PERCENTILES}
+
+    # Verteilung der Keimraten: Anzahl Aussaaten je 10%-Stufe (0-10 %, ..., 100 %)
+    rates = histograms['rate']
+    rate_distribution = {}
+    if len(rates):
+        species_keys, inverse = np.unique(rates[:, 0], return_inverse=True)
+        matrix = np.zeros((len(species_keys), 11), dtype=np.int64)
+        np.add.at(matrix, (inverse, rates[:, 1]), rates[:, 2])
+        rate_distribution = dict(zip(species_keys.tolist(), matrix.tolist()))
+
+    species_map = get_species_map()
+    return {
+        'species': sorted(({
+            'species_id': row.species_id,
+            'species': (species_map.get(row.species_id) or {}).get('name'),
+            **_germination_summary(row),
+            'days_percentiles': day_percentiles.get(row.species_id),
+            'rate_distribution': rate_distribution.get(row.species_id, [0] * 11)
+        } for row in by_species if row.sowings), key=lambda e: (-e['germination_rate'], e['species'] or '')),
+        'months': [{'month': row.month, **_germination_summary(row)} for row in by_month if row.sowings]
+    }
+
+germination_cache = VersionedCache('germination', maxsize=32, ttl=86400)
+
+@app.route('/api/analytics/germination')
+def germination_analytics():
+    """Keimungs-Auswertung je Art und Aussaatmonat (?species_id= für eine Art)"""
+    if np is None:
+        return jsonify({'error': 'Für Analysen wird NumPy benötigt (pip install numpy)'}), 501
+    species_id = request.args.get('species_id', type=int)
+    result = germination_cache.get_or_compute(('germination', species_id),
+                                              lambda: compute_germination_analytics(species_id))
+    return jsonify(result)
+
+# ==================== PFLEGE-SCHWELLWERTE ====================
+# Gieß- und Düngeintervalle pro Art und Saison, vorberechnet aus den Gießtexten der Arten
+
+WATER_DEFAULT_DAYS = 14  # wenn der Gießtext keinen Hinweis enthält
+WATER_URGENT_FACTOR = 1.5  # ab diesem Vielfachen des Intervalls wird die Warnung dringend
+FERTILIZE_DAYS = {'summer': 30, 'winter': None}  # in der Winterruhe wird nicht gedüngt
+SEASONS = ('summer', 'winter')
+
+class CareThreshold(db.Model):
+    """Warnschwellen pro Art und Saison in Tagen (leer = keine Warnung, z.B. Winter trocken)"""
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id', ondelete='CASCADE'), primary_key=True)
+    season = db.Column(db.String(10), primary_key=True)  # summer, winter
+    water_warn_days = db.Column(db.Integer)
+    water_urgent_days = db.Column(db.Integer)
+    fertilize_days = db.Column(db.Integer)
+
+def season_of(day):
+    return 'summer' if day.month in SUMMER_MONTHS else 'winter'
+
+def days_since(column, today):
+    return db.func.julianday(today) - db.func.julianday(column)
+
+class ThresholdLimits:
+    """Schwellwerte der aktuellen Saison als SQL-Ausdrücke zum Join an Plant"""
+
+    def __init__(self, today):
+        self.table = db.aliased(CareThreshold)
+        season = season_of(today)
+        self.join = db.and_(self.table.species_id == Plant.species_id, self.table.season == season)
+        # Ohne Zeile für die Art gelten die Standardwerte
+        missing = self.table.species_id.is_(None)
+        self.water_warn = db.case((missing, WATER_DEFAULT_DAYS), else_=self.table.water_warn_days)
+        self.water_urgent = db.case((missing, round(WATER_DEFAULT_DAYS * WATER_URGENT_FACTOR)),
+                                    else_=self.table.water_urgent_days)
+        self.fertilize = db.case((missing, FERTILIZE_DAYS[season]), else_=self.table.fertilize_days)
+        self.water_due = db.and_(self.water_warn.isnot(None), db.or_(
+            Plant.last_watered.is_(None), days_since(Plant.last_watered, today) > self.water_warn))
+        self.fertilize_due = db.and_(self.fertilize.isnot(None), Plant.last_fertilized.isnot(None),
+                                     days_since(Plant.last_fertilized, today) > self.fertilize)
+
+def refresh_care_thresholds(connection, species_ids=None):
+    """Schwellwerte aus den Intervall-Spalten der Arten neu berechnen (alle oder ausgewählte Arten)"""
+    for season in SEASONS:
+        days = f'water_days_{season}'
+        fertilize = FERTILIZE_DAYS[season]
+        where = 'WHERE id IN (SELECT value FROM json_each(:ids))' if species_ids is not None else 'WHERE 1'
+        connection.execute(text(
+            'INSERT INTO care_threshold (species_id, season, water_warn_days, water_urgent_days, fertilize_days) '
+            f"SELECT id, :season, CASE WHEN {days} = 0 THEN NULL ELSE COALESCE({days}, :default) END, "
+            f'CASE WHEN {days} = 0 THEN NULL ELSE CAST(ROUND(COALESCE({days}, :default) * :factor) AS INTEGER) END, '
+            f':fertilize FROM species {where} '
+            'ON CONFLICT(species_id, season) DO UPDATE SET water_warn_days = excluded.water_warn_days, '
+            'water_urgent_days = excluded.water_urgent_days, fertilize_days = excluded.fertilize_days'
+        ), {'season': season, 'default': WATER_DEFAULT_DAYS, 'factor': WATER_URGENT_FACTOR,
+            'fertilize': fertilize, 'ids': json.dumps(sorted(species_ids or []))})
+
+def backfill_species_care(connection):
+    """Abgeleitete Tage-Spalten aller Arten aus den Pflegetexten füllen und Schwellwerte neu berechnen"""
+    rows = connection.execute(text('SELECT id, watering_summer, watering_winter, germination_time FROM species')).all()
+    if rows:
+        values = []
+        for id, summer, winter, germination_time in rows:
+            germination_min, germination_max = parse_germination_window(germination_time) or (None, None)
+            values.append({'id': id, 'summer': parse_watering_interval(summer), 'winter': parse_watering_interval(winter),
+                           'germination_min': germination_min, 'germination_max': germination_max})
+        connection.execute(text(
+            'UPDATE species SET water_days_summer = :summer, water_days_winter = :winter, '
+            'germination_min_days = :germination_min, germination_max_days = :germination_max WHERE id = :id'
+        ), values)
+    refresh_care_thresholds(connection)
+    return len(rows)
+
+def reparse_species_care(connection):
+    """Pflegetexte aller Arten nach geänderten Regeln neu auswerten und die Caches aller Prozesse verwerfen"""
+    count = backfill_species_care(connection)
+    _bump_cache_versions(connection, [name for name, tables in CACHE_DEPENDENCIES.items()
+                                      if tables & {'species', 'care_threshold'}])
+    return count
+
+@event.listens_for(Session, 'before_flush')
+def _parse_species_care(session, flush_context, instances):
+    # Geänderte Pflegetexte gleich in Tage übersetzen, egal über welchen Weg die Art gespeichert wird
+    for species in chain(session.new, session.dirty):
+        if isinstance(species, Species):
+            state = db.inspect(species)
+            changed = lambda name: species in session.new or state.attrs[name].history.has_changes()
+            for season in SEASONS:
+                if changed(f'watering_{season}'):
+                    setattr(species, f'water_days_{season}', parse_watering_interval(getattr(species, f'watering_{season}')))
+            if changed('germination_time'):
+                species.germination_min_days, species.germination_max_days = \
+                    parse_germination_window(species.germination_time) or (None, None)
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_species_thresholds(session, flush_context):
+    changed = {species.id for species in chain(session.new, session.dirty) if isinstance(species, Species)}
+    if changed:
+        refresh_care_thresholds(session.connection(), changed)
+
+# ==================== KEIMÜBERWACHUNG ====================
+
+GERMINATION_UNITS = {'tag': 1, 'woche': 7, 'monat': 30, 'jahr': 365}
+GERMINATION_DEFAULT_WINDOW = (7, 30)  # wenn germination_time keinen Zeitraum enthält
+SOWING_STATUSES = ('early', 'expected', 'overdue')
+
+def _germination_unit(word):
+    return next((days for unit, days in GERMINATION_UNITS.items() if word.lower().startswith(unit)), None)
+
+def parse_germination_window(text):
+    """Keimdauer ('3-14 Tage', '2-4 Wochen', 'Wochen-Monate') als (min, max) in Tagen, sonst None
+
+    Reine Wortangaben zählen als je zwei Einheiten ('Wochen-Monate' = 14-60 Tage).
+    """
+    if not text:
+        return None
+    numeric = re.search(r'(\d+)\s*(?:-|–|bis)\s*(\d+)\s*([a-zäöü]+)', text, re.IGNORECASE)
+    if numeric and _germination_unit(numeric.group(3)):
+        unit = _germination_unit(numeric.group(3))
+        return int(numeric.group(1)) * unit, int(numeric.group(2)) * unit
+    single = re.search(r'(\d+)\s*([a-zäöü]+)', text, re.IGNORECASE)
+    if single and _germination_unit(single.group(2)):
+        days = int(single.group(1)) * _germination_unit(single.group(2))
+        return days, days
+    units = [_germination_unit(word) for word in re.findall(r'[a-zäöü]+', text, re.IGNORECASE)]
+    units = [unit for unit in units if unit]
+    if units:
+        return 2 * units[0], 2 * units[-1]
+    return None
+
+def pending_sowings_query(today):
+    """Alle nicht gekeimten Aussaaten mit Alter und Einstufung gegen das Keimfenster der Art (early/expected/overdue)"""
+    age = db.cast(db.func.julianday(today) - db.func.julianday(Sowing.sowing_date), db.Integer)
+    window_min = db.func.coalesce(Species.germination_min_days, GERMINATION_DEFAULT_WINDOW[0])
+    window_max = db.func.coalesce(Species.germination_max_days, GERMINATION_DEFAULT_WINDOW[1])
+    return db.select(
+        Sowing.id, Sowing.species_id, Sowing.pot_number, Sowing.sowing_date, Sowing.seed_count,
+        age.label('age_days'), window_min.label('window_min'), window_max.label('window_max'),
+        db.case((age < window_min, 'early'), (age <= window_max, 'expected'), else_='overdue').label('status')
+    ).join(Species, Species.id == Sowing.species_id).where(Sowing.germinated == False).subquery()
+
+@app.route('/api/sowings/monitor')
+@cached_view
+def sowing_monitor():
+    """Nicht gekeimte Aussaaten nach Keimfenster: zu früh, im Fenster, überfällig (?status=)"""
+    status = request.args.get('status')
+    if status and status not in SOWING_STATUSES:
+        return jsonify({'error': f'status muss eine von {", ".join(SOWING_STATUSES)} sein'}), 400
+
+    monitor = pending_sowings_query(datetime.now().date())
+    counts = dict(db.session.execute(db.select(monitor.c.status, db.func.count()).group_by(monitor.c.status)).all())
+    query = db.select(monitor).order_by(monitor.c.sowing_date)
+    if status:
+        query = query.where(monitor.c.status == status)
+    return jsonify({
+        'counts': {name: counts.get(name, 0) for name in SOWING_STATUSES},
+        'sowings': [{
+            'id': row.id,
+            'species': species_name(row.species_id),
+            'pot_number': row.pot_number,
+            'sowing_date': row.sowing_date.isoformat(),
+            'age_days': row.age_days,
+            'window': [row.window_min, row.window_max],
+            'status': row.status,
+            'days_left': row.window_max - row.age_days
+        } for row in db.session.execute(query)]
+    })
+
+# ==================== PFLEGEREGELN ====================
+
+# Ausgabefelder, die eine Regel je Kanal liefern muss
+CARE_RULE_CHANNELS = {
+    'schedule.daily': ('type', 'priority', 'task', 'details'),
+    'schedule.weekly': ('type', 'priority', 'task', 'details'),
+    'schedule.monthly': ('type', 'priority', 'task', 'details'),
+    'schedule.seasonal': ('type', 'priority', 'task', 'details'),
+    'alerts': ('type', 'priority', 'message'),
+    'dashboard': ('type', 'message'),
+}
+CARE_RULE_OPERATORS = {
+    'eq': lambda column, value: column.is_(None) if value is None else column == value,
+    'ne': lambda column, value: column.is_not(None) if value is None else column != value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'in': lambda column, value: column.in_(value),
+    'between': lambda column, value: column.between(*value),
+}
+
+def _whole_days(column, today):
+    return db.cast(days_since(column, today), db.Integer)
+
+class CareRuleTarget:
+    """Wogegen Regeln laufen: Tabelle, Spaltengruppen für Bedingungen und berechnete Felder"""
+
+    def __init__(self, model, attributes, fields):
+        self.model = model
+        self.attributes = attributes
+        self.fields = fields
+
+    def columns(self, today):
+        return self.fields(today) if self.fields else {}
+
+    def field_names(self):
+        return set(self.columns(datetime.now().date())) | ({'species'} if self.model else set())
+
+CARE_RULE_TARGETS = {
+    'season': CareRuleTarget(None, {}, None),
+    'plant': CareRuleTarget(Plant, {'plant': Plant, 'species': Species}, lambda today: {
+        'id': Plant.id,
+        'species_id': Plant.species_id,
+        'location': Plant.location,
+        'age_days': _whole_days(Plant.purchase_date, today),
+        'days_since_watering': _whole_days(Plant.last_watered, today),
+        'days_since_fertilizing': _whole_days(Plant.last_fertilized, today),
+    }),
+    'sowing': CareRuleTarget(Sowing, {'sowing': Sowing, 'species': Species}, lambda today: {
+        'id': Sowing.id,
+        'species_id': Sowing.species_id,
+        'pot_number': Sowing.pot_number,
+        'days_since_sowing': _whole_days(Sowing.sowing_date, today),
+        'days_since_germination': _whole_days(Sowing.germination_date, today),
+    }),
+}
+
+def _compile_condition(rule_id, condition):
+    """Bedingung aus der Regeldatei in eine Funktion Spalte -> SQL-Ausdruck übersetzen
+
+    Kurzformen: Wert = gleich (null = IS NULL), Liste = in, sonst {"gte": 7, "lt": 30, ...}.
+    """
+    if isinstance(condition, list):
+        condition = {'in': condition}
+    elif not isinstance(condition, dict):
+        condition = {'eq': condition}
+    unknown = set(condition) - set(CARE_RULE_OPERATORS)
+    if unknown:
+        raise ValueError(f'Pflegeregel {rule_id}: unbekannter Operator {", ".join(sorted(unknown))}')
+    checks = [(CARE_RULE_OPERATORS[name], value) for name, value in condition.items()]
+    return lambda column: db.and_(*[check(column, value) for check, value in checks])
+
+class CareRule:
+    """Eine Regel aus care_rules.json, beim Einlesen geprüft und in SQL-Bedingungen übersetzt"""
+
+    def __init__(self, spec):
+        self.id = spec['id']
+        self.channel = spec['channel']
+        self.target = spec.get('target', 'plant')
+        self.output = spec['output']
+        if self.channel not in CARE_RULE_CHANNELS:
+            raise ValueError(f'Pflegeregel {self.id}: unbekannter Kanal {self.channel}')
+        if self.target not in CARE_RULE_TARGETS:
+            raise ValueError(f'Pflegeregel {self.id}: unbekanntes Ziel {self.target}')
+        target = CARE_RULE_TARGETS[self.target]
+
+        when = dict(spec.get('when', {}))
+        months = when.pop('month', None)
+        self.months = None if months is None else set(months if isinstance(months, list) else [months])
+
+        # Bedingungen als (Spalte aus den Feldern des Ziels holen, Vergleich)
+        self.conditions = []
+        fields = target.columns(datetime.now().date())
+        for key, condition in when.items():
+            if key in target.attributes:
+                model = target.attributes[key]
+                for name, value in condition.items():
+                    if name not in model.__table__.columns:
+                        raise ValueError(f'Pflegeregel {self.id}: {key}.{name} existiert nicht')
+                    column = getattr(model, name)
+                    self.conditions.append((lambda columns, column=column: column, _compile_condition(self.id, value)))
+            elif key in fields:
+                self.conditions.append((lambda columns, key=key: columns[key], _compile_condition(self.id, condition)))
+            else:
+                raise ValueError(f'Pflegeregel {self.id}: unbekannte Bedingung {key} für Ziel {self.target}')
+
+        missing = [name for name in CARE_RULE_CHANNELS[self.channel] if name not in self.output]
+        if missing:
+            raise ValueError(f'Pflegeregel {self.id}: Ausgabe ohne {", ".join(missing)}')
+        allowed = target.field_names()
+        for value in self.output.values():
+            if isinstance(value, str):
+                used = {name for _, name, _, _ in string.Formatter().parse(value) if name}
+                if used - allowed:
+                    raise ValueError(f'Pflegeregel {self.id}: unbekannte Platzhalter {", ".join(sorted(used - allowed))}')
+
+    def active(self, today):
+        return self.months is None or today.month in self.months
+
+    def predicate(self, columns):
+        return db.and_(db.true(), *[compare(column(columns)) for column, compare in self.conditions])
+
+    def render(self, row):
+        """Ausgabe der Regel mit den Feldern des Treffers füllen"""
+        fields = dict(row)
+        if 'species_id' in fields:
+            fields['species'] = species_name(fields['species_id'])
+        return {key: value.format_map(fields) if isinstance(value, str) else value
+                for key, value in self.output.items()}
+
+def load_care_rules(path):
+    """Regeldatei einlesen - Fehler fallen beim Start auf, nicht erst beim Auswerten"""
+    with open(path, encoding='utf-8') as f:
+        rules = [CareRule(spec) for spec in json.load(f)]
+    duplicates = [rule_id for rule_id, count in Counter(rule.id for rule in rules).items() if count > 1]
+    if duplicates:
+        raise ValueError(f'Pflegeregeln doppelt vergeben: {", ".join(duplicates)}')
+    return rules
+
+CARE_RULES = load_care_rules(app.config['CARE_RULES_FILE'])
+
+def evaluate_care_rules(channel, today=None):
+    """Aktive Regeln eines Kanals auswerten: ein UNION-ALL-Statement pro Ziel statt Schleifen über alle Pflanzen
+
+    Liefert (Regel, Treffer) in der Reihenfolge der Regeldatei.
+    """
+    today = today or datetime.now().date()
+    rules = [rule for rule in CARE_RULES if rule.channel == channel and rule.active(today)]
+    matches = defaultdict(list)
+    by_target = defaultdict(list)
+    for index, rule in enumerate(rules):
+        if rule.target == 'season':
+            matches[index].append({})
         else:
-            care_alerts.append({
-                'type': 'warning',
-                'message': f'⚠️ {plant.species.name} ({plant.location}) wurde noch nie gegossen!'
-            })
+            by_target[rule.target].append(index)
 
-    # Keimungsüberwachung
-    for sowing in Sowing.query.filter(Sowing.germinated == False).all():
-        days = (today - sowing.sowing_date).days
-        if days > 30:
-            care_alerts.append({
-                'type': 'info',
-                'message': f'📍 {sowing.species.name} (Topf {sowing.pot_number}) seit {days} Tagen ohne Keimung'
-            })
+    for target_name, indexes in by_target.items():
+        target = CARE_RULE_TARGETS[target_name]
+        columns = target.columns(today)
+        selects = [
+            db.select(db.literal(index).label('rule'), *[column.label(name) for name, column in columns.items()])
+            .select_from(target.model).join(Species, Species.id == target.model.species_id)
+            .where(rules[index].predicate(columns))
+            for index in indexes
+        ]
+        query = (selects[0] if len(selects) == 1 else db.union_all(*selects)) \
+            .order_by(db.literal_column('rule'), db.literal_column('id'))
+        for row in db.session.execute(query).mappings():
+            matches[row['rule']].append({name: row[name] for name in columns})
+
+    return [(rule, row) for index, rule in enumerate(rules) for row in matches[index]]
+
+# ==================== OFFLINE-SYNC ====================
+
+class AppliedMutation(db.Model):
+    """Bereits ausgeführte Änderungen aus /api/batch - ein erneut gesendeter Eintrag wird nicht doppelt gebucht"""
+    id = db.Column(db.Integer, primary_key=True)
+    client_id = db.Column(db.String(64), nullable=False)
+    mutation_id = db.Column(db.String(64), nullable=False)
+    kind = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.String(10), nullable=False)  # applied, error
+    result = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (db.Index('ix_applied_mutation_client', 'client_id', 'mutation_id', unique=True),)
+
+# Änderungen, die das Frontend offline in der Outbox sammeln kann: Art → Funktion(data) ohne Commit
+BATCH_MUTATIONS = {}
+
+def batch_mutation(kind):
+    """Registriert eine Änderung für /api/batch; die Funktion committet nicht selbst"""
+    def decorator(f):
+        BATCH_MUTATIONS[kind] = f
+        return f
+    return decorator
+
+@batch_mutation('plant_action')
+def _batch_plant_action(data):
+    if data.get('action_type') not in PLANT_ACTION_TYPES:
+        raise ValueError('Ungültiger Aktionstyp')
+    plant = Plant.query.get_or_404(int(data['plant_id']), description='Pflanze nicht gefunden')
+    action = record_plant_action(plant, data)
+    db.session.flush()
+    return {'action_id': action.id, 'plant': serialize_plant(plant)}
+
+@batch_mutation('create_sowing')
+def _batch_create_sowing(data):
+    sowing = create_sowing(data)
+    db.session.flush()
+    return {'sowing': serialize_sowing(sowing)}
+
+@batch_mutation('germinate')
+def _batch_germinate(data):
+    sowing = record_germination(Sowing.query.get_or_404(int(data['sowing_id']), description='Aussaat nicht gefunden'), data)
+    db.session.flush()
+    return {'sowing': serialize_sowing(sowing)}
+
+@batch_mutation('create_plant')
+def _batch_create_plant(data):
+    plant = create_plant(data)
+    db.session.flush()
+    return {'plant': serialize_plant(plant)}
+
+@batch_mutation('create_diary_entry')
+def _batch_create_diary_entry(data):
+    entry = create_diary_entry(data)
+    db.session.flush()
+    return {'id': entry.id}
+
+def _apply_mutation(mutation):
+    """Eine Änderung in eigenem Savepoint ausführen; Fehler verwerfen nur diese, nicht den ganzen Batch"""
+    kind = mutation.get('kind')
+    if kind not in BATCH_MUTATIONS:
+        return 'error', {'error': f'Unbekannte Änderung: {kind}'}
+    # Was im Savepoint für Caches und Live-Updates vorgemerkt wird, verfällt mit ihm
+    info = db.session.info
+    saved = {key: set(info.get(key, ())) if key == 'invalidated_caches' else dict(info.get(key, {}))
+             for key in ('invalidated_caches', 'pending_changes')}
+    try:
+        with db.session.begin_nested():
+            return 'applied', {'result': BATCH_MUTATIONS[kind](mutation.get('data') or {})}
+    except (HTTPException, KeyError, TypeError, ValueError, IntegrityError) as e:
+        info.update(saved)
+        if isinstance(e, HTTPException):
+            return 'error', {'error': e.description}
+        return 'error', {'error': f'{type(e).__name__}: {getattr(e, "orig", e)}'}
+
+@app.route('/api/batch', methods=['POST'])
+@write_transaction
+def apply_batch():
+    """Gesammelte Offline-Änderungen in einer Transaktion ausführen
+
+    Body: {client_id, mutations: [{id, kind, data}]}. Jede Änderung wird pro Client
+    höchstens einmal gebucht; die Antwort enthält je Änderung Status und Ergebnis
+    sowie die Version des Änderungs-Feeds (/api/events) nach dem Commit.
+    """
+    data = request.json or {}
+    client_id = str(data.get('client_id') or '')
+    mutations = data.get('mutations') or []
+    if not client_id:
+        return jsonify({'error': 'client_id fehlt'}), 400
+    if len(mutations) > app.config['BATCH_MAX_MUTATIONS']:
+        return jsonify({'error': f'Höchstens {app.config["BATCH_MAX_MUTATIONS"]} Änderungen pro Batch'}), 413
+
+    cutoff = datetime.utcnow() - timedelta(days=app.config['BATCH_RETENTION_DAYS'])
+    db.session.execute(db.delete(AppliedMutation).where(AppliedMutation.created_at < cutoff))
+
+    ids = [str(mutation.get('id') or '') for mutation in mutations]
+    done = {row.mutation_id: row for row in AppliedMutation.query.filter(
+        AppliedMutation.client_id == client_id, AppliedMutation.mutation_id.in_(ids))}
+
+    results = []
+    for mutation_id, mutation in zip(ids, mutations):
+        if not mutation_id:
+            results.append({'id': mutation_id, 'status': 'error', 'error': 'id fehlt'})
+            continue
+        if mutation_id in done:
+            previous = done[mutation_id]
+            results.append({'id': mutation_id, 'status': 'duplicate', 'previous_status': previous.status,
+                            **json.loads(previous.result or '{}')})
+            continue
+        status, result = _apply_mutation(mutation)
+        # Auch Fehler merken: erneutes Senden liefert dieselbe Antwort statt eines zweiten Versuchs
+        done[mutation_id] = AppliedMutation(client_id=client_id, mutation_id=mutation_id, kind=str(mutation.get('kind')),
+                                            status=status, result=json.dumps(result))
+        db.session.add(done[mutation_id])
+        results.append({'id': mutation_id, 'status': status, **result})
+    db.session.commit()
+    return jsonify({'results': results, 'version': change_feed.event_id(change_feed.version)})
+
+@app.route('/sw.js')
+def service_worker():
+    """Service Worker vom Wurzelpfad ausliefern, damit er die ganze Seite abdeckt"""
+    response = app.send_static_file('sw.js')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# ==================== TELEMETRIE ====================
+
+class Sensor(db.Model):
+    """Temperatur-/Feuchtesensor; location entspricht dem Standort der Pflanzen (z.B. 'Gewächshaus links')"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    location = db.Column(db.String(100), index=True)
+    last_seen = db.Column(db.Integer)  # Unix-Zeit (UTC) der neuesten Messung
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SensorReading(db.Model):
+    """Rohmesswerte, kompakt: Zeit als Unix-Sekunden, Werte als Ganzzahlen in Hundertstel °C bzw. Zehntel %"""
+    sensor_id = db.Column(db.Integer, db.ForeignKey('sensor.id', ondelete='CASCADE'), primary_key=True)
+    ts = db.Column(db.Integer, primary_key=True)
+    temperature = db.Column(db.Integer, nullable=False)
+    humidity = db.Column(db.Integer)
 
-    stats = {
-        'overview': {
-            'total_species': Species.query.count(),
-            'total_sowings': Sowing.query.count(),
-            'active_sowings': Sowing.query.filter(Sowing.germinated == False).count(),
-            'total_plants': Plant.query.count(),
-            'plants_from_sowings': Plant.query.filter(Plant.from_sowing == True).count() if hasattr(Plant, 'from_sowing') else 0,
-            'total_diary_entries': DiaryEntry.query.count(),
-            'total_actions': PlantAction.query.count() if PlantAction else 0
-        },
-        'recent': {
-            'sowings_this_month': Sowing.query.filter(Sowing.sowing_date >= month_ago.date()).count(),
-            'germinations_this_month': Sowing.query.filter(
-                Sowing.germination_date >= month_ago.date()
-            ).count(),
-            'plants_added_this_month': Plant.query.filter(Plant.purchase_date >= month_ago.date()).count(),
-            'actions_this_week': PlantAction.query.filter(
-                PlantAction.action_date >= (today - timedelta(days=7))
-            ).count() if PlantAction else 0
-        },
-        'care_alerts': care_alerts[:10]  # Maximal 10 Warnungen
+    # Der Primärschlüssel (Sensor, Zeit) ist der Clustered Index - keine zusätzliche rowid
+    __table_args__ = {'sqlite_with_rowid': False}
+
+class SensorRollup(db.Model):
+    """Aggregate pro Sensor und Minute/Stunde/Tag; Summen statt Mittelwerte, damit Nachbuchen addieren kann"""
+    sensor_id = db.Column(db.Integer, db.ForeignKey('sensor.id', ondelete='CASCADE'), primary_key=True)
+    resolution = db.Column(db.String(6), primary_key=True)  # minute, hour, day
+    bucket = db.Column(db.Integer, primary_key=True)  # Beginn des Intervalls, Unix-Zeit (UTC)
+    count = db.Column(db.Integer, nullable=False)
+    temperature_sum = db.Column(db.Integer, nullable=False)
+    temperature_min = db.Column(db.Integer, nullable=False)
+    temperature_max = db.Column(db.Integer, nullable=False)
+    humidity_count = db.Column(db.Integer, nullable=False, default=0)
+    humidity_sum = db.Column(db.Integer, nullable=False, default=0)
+    humidity_min = db.Column(db.Integer)
+    humidity_max = db.Column(db.Integer)
+
+    __table_args__ = {'sqlite_with_rowid': False}
+
+# Intervalllänge in Sekunden und Aufbewahrung (Tage, None = unbegrenzt); Rohwerte einen Tag länger als
+# die Temperaturüberwachung zurückschaut, damit der Löschjob ihr Fenster nicht anschneidet
+TELEMETRY_RESOLUTIONS = {'minute': 60, 'hour': 3600, 'day': 86400}
+TELEMETRY_RETENTION = {'raw': 8, 'minute': 30, 'hour': 365, 'day': None}
+TEMPERATURE_SCALE = 100
+HUMIDITY_SCALE = 10
+
+def _parse_timestamp(value):
+    if value is None:
+        return int(time.time())
+    if isinstance(value, (int, float)) or str(value).isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return int(parsed.timestamp())
+
+# Messzeitpunkte vor 2000 oder mehr als einen Tag in der Zukunft sind Uhrenfehler der Sensoren
+TELEMETRY_EARLIEST_TS = 946684800
+TELEMETRY_MAX_FUTURE = 86400
+
+def _reading_text(item, key, required):
+    """Sensorname bzw. Standort: Text bis zur Spaltenlänge der Tabelle sensor"""
+    value = item.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        raise TypeError(f'{key} muss ein nicht-leerer Text sein')
+    if len(value) > Sensor.__table__.c[key if key == 'location' else 'name'].type.length:
+        raise ValueError(f'{key} zu lang: {len(value)} Zeichen')
+    return value
+
+def parse_reading(item):
+    """Messwert aus dem Request in (Sensorname, Standort, ts, Temperatur, Feuchte) umwandeln
+
+    Prüft alles, was sonst erst beim Schreiben scheitern würde - ein solcher Wert
+    würde im Puffer die nachfolgenden Messwerte aufhalten.
+    """
+    temperature = float(item['temperature'])
+    humidity = item.get('humidity')
+    if not -50 <= temperature <= 80:
+        raise ValueError(f'Temperatur außerhalb des Messbereichs: {temperature}')
+    if humidity is not None and not 0 <= float(humidity) <= 100:
+        raise ValueError(f'Luftfeuchte außerhalb des Messbereichs: {humidity}')
+    try:
+        ts = _parse_timestamp(item.get('ts'))
+    except OverflowError:
+        raise ValueError(f'Zeitpunkt außerhalb des gültigen Bereichs: {item.get("ts")}')
+    if not TELEMETRY_EARLIEST_TS <= ts <= time.time() + TELEMETRY_MAX_FUTURE:
+        raise ValueError(f'Zeitpunkt außerhalb des gültigen Bereichs: {item.get("ts")}')
+    return (_reading_text(item, 'sensor', True), _reading_text(item, 'location', False), ts,
+            round(temperature * TEMPERATURE_SCALE),
+            None if humidity is None else round(float(humidity) * HUMIDITY_SCALE))
+
+class TelemetryBuffer:
+    """Sammelt Messwerte im Speicher; ein Hintergrund-Thread schreibt sie gebündelt in die Datenbank"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._readings = []
+        self._flush_lock = threading.Lock()
+        self.writer_running = False
+
+    def add(self, readings):
+        with self._lock:
+            self._readings.extend(readings)
+            return len(self._readings)
+
+    def __len__(self):
+        return len(self._readings)
+
+    def flush(self):
+        """Puffer leeren und schreiben; bei Sperrfehlern kommen die Werte für den nächsten Versuch zurück
+
+        Scheitert ein Batch aus anderem Grund, werden seine Werte einzeln geschrieben: was dann
+        noch scheitert, landet im Log (dead letter) statt im Puffer, damit es nachfolgende Werte
+        nicht dauerhaft blockiert. Liefert die Zahl neuer Messwerte.
+        """
+        with self._flush_lock:
+            with self._lock:
+                readings, self._readings = self._readings, []
+            if not readings:
+                return 0
+            try:
+                return write_readings(readings)
+            except Exception as e:
+                db.session.rollback()
+                if not isinstance(e, OperationalError) or not is_lock_error(e):
+                    return self._write_each(readings)
+                self._requeue(readings)
+                return 0
+
+    def _requeue(self, readings):
+        with self._lock:
+            self._readings[:0] = readings
+
+    def _write_each(self, readings):
+        written = 0
+        for index, reading in enumerate(readings):
+            try:
+                written += write_readings([reading])
+            except Exception as e:
+                db.session.rollback()
+                if isinstance(e, OperationalError) and is_lock_error(e):
+                    self._requeue(readings[index:])
+                    break
+                metrics.inc('kaktus_telemetry_rejected_total', 'Messwerte, die sich nicht speichern ließen')
+                app.logger.error('Telemetrie-Messwert verworfen: %r (%s: %s)', reading, type(e).__name__, e)
+        return written
+
+telemetry_buffer = TelemetryBuffer()
+
+def _sensor_ids(readings):
+    """Sensor-IDs zu den Namen, unbekannte Sensoren werden angelegt
+
+    Das Anlegen ist ein INSERT ... ON CONFLICT DO NOTHING: legt ein anderer Prozess denselben
+    Sensor gleichzeitig an, wird dessen Zeile übernommen statt mit einem IntegrityError abzubrechen.
+    """
+    locations = {}
+    for name, location, *_ in readings:
+        if location or name not in locations:
+            locations[name] = location
+    sensors = {s.name: s for s in Sensor.query.filter(Sensor.name.in_(locations))}
+    new = [{'name': name, 'location': location, 'created_at': datetime.utcnow()}
+           for name, location in locations.items() if name not in sensors]
+    if new:
+        db.session.execute(sqlite_insert(Sensor).on_conflict_do_nothing(index_elements=['name']), new)
+        sensors = {s.name: s for s in Sensor.query.filter(Sensor.name.in_(locations))}
+    for name, location in locations.items():
+        if location and sensors[name].location != location:
+            sensors[name].location = location  # Sensor wurde umgestellt
+    db.session.flush()
+    return {name: sensor.id for name, sensor in sensors.items()}
+
+def write_readings(readings):
+    """Messwerte gebündelt speichern und Minuten-, Stunden- und Tages-Aggregate per Upsert nachziehen
+
+    Doppelt gesendete Werte (gleicher Sensor und Zeitpunkt) werden verworfen, bevor sie in die
+    Aggregate eingehen. Liefert die Zahl neuer Messwerte.
+    """
+    sensor_ids = _sensor_ids(readings)
+
+    # Neue Werte bestimmen: im Batch eindeutig und noch nicht gespeichert
+    rows = {}
+    for name, _, ts, temperature, humidity in readings:
+        rows[(sensor_ids[name], ts)] = (temperature, humidity)
+    stamps = [ts for _, ts in rows]
+    existing = db.session.execute(db.select(SensorReading.sensor_id, SensorReading.ts).where(
+        SensorReading.sensor_id.in_({sensor_id for sensor_id, _ in rows}),
+        SensorReading.ts.between(min(stamps), max(stamps)))).all()
+    for key in existing:
+        rows.pop(tuple(key), None)
+    if not rows:
+        db.session.commit()
+        return 0
+
+    db.session.execute(sqlite_insert(SensorReading).on_conflict_do_nothing(), [
+        {'sensor_id': sensor_id, 'ts': ts, 'temperature': temperature, 'humidity': humidity}
+        for (sensor_id, ts), (temperature, humidity) in rows.items()
+    ])
+
+    # Aggregate des Batches im Speicher bilden, dann ein Upsert pro Intervall
+    rollups = {}
+    for (sensor_id, ts), (temperature, humidity) in rows.items():
+        for resolution, seconds in TELEMETRY_RESOLUTIONS.items():
+            key = (sensor_id, resolution, ts - ts % seconds)
+            entry = rollups.get(key)
+            if entry is None:
+                entry = rollups[key] = {'sensor_id': sensor_id, 'resolution': resolution, 'bucket': key[2],
+                                        'count': 0, 'temperature_sum': 0, 'temperature_min': temperature,
+                                        'temperature_max': temperature, 'humidity_count': 0, 'humidity_sum': 0,
+                                        'humidity_min': None, 'humidity_max': None}
+            entry['count'] += 1
+            entry['temperature_sum'] += temperature
+            entry['temperature_min'] = min(entry['temperature_min'], temperature)
+            entry['temperature_max'] = max(entry['temperature_max'], temperature)
+            if humidity is not None:
+                entry['humidity_count'] += 1
+                entry['humidity_sum'] += humidity
+                entry['humidity_min'] = humidity if entry['humidity_min'] is None else min(entry['humidity_min'], humidity)
+                entry['humidity_max'] = humidity if entry['humidity_max'] is None else max(entry['humidity_max'], humidity)
+    db.session.execute(text(
+        'INSERT INTO sensor_rollup (sensor_id, resolution, bucket, count, temperature_sum, temperature_min, '
+        'temperature_max, humidity_count, humidity_sum, humidity_min, humidity_max) '
+        'VALUES (:sensor_id, :resolution, :bucket, :count, :temperature_sum, :temperature_min, '
+        ':temperature_max, :humidity_count, :humidity_sum, :humidity_min, :humidity_max) '
+        'ON CONFLICT(sensor_id, resolution, bucket) DO UPDATE SET '
+        'count = count + excluded.count, '
+        'temperature_sum = temperature_sum + excluded.temperature_sum, '
+        'temperature_min = MIN(temperature_min, excluded.temperature_min), '
+        'temperature_max = MAX(temperature_max, excluded.temperature_max), '
+        'humidity_count = humidity_count + excluded.humidity_count, '
+        'humidity_sum = humidity_sum + excluded.humidity_sum, '
+        'humidity_min = COALESCE(MIN(humidity_min, excluded.humidity_min), humidity_min, excluded.humidity_min), '
+        'humidity_max = COALESCE(MAX(humidity_max, excluded.humidity_max), humidity_max, excluded.humidity_max)'
+    ), list(rollups.values()))
+
+    latest = {}
+    for sensor_id, ts in rows:
+        latest[sensor_id] = max(ts, latest.get(sensor_id, ts))
+    db.session.execute(text('UPDATE sensor SET last_seen = MAX(COALESCE(last_seen, 0), :ts) WHERE id = :id'),
+                       [{'id': sensor_id, 'ts': ts} for sensor_id, ts in latest.items()])
+    db.session.commit()
+    metrics.inc('kaktus_telemetry_readings_total', 'Gespeicherte Sensor-Messwerte', len(rows))
+    return len(rows)
+
+def start_telemetry_writer():
+    """Hintergrund-Thread, der den Messwert-Puffer alle TELEMETRY_FLUSH_SECONDS schreibt"""
+    def loop():
+        while True:
+            time.sleep(app.config['TELEMETRY_FLUSH_SECONDS'])
+            try:
+                with app.app_context():
+                    g.write_transaction = True
+                    telemetry_buffer.flush()
+            except Exception:
+                app.logger.exception('Telemetrie-Puffer konnte nicht geschrieben werden')
+
+    def flush_on_exit():
+        with app.app_context():
+            g.write_transaction = True
+            telemetry_buffer.flush()
+
+    telemetry_buffer.writer_running = True
+    atexit.register(flush_on_exit)
+    thread = threading.Thread(target=loop, name='kaktus-telemetry', daemon=True)
+    thread.start()
+    return thread
+
+@app.route('/api/telemetry', methods=['POST'])
+@write_transaction
+def ingest_telemetry():
+    """Messwerte gebündelt annehmen: {readings: [{sensor, location?, ts?, temperature, humidity?}]}
+
+    Die Werte landen zuerst im Speicherpuffer (Antwort 202) und werden im Hintergrund geschrieben.
+    """
+    data = request.json
+    items = (data.get('readings') or []) if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return jsonify({'error': 'Erwartet ein Objekt {readings: [...]}'}), 400
+    if len(items) > app.config['TELEMETRY_MAX_BATCH']:
+        return jsonify({'error': f'Höchstens {app.config["TELEMETRY_MAX_BATCH"]} Messwerte pro Request'}), 413
+    readings, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            readings.append(parse_reading(item))
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append({'index': index, 'error': f'{type(e).__name__}: {e}'})
+
+    buffered = telemetry_buffer.add(readings)
+    # Ohne Schreib-Thread (z.B. CLI, Tests) oder bei vollem Puffer sofort schreiben
+    if not telemetry_buffer.writer_running or buffered >= app.config['TELEMETRY_FLUSH_SIZE']:
+        try:
+            telemetry_buffer.flush()
+        except Exception:
+            # Die Werte bleiben im Puffer und werden beim nächsten Durchlauf geschrieben
+            app.logger.exception('Telemetrie-Puffer konnte nicht geschrieben werden')
+    return jsonify({'accepted': len(readings), 'rejected': errors, 'buffered': len(telemetry_buffer)}), 202
+
+def _rollup_values(row):
+    return {
+        'count': row.count,
+        'temperature_avg': round(row.temperature_sum / row.count / TEMPERATURE_SCALE, 2),
+        'temperature_min': row.temperature_min / TEMPERATURE_SCALE,
+        'temperature_max': row.temperature_max / TEMPERATURE_SCALE,
+        'humidity_avg': round(row.humidity_sum / row.humidity_count / HUMIDITY_SCALE, 1) if row.humidity_count else None,
+        'humidity_min': row.humidity_min / HUMIDITY_SCALE if row.humidity_min is not None else None,
+        'humidity_max': row.humidity_max / HUMIDITY_SCALE if row.humidity_max is not None else None
     }
 
-    return jsonify(stats)
+@app.route('/api/telemetry', methods=['GET'])
+def query_telemetry():
+    """Verlauf aus den Aggregaten: ?sensor=<name>|location=<Standort>&resolution=hour&from=&to= (ISO oder Unix-Zeit)"""
+    resolution = request.args.get('resolution', 'hour')
+    if resolution not in TELEMETRY_RESOLUTIONS:
+        return jsonify({'error': f'resolution muss eine von {", ".join(TELEMETRY_RESOLUTIONS)} sein'}), 400
+    try:
+        end = _parse_timestamp(request.args.get('to'))
+        start = _parse_timestamp(request.args.get('from')) if request.args.get('from') \
+            else end - 1440 * TELEMETRY_RESOLUTIONS[resolution]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    sensors = Sensor.query
+    if request.args.get('sensor'):
+        sensors = sensors.filter(Sensor.name == request.args['sensor'])
+    if request.args.get('location'):
+        sensors = sensors.filter(Sensor.location == request.args['location'])
+    sensors = {s.id: s for s in sensors.all()}
+
+    rows = db.session.execute(
+        db.select(SensorRollup)
+        .where(SensorRollup.sensor_id.in_(sensors), SensorRollup.resolution == resolution,
+               SensorRollup.bucket.between(start - start % TELEMETRY_RESOLUTIONS[resolution], end))
+        .order_by(SensorRollup.sensor_id, SensorRollup.bucket)
+    ).scalars()
+    series = {sensor_id: [] for sensor_id in sensors}
+    for row in rows:
+        series[row.sensor_id].append({'time': datetime.utcfromtimestamp(row.bucket).isoformat() + 'Z', **_rollup_values(row)})
+    return jsonify({
+        'resolution': resolution,
+        'from': datetime.utcfromtimestamp(start).isoformat() + 'Z',
+        'to': datetime.utcfromtimestamp(end).isoformat() + 'Z',
+        'sensors': [{'sensor': sensors[sensor_id].name, 'location': sensors[sensor_id].location, 'points': points}
+                    for sensor_id, points in series.items()]
+    })
+
+@app.route('/api/telemetry/sensors')
+def list_sensors():
+    """Alle Sensoren mit dem Mittel ihrer neuesten Minute"""
+    latest = db.select(SensorRollup.sensor_id, db.func.max(SensorRollup.bucket).label('bucket')) \
+        .where(SensorRollup.resolution == 'minute').group_by(SensorRollup.sensor_id).subquery()
+    rows = db.session.execute(
+        db.select(Sensor, SensorRollup)
+        .outerjoin(latest, latest.c.sensor_id == Sensor.id)
+        .outerjoin(SensorRollup, db.and_(SensorRollup.sensor_id == Sensor.id, SensorRollup.resolution == 'minute',
+                                         SensorRollup.bucket == latest.c.bucket))
+        .order_by(Sensor.name)
+    ).all()
+    return jsonify([{
+        'sensor': sensor.name,
+        'location': sensor.location,
+        'last_seen': datetime.utcfromtimestamp(sensor.last_seen).isoformat() + 'Z' if sensor.last_seen else None,
+        'latest': _rollup_values(rollup) if rollup else None
+    } for sensor, rollup in rows])
+
+def purge_telemetry(now=None):
+    """Rohwerte und feine Aggregate nach TELEMETRY_RETENTION löschen"""
+    now = now or int(time.time())
+    removed = {}
+    for name, days in TELEMETRY_RETENTION.items():
+        if days is None:
+            continue
+        cutoff = now - days * 86400
+        if name == 'raw':
+            statement = db.delete(SensorReading).where(SensorReading.ts < cutoff)
+        else:
+            statement = db.delete(SensorRollup).where(SensorRollup.resolution == name, SensorRollup.bucket < cutoff)
+        removed[name] = db.session.execute(statement, execution_options={'synchronize_session': False}).rowcount
+    db.session.commit()
+    return removed
+
+@job_handler('purge_telemetry', writes=True)
+def run_purge_telemetry_job(context, params):
+    """Alte Sensor-Rohwerte und Minuten-/Stundenaggregate entfernen"""
+    return {'removed': purge_telemetry()}
+
+@periodic_job('purge_telemetry')
+def _telemetry_purge_due():
+    return not ran_today('purge_telemetry')
+
+# ==================== TEMPERATURÜBERWACHUNG ====================
+
+# Ausgewertet werden die abgeschlossenen Tage vor heute - das Ergebnis gilt so für den ganzen Tag
+COMPLIANCE_DAYS = 7
+# Ein Messwert gilt bis zum nächsten, höchstens so lange (Sekunden) - Sensorausfälle zählen nicht mit
+COMPLIANCE_MAX_GAP = 900
+# Warnung ab so vielen Minuten außerhalb des Bereichs, dringend ab so vielen Stunden
+COMPLIANCE_ALERT_MINUTES = 60
+COMPLIANCE_URGENT_HOURS = 24
+
+def _load_temperature_series(start, end):
+    """Rohwerte spaltenweise: Sensor, Zeit und Temperatur (°C), sortiert nach Sensor und Zeit"""
+    query = db.select(SensorReading.sensor_id, SensorReading.ts, SensorReading.temperature) \
+        .where(SensorReading.ts >= start, SensorReading.ts < end) \
+        .order_by(SensorReading.sensor_id, SensorReading.ts)
+    rows = db.session.connection().execute(query).fetchall()
+    data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=3 * len(rows)).reshape(-1, 3)
+    return data[:, 0], data[:, 1], data[:, 2] / TEMPERATURE_SCALE
+
+def compute_temperature_compliance(today):
+    """Dauer außerhalb von temperature_min/temperature_max je Standort und Art
+
+    Alle Messwerte eines Standorts werden in einem Schritt gegen alle vorkommenden
+    Grenzwertpaare der Arten verglichen (Matrix Grenzpaar × Messwert). Mit mehreren
+    Sensoren an einem Standort zählt der ungünstigste Sensor.
+    """
+    end = int(datetime.combine(today, datetime.min.time()).timestamp())
+    start = end - COMPLIANCE_DAYS * 86400
+    result = {'from': datetime.fromtimestamp(start).isoformat(), 'to': datetime.fromtimestamp(end).isoformat(),
+              'locations': {}}
+
+    sensor_locations = dict(db.session.execute(
+        db.select(Sensor.id, Sensor.location).where(Sensor.location.is_not(None))).all())
+    limits = [(species_id, info.get('temperature_min'), info.get('temperature_max'))
+              for species_id, info in get_species_map().items()
+              if info.get('temperature_min') is not None or info.get('temperature_max') is not None]
+    if not sensor_locations or not limits:
+        return result
+    sensors, stamps, temperatures = _load_temperature_series(start, end)
+    if not len(stamps):
+        return result
+
+    # Gewicht je Messwert: Sekunden bis zum nächsten Wert desselben Sensors (bzw. Fensterende)
+    following = np.append(stamps[1:], end)
+    following[np.append(sensors[1:] != sensors[:-1], True)] = end
+    weights = np.minimum(following - stamps, COMPLIANCE_MAX_GAP).astype(np.float64)
+
+    # Arten mit gleichen Grenzen teilen sich eine Matrixzeile; fehlende Grenze = unbegrenzt
+    species_ids = np.array([species_id for species_id, _, _ in limits])
+    bounds = np.array([(-np.inf if low is None else low, np.inf if high is None else high)
+                       for _, low, high in limits], dtype=np.float64)
+    pairs, pair_of_species = np.unique(bounds, axis=0, return_inverse=True)
+    pair_of_species = pair_of_species.reshape(-1)
+    lows, highs = pairs[:, 0:1], pairs[:, 1:2]
+
+    by_location = defaultdict(list)
+    for sensor_id, location in sensor_locations.items():
+        by_location[location].append(sensor_id)
+
+    for location, location_sensors in by_location.items():
+        mask = np.isin(sensors, location_sensors)
+        if not mask.any():
+            continue
+        values, seconds = temperatures[mask], weights[mask]
+        selected = sensors[mask]
+        starts = np.flatnonzero(np.append(True, selected[1:] != selected[:-1]))
+
+        below = values < lows
+        above = values > highs
+        # Sekunden je Grenzpaar und Sensor, dann der ungünstigste Sensor
+        below_seconds = np.add.reduceat(below * seconds, starts, axis=1).max(axis=1)
+        above_seconds = np.add.reduceat(above * seconds, starts, axis=1).max(axis=1)
+        coldest = np.where(below, values, np.inf).min(axis=1)
+        warmest = np.where(above, values, -np.inf).max(axis=1)
+
+        entries = {}
+        for species_id, pair in zip(species_ids.tolist(), pair_of_species.tolist()):
+            if below_seconds[pair] == 0 and above_seconds[pair] == 0:
+                continue
+            entries[species_id] = {
+                'below_hours': round(float(below_seconds[pair]) / 3600, 2),
+                'above_hours': round(float(above_seconds[pair]) / 3600, 2),
+                'coldest': round(float(coldest[pair]), 2) if below_seconds[pair] else None,
+                'warmest': round(float(warmest[pair]), 2) if above_seconds[pair] else None
+            }
+        result['locations'][location] = {
+            'sensors': len(starts),
+            'covered_hours': round(float(np.add.reduceat(seconds, starts).max()) / 3600, 1),
+            'species': entries
+        }
+    return result
+
+compliance_cache = VersionedCache('compliance', maxsize=4, ttl=86400)
+
+def get_temperature_compliance(today=None):
+    """Auswertung aus dem Cache - einmal pro Tag, neu nach Änderungen an Arten oder Sensor-Standorten"""
+    today = today or datetime.now().date()
+    return compliance_cache.get_or_compute(('compliance', today.isoformat()),
+                                           lambda: compute_temperature_compliance(today))
+
+def temperature_compliance_entries(today=None):
+    """Betroffene Pflanzen je Standort und Art (über Plant.location) mit ihren Zeiten außerhalb des Bereichs"""
+    compliance = get_temperature_compliance(today)
+    locations = compliance['locations']
+    if not locations:
+        return compliance, []
+
+    plants = defaultdict(list)
+    for plant_id, location, species_id in db.session.execute(
+            db.select(Plant.id, Plant.location, Plant.species_id)
+            .where(Plant.location.in_(locations)).order_by(Plant.id)):
+        if species_id in locations[location]['species']:
+            plants[(location, species_id)].append(plant_id)
+
+    species_map = get_species_map()
+    entries = [{
+        'location': location,
+        'species_id': species_id,
+        'species': species_map[species_id]['name'],
+        'temperature_min': species_map[species_id].get('temperature_min'),
+        'temperature_max': species_map[species_id].get('temperature_max'),
+        'plant_ids': plant_ids,
+        **locations[location]['species'][species_id]
+    } for (location, species_id), plant_ids in plants.items()]
+    entries.sort(key=lambda e: -(e['below_hours'] + e['above_hours']))
+    return compliance, entries
+
+def temperature_alerts(today=None):
+    """Warnungen für /api/care-alerts: eine pro Standort, Art und Richtung (zu kalt/zu warm)"""
+    if np is None:
+        return []
+    alerts = []
+    for entry in temperature_compliance_entries(today)[1]:
+        for hours, limit, extreme, label in (
+                (entry['below_hours'], entry['temperature_min'], entry['coldest'], 'unter'),
+                (entry['above_hours'], entry['temperature_max'], entry['warmest'], 'über')):
+            if hours * 60 < COMPLIANCE_ALERT_MINUTES:
+                continue
+            count = len(entry['plant_ids'])
+            alerts.append({
+                'type': 'temperature',
+                'priority': 'high' if hours >= COMPLIANCE_URGENT_HOURS else 'medium',
+                'species': entry['species'],
+                'plant_ids': entry['plant_ids'],
+                'location': entry['location'],
+                'message': f'{entry["species"]} ({count} {"Pflanze" if count == 1 else "Pflanzen"}) am Standort '
+                           f'{entry["location"]}: {hours:.1f} h {label} {limit}°C in den letzten {COMPLIANCE_DAYS} Tagen '
+                           f'(Extremwert {extreme:.1f}°C)'
+            })
+    return alerts
+
+@app.route('/api/telemetry/compliance')
+def temperature_compliance():
+    """Welche Pflanzen standen wie lange außerhalb des Temperaturbereichs ihrer Art (?location= filtert)"""
+    if np is None:
+        return jsonify({'error': 'Für Analysen wird NumPy benötigt (pip install numpy)'}), 501
+    compliance, entries = temperature_compliance_entries()
+    if request.args.get('location'):
+        entries = [e for e in entries if e['location'] == request.args['location']]
+    return jsonify({
+        'from': compliance['from'],
+        'to': compliance['to'],
+        'locations': {location: {'sensors': info['sensors'], 'covered_hours': info['covered_hours']}
+                      for location, info in compliance['locations'].items()},
+        'results': entries
+    })
 
 # ==================== MIGRATION ====================
-# Fügen Sie diese Funktion zur init_db() hinzu:
+
+class SchemaMigration(db.Model):
+    """Einmalige Datenmigrationen, die in dieser Datenbank schon gelaufen sind"""
+    name = db.Column(db.String(100), primary_key=True)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def run_once(conn, name, migrate):
+    """migrate(conn) nur beim ersten Start mit dieser Datenbank ausführen (None = lief schon)"""
+    SchemaMigration.__table__.create(bind=conn, checkfirst=True)
+    if conn.scalar(db.select(SchemaMigration.name).where(SchemaMigration.name == name)):
+        return None
+    result = migrate(conn)
+    conn.execute(db.insert(SchemaMigration).values(name=name, applied_at=datetime.utcnow()))
+    return result
 
 def upgrade_database():
-    """Erweitert die bestehende Datenbank um neue Felder"""
+    """Erweitert die bestehende Datenbank um neue Felder und Indizes"""
     with app.app_context():
         # Prüfen ob die neuen Tabellen existieren
         inspector = db.inspect(db.engine)
@@ -1923,8 +5181,262 @@ def upgrade_database():
         if 'plant' in existing_tables:
             columns = [col['name'] for col in inspector.get_columns('plant')]
             if 'from_sowing' not in columns:
-                with db.engine.connect() as conn:
-                    conn.execute('ALTER TABLE plant ADD COLUMN from_sowing BOOLEAN DEFAULT FALSE')
-                    conn.execute('ALTER TABLE plant ADD COLUMN sowing_id INTEGER')
-                    conn.commit()
+                with db.engine.begin() as conn:
+                    conn.execute(text('ALTER TABLE plant ADD COLUMN from_sowing BOOLEAN DEFAULT FALSE'))
+                    conn.execute(text('ALTER TABLE plant ADD COLUMN sowing_id INTEGER'))
                 print("✅ Plant-Tabelle erweitert")
+
+        if 'care_checklist_item' in existing_tables:
+            columns = [col['name'] for col in inspector.get_columns('care_checklist_item')]
+            if 'template_id' not in columns:
+                with db.engine.begin() as conn:
+                    conn.execute(text('ALTER TABLE care_checklist_item ADD COLUMN template_id INTEGER REFERENCES checklist_template (id)'))
+                    conn.execute(text('ALTER TABLE care_checklist_item ADD COLUMN hidden BOOLEAN DEFAULT FALSE'))
+                print("✅ Checklisten-Tabelle erweitert")
+            if 'next_due' not in columns:
+                with db.engine.begin() as conn:
+                    conn.execute(text('ALTER TABLE care_checklist_item ADD COLUMN next_due DATE'))
+                    for frequency, days in CHECKLIST_INTERVALS.items():
+                        conn.execute(text(
+                            "UPDATE care_checklist_item SET next_due = date(completed_date, :offset) "
+                            "WHERE frequency = :frequency AND completed_date IS NOT NULL"
+                        ), {'offset': f'+{days} days', 'frequency': frequency})
+                print("✅ Checklisten-Fälligkeiten nachgetragen")
+
+        if 'job' in existing_tables:
+            columns = [col['name'] for col in inspector.get_columns('job')]
+            if 'owner' not in columns:
+                with db.engine.begin() as conn:
+                    conn.execute(text('ALTER TABLE job ADD COLUMN owner VARCHAR(100)'))
+                    conn.execute(text('ALTER TABLE job ADD COLUMN heartbeat_at DATETIME'))
+                print("✅ Job-Tabelle erweitert")
+
+        if 'species' in existing_tables:
+            columns = [col['name'] for col in inspector.get_columns('species')]
+            derived = [name for name in ('water_days_summer', 'water_days_winter',
+                                         'germination_min_days', 'germination_max_days') if name not in columns]
+            if derived:
+                with db.engine.begin() as conn:
+                    for name in derived:
+                        conn.execute(text(f'ALTER TABLE species ADD COLUMN {name} INTEGER'))
+                    backfill_species_care(conn)
+                print("✅ Gießintervalle und Keimfenster der Arten aus den Pflegetexten übernommen")
+
+            # Einmalig nach der Korrektur von "wenn ... trocken" (galt als "trocken halten")
+            with db.engine.begin() as conn:
+                if run_once(conn, 'reparse_watering_guidance', reparse_species_care) and not derived:
+                    print("✅ Gießintervalle der Arten neu aus den Pflegetexten berechnet")
+
+        # Fremdschlüssel mit ON DELETE: Tabellen aus älteren Versionen neu anlegen
+        upgrade_foreign_keys(db.inspect(db.engine))
+
+        # Standard-Vorlagen anlegen und früher pro Pflanze angelegte Standard-Zeilen darauf umstellen
+        with db.engine.begin() as conn:
+            if conn.scalar(text('SELECT COUNT(*) FROM checklist_template')) == 0:
+                conn.execute(db.insert(ChecklistTemplate), [
+                    {'task': task, 'frequency': frequency, 'sort_order': index, 'created_at': datetime.utcnow()}
+                    for index, (task, frequency) in enumerate(DEFAULT_CHECKLIST)])
+            removed = migrate_default_checklist_rows(conn)
+        if removed:
+            print(f"✅ {removed} unveränderte Standard-Checklisteneinträge entfernt (kommen jetzt aus Vorlagen)")
+
+        # Indizes, die create_all bei bestehenden Tabellen nicht nachträgt
+        with db.engine.begin() as conn:
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=conn, checkfirst=True)
+
+        # Keimungs-Statistik einmalig aus vorhandenen Aussaaten aufbauen
+        with db.engine.begin() as conn:
+            if conn.scalar(text('SELECT COUNT(*) FROM germination_stat')) == 0 \
+                    and conn.scalar(text('SELECT COUNT(*) FROM sowing')) > 0:
+                rebuild_germination_stats(conn)
+                print("✅ Keimungs-Statistik aufgebaut")
+
+        # Einmalig: Tagebuchzeilen entfernen, die Aktionen oder Keimungen doppelt speichern
+        with db.engine.begin() as conn:
+            removed = run_once(conn, 'collapse_duplicate_diary_entries', collapse_duplicate_diary_entries)
+        if removed:
+            print(f"✅ {removed} doppelte Tagebucheinträge entfernt (stehen weiterhin über Aktionen im Tagebuch)")
+
+def _foreign_key_actions(foreign_keys):
+    """Fremdschlüssel als Menge (Spalte, Zieltabelle, ON DELETE) zum Vergleich Modell ↔ Datenbank"""
+    return {(tuple(fk['constrained_columns']), fk['referred_table'], (fk.get('options') or {}).get('ondelete', '').upper() or None)
+            for fk in foreign_keys}
+
+def outdated_foreign_key_tables(inspector):
+    """Tabellen, deren Fremdschlüssel in der Datenbank ein anderes ON DELETE haben als im Modell"""
+    existing = set(inspector.get_table_names())
+    outdated = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing or not table.foreign_keys:
+            continue
+        expected = {((fk.parent.name,), fk.column.table.name, fk.ondelete.upper() if fk.ondelete else None)
+                    for fk in table.foreign_keys}
+        if _foreign_key_actions(inspector.get_foreign_keys(table.name)) != expected:
+            outdated.append(table)
+    return outdated
+
+def rebuild_tables(conn, tables):
+    """Tabellen nach dem SQLite-Verfahren für Schemaänderungen neu anlegen (neue Tabelle, kopieren, umbenennen)
+
+    SQLite kann Fremdschlüssel nicht per ALTER TABLE ändern. Muss bei ausgeschalteten
+    Fremdschlüsseln laufen; Indizes legt upgrade_database danach wieder an.
+    """
+    for table in tables:
+        columns = [col['name'] for col in db.inspect(conn).get_columns(table.name)]
+        shared = ', '.join(name for name in table.columns.keys() if name in columns)
+        ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+        conn.execute(text(ddl.replace(f'CREATE TABLE {table.name} ', f'CREATE TABLE _new_{table.name} ', 1)))
+        conn.execute(text(f'INSERT INTO _new_{table.name} ({shared}) SELECT {shared} FROM {table.name}'))
+        conn.execute(text(f'DROP TABLE {table.name}'))
+        conn.execute(text(f'ALTER TABLE _new_{table.name} RENAME TO {table.name}'))
+
+def purge_orphans(conn):
+    """Zeilen entfernen, deren Eltern fehlen (aus der Zeit ohne Fremdschlüssel-Prüfung)
+
+    Mengenbasiert pro Fremdschlüssel, Eltern vor Kindern: Bei ON DELETE SET NULL wird die
+    Spalte geleert, sonst die Zeile gelöscht. Liefert die betroffenen Zeilen je Tabelle.
+    """
+    affected = Counter()
+    for table in db.metadata.sorted_tables:
+        for fk in table.foreign_keys:
+            child, parent = fk.parent, fk.column
+            orphan = db.and_(child.is_not(None), ~db.exists().where(parent == child))
+            if fk.ondelete and fk.ondelete.upper() == 'SET NULL':
+                statement = db.update(table).where(orphan).values({child.name: None})
+            else:
+                statement = db.delete(table).where(orphan)
+            affected[table.name] += conn.execute(statement).rowcount
+    affected = {name: count for name, count in affected.items() if count}
+    if affected:
+        _bump_cache_versions(conn, [name for name, deps in CACHE_DEPENDENCIES.items() if deps & set(affected)])
+    return affected
+
+def upgrade_foreign_keys(inspector):
+    """Bestehende Tabellen auf ON DELETE CASCADE / SET NULL umbauen und verwaiste Zeilen entfernen"""
+    tables = outdated_foreign_key_tables(inspector)
+    if not tables:
+        return
+    with db.engine.connect() as conn:
+        # Muss vor Transaktionsbeginn gesetzt werden, sonst ignoriert SQLite das PRAGMA
+        conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = OFF')
+        try:
+            with conn.begin():
+                rebuild_tables(conn, tables)
+                removed = purge_orphans(conn)
+                violations = conn.execute(text('PRAGMA foreign_key_check')).fetchall()
+                if violations:
+                    raise RuntimeError(f'Fremdschlüssel nach dem Umbau verletzt: {violations[:5]}')
+        finally:
+            conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = ON')
+    print(f"✅ Fremdschlüssel mit ON DELETE neu angelegt: {', '.join(table.name for table in tables)}")
+    if removed:
+        print(f"✅ Verwaiste Zeilen entfernt: {', '.join(f'{name} {count}' for name, count in removed.items())}")
+
+@job_handler('purge_orphans', writes=True)
+def run_purge_orphans_job(context, params):
+    """Verwaiste Zeilen entfernen, z.B. nach dem Einspielen alter Daten per SQL"""
+    removed = purge_orphans(db.session.connection())
+    for name in removed:
+        if name in EVENT_ENTITIES:
+            record_change(name)
+    db.session.commit()
+    return {'removed': removed}
+
+def migrate_default_checklist_rows(conn):
+    """Zeilen der alten Standard-Checkliste auf die allgemeinen Vorlagen abbilden
+
+    Nicht abgehakte Zeilen entfallen (die Vorlage liefert sie virtuell), abgehakte bekommen die
+    template_id. Doppelte Zeilen pro Pflanze und Vorlage werden dabei zusammengeführt.
+    """
+    templates = {(task, frequency): template_id for template_id, task, frequency in conn.execute(text(
+        'SELECT id, task, frequency FROM checklist_template WHERE species_id IS NULL'))}
+    removed = 0
+    for (task, frequency), template_id in templates.items():
+        match = ('template_id IS NULL AND task = :task AND frequency IS :frequency '
+                 'AND NOT EXISTS (SELECT 1 FROM care_checklist_item o '
+                 'WHERE o.plant_id = care_checklist_item.plant_id AND o.template_id = :template_id)')
+        params = {'task': task, 'frequency': frequency, 'template_id': template_id}
+        removed += conn.execute(text(
+            f'DELETE FROM care_checklist_item WHERE {match} AND NOT COALESCE(completed, 0)'), params).rowcount
+        # Pro Pflanze die zuletzt abgehakte Zeile behalten
+        conn.execute(text(
+            'UPDATE care_checklist_item SET template_id = :template_id WHERE id IN ('
+            f'SELECT MAX(id) FROM care_checklist_item WHERE {match} GROUP BY plant_id)'), params)
+        removed += conn.execute(text(
+            'DELETE FROM care_checklist_item WHERE template_id IS NULL AND task = :task AND frequency IS :frequency '
+            'AND EXISTS (SELECT 1 FROM care_checklist_item o '
+            'WHERE o.plant_id = care_checklist_item.plant_id AND o.template_id = :template_id)'), params).rowcount
+    if removed:
+        _bump_cache_versions(conn, ['views'])
+    return removed
+
+# Früher automatisch erzeugte Tagebuchzeilen: (Eintragstyp, Notiz-Präfix)
+GENERATED_DIARY_NOTES = [(action, label + ': ') for action, label in ACTION_DIARY_LABELS.items()]
+
+def collapse_duplicate_diary_entries(conn):
+    """Tagebuchzeilen löschen, die nur eine Pflegeaktion oder Keimung doppelt speichern"""
+    removed = 0
+    for table in ('diary_entry', 'diary_entry_archive'):
+        for entry_type, prefix in GENERATED_DIARY_NOTES:
+            action_exists = ' OR '.join(
+                f'EXISTS (SELECT 1 FROM {actions} a JOIN plant p ON p.id = a.plant_id '
+                f'WHERE a.action_date = {table}.date AND a.action_type = {table}.entry_type '
+                f'AND p.species_id IS {table}.species_id)'
+                for actions in ('plant_action', 'plant_action_archive'))
+            removed += conn.execute(text(
+                f'DELETE FROM {table} WHERE entry_type = :entry_type '
+                f"AND substr(note, 1, length(:prefix)) = :prefix AND ({action_exists})"
+            ), {'entry_type': entry_type, 'prefix': prefix}).rowcount
+        removed += conn.execute(text(
+            f"DELETE FROM {table} WHERE entry_type = 'germination' AND note LIKE '🌱 Keimung: %' "
+            f'AND EXISTS (SELECT 1 FROM plant p JOIN sowing s ON s.id = p.sowing_id '
+            f'WHERE s.germination_date = {table}.date AND s.species_id IS {table}.species_id)'
+        )).rowcount
+
+    if removed:
+        # Monatssummen des Archivs passen sonst nicht mehr zu den Archivzeilen
+        conn.execute(text('DELETE FROM diary_rollup'))
+        conn.execute(text(
+            "INSERT INTO diary_rollup (month, entry_type, count) "
+            "SELECT strftime('%Y-%m', date), COALESCE(entry_type, 'general'), COUNT(*) "
+            "FROM diary_entry_archive GROUP BY 1, 2"
+        ))
+        _bump_cache_versions(conn, ['views'])
+    return removed
+
+# ==================== APP STARTEN ====================
+
+if __name__ == '__main__':
+    # Backup-Ordner erstellen
+    if not os.path.exists(app.config['BACKUP_DIR']):
+        os.makedirs(app.config['BACKUP_DIR'])
+
+    # Static-Ordner erstellen
+    if not os.path.exists('static'):
+        os.makedirs('static')
+
+    # Datenbank initialisieren
+    init_db()
+
+    # Debug-Modus (Reloader, Debugger, SQL-Header und /api/debug/sql) nur ausdrücklich: KAKTUS_DEBUG=1
+    debug = os.environ.get('KAKTUS_DEBUG') == '1'
+
+    # Mit Reloader läuft dieser Block zweimal - Hintergrund-Threads nur im eigentlichen Server-Prozess
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_scheduler()
+        start_telemetry_writer()
+
+    # HTTPS, wenn Zertifikat und Schlüssel angegeben sind - nötig für den Service Worker außerhalb von localhost
+    ssl_context = None
+    if os.environ.get('KAKTUS_SSL_CERT') and os.environ.get('KAKTUS_SSL_KEY'):
+        ssl_context = (os.environ['KAKTUS_SSL_CERT'], os.environ['KAKTUS_SSL_KEY'])
+    scheme = 'https' if ssl_context else 'http'
+
+    # Server starten
+    print("\n🌵 Kaktus-Center startet...")
+    print(f"📍 Zugriff über: {scheme}://localhost:5000")
+    print(f"📍 Oder im Netzwerk: {scheme}://[PI-IP]:5000\n")
+
+    app.run(host='0.0.0.0', port=5000, debug=debug, ssl_context=ssl_context)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark für alle API-Routen mit synthetischen Daten
+
+Erzeugt (oder verwendet) eine eigene Datenbank mit reproduzierbaren Testdaten,
+misst jede Route über den Flask-Test-Client und speichert p50/p95-Latenz,
+SQL-Anzahl und Speicherspitze als JSON unter benchmarks/.
+
+    python benchmark.py --scale 10k
+    python benchmark.py --scale 10k --db bench_10k.db --reuse --repeat 50
+    python benchmark.py --scale 10k --compare benchmarks/20251001_120000_10k.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import datagen
+
+RESULTS_DIR = 'benchmarks'
+
+
+def percentile(values, p):
+    """Perzentil nach Nearest-Rank-Methode"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class BenchContext:
+    """Liefert IDs aus der Testdatenbank und legt Wegwerf-Datensätze an"""
+
+    def __init__(self, client, seed):
+        from app import app, db, Plant, Sowing, Species
+        import random
+
+        self.client = client
+        self.rng = random.Random(seed)
+        self.counter = 0
+        with app.app_context():
+            self.plant_ids = [row[0] for row in db.session.execute(db.select(Plant.id).limit(5000))]
+            self.species_ids = [row[0] for row in db.session.execute(db.select(Species.id))]
+            self.sowing_ids = [row[0] for row in db.session.execute(db.select(Sowing.id).limit(5000))]
+            self.pending_sowing_ids = [row[0] for row in db.session.execute(
+                db.select(Sowing.id).where(Sowing.germinated == False).limit(5000))]
+
+    def unique(self, prefix):
+        self.counter += 1
+        return f'{prefix} {os.getpid()}-{self.counter}'
+
+    def plant_id(self):
+        return self.rng.choice(self.plant_ids)
+
+    def species_id(self):
+        return self.rng.choice(self.species_ids)
+
+    def sowing_id(self):
+        return self.rng.choice(self.sowing_ids)
+
+    def pending_sowing_id(self):
+        return self.rng.choice(self.pending_sowing_ids)
+
+    def plant_ids_query(self, count=50):
+        return ','.join(str(plant_id) for plant_id in self.rng.sample(self.plant_ids, min(count, len(self.plant_ids))))
+
+    def create(self, url, payload):
+        response = self.client.post(url, json=payload)
+        return response.get_json()['id']
+
+    def new_species(self):
+        return self.create('/api/species', {'name': self.unique('Benchmark-Art')})
+
+    def new_sowing(self):
+        return self.create('/api/sowings', {'species': self.species_id(), 'sowing_date': date.today().isoformat(),
+                                            'seed_count': 20, 'pot_number': self.unique('B')})
+
+    def new_plant(self):
+        return self.create('/api/plants', {'species': self.species_id(), 'purchase_date': date.today().isoformat(),
+                                           'location': 'Benchmark', 'substrate': 'Mineralisch'})
+
+    def new_diary_entry(self):
+        return self.create('/api/diary', {'date': date.today().isoformat(), 'note': 'Benchmark', 'entry_type': 'general'})
+
+    def new_checklist_template(self):
+        return self.create('/api/checklist-templates', {'task': self.unique('Benchmark'), 'frequency': 'weekly',
+                                                        'species': self.species_id()})
+
+    def job_id(self):
+        # Ein leichter Job genügt, gemessen wird nur die Statusabfrage
+        if not hasattr(self, '_job_id'):
+            self._job_id = self.client.post('/api/jobs', json={'kind': 'recompute_alerts'}).get_json()['id']
+        return self._job_id
+
+    def telemetry(self):
+        self.counter += 1
+        return {'readings': [{'sensor': 'benchmark', 'location': 'Benchmark', 'ts': int(time.time()) - 86400 + self.counter,
+                              'temperature': 21.5, 'humidity': 40}]}
+
+    def batch(self):
+        return {'client_id': 'benchmark', 'mutations': [
+            {'id': self.unique('m'), 'kind': 'plant_action', 'data': {'plant_id': self.plant_id(), 'action_type': 'water'}}
+            for _ in range(5)]}
+
+    def checklist_toggle(self):
+        plant_id = self.plant_id()
+        items = self.client.get(f'/api/plants/{plant_id}/checklist').get_json()
+        item = self.rng.choice(items)
+        return f'/api/plants/{plant_id}/checklist', {'item_id': item['id'], 'completed': not item['completed']}
+
+
+def _today():
+    return date.today().isoformat()
+
+
+# Routen mit Parametern oder Request-Body: (Name, Methode, Pfad-Regel, Vorbereitung)
+# Die Vorbereitung liefert (URL, JSON) und wird nicht mitgemessen.
+CASES = [
+    ('species_create', 'POST', '/api/species',
+     lambda c: ('/api/species', {'name': c.unique('Benchmark-Art')})),
+    ('species_delete', 'DELETE', '/api/species/<int:species_id>',
+     lambda c: (f'/api/species/{c.new_species()}', None)),
+    ('sowings_create', 'POST', '/api/sowings',
+     lambda c: ('/api/sowings', {'species': c.species_id(), 'sowing_date': _today(),
+                                 'seed_count': 20, 'pot_number': c.unique('B')})),
+    ('sowing_delete', 'DELETE', '/api/sowings/<int:sowing_id>',
+     lambda c: (f'/api/sowings/{c.new_sowing()}', None)),
+    ('sowing_germinate', 'POST', '/api/sowings/<int:sowing_id>/germinate',
+     lambda c: (f'/api/sowings/{c.pending_sowing_id()}/germinate',
+                {'germination_date': _today(), 'germinated_count': 5})),
+    ('sowing_auto_transfer', 'POST', '/api/sowings/<int:sowing_id>/auto-transfer',
+     lambda c: (f'/api/sowings/{c.new_sowing()}/auto-transfer',
+                {'germination_date': _today(), 'germinated_count': 5})),
+    ('plants_create', 'POST', '/api/plants',
+     lambda c: ('/api/plants', {'species': c.species_id(), 'purchase_date': _today(),
+                                'location': 'Benchmark', 'substrate': 'Mineralisch'})),
+    ('plant_patch', 'PATCH', '/api/plants/<int:plant_id>',
+     lambda c: (f'/api/plants/{c.plant_id()}', {'last_watered': True})),
+    ('plant_delete', 'DELETE', '/api/plants/<int:plant_id>',
+     lambda c: (f'/api/plants/{c.new_plant()}', None)),
+    ('plant_action', 'POST', '/api/plants/<int:plant_id>/action',
+     lambda c: (f'/api/plants/{c.plant_id()}/action', {'action_type': 'water', 'date': _today()})),
+    ('plant_actions', 'GET', '/api/plants/<int:plant_id>/actions',
+     lambda c: (f'/api/plants/{c.plant_id()}/actions', None)),
+    ('plant_checklist', 'GET', '/api/plants/<int:plant_id>/checklist',
+     lambda c: (f'/api/plants/{c.plant_id()}/checklist', None)),
+    ('plant_checklist_toggle', 'POST', '/api/plants/<int:plant_id>/checklist',
+     lambda c: c.checklist_toggle()),
+    ('plant_get', 'GET', '/api/plants/<int:plant_id>',
+     lambda c: (f'/api/plants/{c.plant_id()}', None)),
+    ('sowing_get', 'GET', '/api/sowings/<int:sowing_id>',
+     lambda c: (f'/api/sowings/{c.sowing_id()}', None)),
+    ('plant_care_stats', 'GET', '/api/plant-care-stats/<int:plant_id>',
+     lambda c: (f'/api/plant-care-stats/{c.plant_id()}', None)),
+    ('plant_care_stats_batch', 'GET', '/api/plant-care-stats',
+     lambda c: (f'/api/plant-care-stats?ids={c.plant_ids_query()}', None)),
+    ('diary_create', 'POST', '/api/diary',
+     lambda c: ('/api/diary', {'date': _today(), 'note': 'Benchmark', 'entry_type': 'general'})),
+    ('diary_delete', 'DELETE', '/api/diary/<int:entry_id>',
+     lambda c: (f'/api/diary/{c.new_diary_entry()}', None)),
+    ('checklist_template_create', 'POST', '/api/checklist-templates',
+     lambda c: ('/api/checklist-templates', {'task': c.unique('Benchmark'), 'frequency': 'weekly',
+                                             'species': c.species_id()})),
+    ('checklist_template_delete', 'DELETE', '/api/checklist-templates/<int:template_id>',
+     lambda c: (f'/api/checklist-templates/{c.new_checklist_template()}', None)),
+    ('batch', 'POST', '/api/batch', lambda c: ('/api/batch', c.batch())),
+    ('telemetry_ingest', 'POST', '/api/telemetry', lambda c: ('/api/telemetry', c.telemetry())),
+    # Jobs: gemessen wird das Anlegen, die Arbeit läuft im Hintergrund
+    ('job_submit', 'POST', '/api/jobs', lambda c: ('/api/jobs', {'kind': 'recompute_alerts'})),
+    ('job_get', 'GET', '/api/jobs/<job_id>', lambda c: (f'/api/jobs/{c.job_id()}', None)),
+    ('backup_submit', 'POST', '/api/backups', lambda c: ('/api/backups', {'label': 'benchmark'})),
+    # So weit zurück, dass nichts archiviert wird und die Testdaten für die übrigen Fälle gleich bleiben
+    ('archive_submit', 'POST', '/api/archive', lambda c: ('/api/archive', {'days': 36500})),
+]
+
+# Routen, die nicht gemessen werden: statische Dateien, Debug-Ausgaben und der
+# Server-Sent-Events-Stream (/api/events antwortet nie zu Ende)
+SKIPPED_RULES = {'/static/<path:filename>', '/api/debug/sql', '/api/events'}
+
+
+def build_cases(app):
+    """Explizite Fälle plus alle parameterlosen GET-Routen; meldet nicht abgedeckte Routen"""
+    cases = list(CASES)
+    covered = {(rule, method) for _, method, rule, _ in CASES}
+    uncovered = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if rule.rule in SKIPPED_RULES:
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (rule.rule, method) in covered:
+                continue
+            if method == 'GET' and not rule.arguments:
+                cases.append((rule.endpoint, 'GET', rule.rule, lambda c, url=rule.rule: (url, None)))
+            else:
+                uncovered.append(f'{method} {rule.rule}')
+    return cases, uncovered
+
+
+def run_case(client, context, case, repeat, cold, clear_caches):
+    name, method, rule, prepare = case
+    timings = []
+    sql_counts = []
+    statuses = {}
+
+    def call():
+        url, payload = prepare(context)
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=payload)
+        elapsed = (time.perf_counter() - start) * 1000
+        response.get_data()
+        return response, elapsed
+
+    call()  # Aufwärmen
+    for _ in range(repeat):
+        response, elapsed = call()
+        timings.append(elapsed)
+        sql_counts.append(int(response.headers.get('X-SQL-Queries', 0)))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    # Speicherspitze in einem separaten Lauf, damit tracemalloc die Latenz nicht verfälscht
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'name': name,
+        'method': method,
+        'rule': rule,
+        'runs': repeat,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'max_ms': round(max(timings), 3),
+        'sql_statements_p50': percentile(sql_counts, 50),
+        'sql_statements_max': max(sql_counts),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+
+def compare(current, previous_path, threshold):
+    """Vergleicht p50/p95 mit einem früheren Ergebnis; liefert die Anzahl Regressionen"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {r['name']: r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f'\n📊 Vergleich mit {previous_path} (Schwelle {threshold:.0f} %)')
+    print(f'{"Route":<32} {"p50 alt":>9} {"p50 neu":>9} {"Δ":>8} {"p95 alt":>9} {"p95 neu":>9} {"Δ":>8}')
+    for result in current['results']:
+        old = previous.get(result['name'])
+        if old is None:
+            print(f'{result["name"]:<32} {"neu":>9}')
+            continue
+        deltas = []
+        for key in ('p50_ms', 'p95_ms'):
+            base = old[key] or 0.001
+            deltas.append((result[key] - base) / base * 100)
+        flag = ' ⚠️' if max(deltas) > threshold else ''
+        regressions += bool(flag)
+        print(f'{result["name"]:<32} {old["p50_ms"]:>9.2f} {result["p50_ms"]:>9.2f} {deltas[0]:>7.0f}% '
+              f'{old["p95_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {deltas[1]:>7.0f}%{flag}')
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark aller API-Routen')
+    datagen.add_arguments(parser)
+    parser.add_argument('--db', help='Datenbankdatei (Standard: temporäre Datei)')
+    parser.add_argument('--reuse', action='store_true', help='Vorhandene Testdaten in --db weiterverwenden')
+    parser.add_argument('--repeat', type=int, default=20, help='Messungen pro Route')
+    parser.add_argument('--only', help='Nur Routen, deren Name diesen Text enthält')
+    parser.add_argument('--cold', action='store_true', help='Caches vor jedem Request leeren')
+    parser.add_argument('--output', help='Ergebnisdatei (Standard: benchmarks/<zeit>_<scale>.json)')
+    parser.add_argument('--compare', help='Früheres Ergebnis zum Vergleich')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Regressionsschwelle in Prozent')
+    args = parser.parse_args()
+
+    config = datagen.scale_from_args(args)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='kaktus_bench_'), 'bench.db')
+    datagen.use_database(db_path)
+
+    if args.reuse and os.path.exists(db_path):
+        print(f'♻️  Verwende vorhandene Testdaten in {db_path}')
+        counts = None
+    else:
+        print(f'🌱 Erzeuge Testdaten ({config}) in {db_path} ...')
+        start = time.perf_counter()
+        counts = datagen.generate_data(seed=args.seed, **config)
+        print(f'   fertig in {time.perf_counter() - start:.1f} s')
+
+    from app import app, init_db, _cache_registry
+    logging.getLogger('kaktus.sql').setLevel(logging.ERROR)
+    app.config['SQL_DEBUG'] = True
+    app.config['PROFILE_SAMPLE_RATE'] = 0
+    # Backups und Job-Ergebnisse der Messläufe nicht neben die echten legen
+    work_dir = tempfile.mkdtemp(prefix='kaktus_bench_files_')
+    app.config['BACKUP_DIR'] = os.path.join(work_dir, 'backups')
+    app.config['JOB_DIR'] = os.path.join(work_dir, 'jobs')
+    init_db()
+
+    def clear_caches():
+        for caches in _cache_registry.values():
+            for cache in caches:
+                cache.clear()
+
+    client = app.test_client()
+    context = BenchContext(client, args.seed)
+    cases, uncovered = build_cases(app)
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    print(f'\n⏱️  Messe {len(cases)} Routen mit je {args.repeat} Wiederholungen ...\n')
+    print(f'{"Route":<32} {"p50 ms":>9} {"p95 ms":>9} {"SQL":>5} {"Peak KB":>9}  Status')
+    results = []
+    for case in cases:
+        result = run_case(client, context, case, args.repeat, args.cold, clear_caches)
+        results.append(result)
+        print(f'{result["name"]:<32} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} '
+              f'{result["sql_statements_p50"]:>5} {result["peak_memory_kb"]:>9.1f}  {result["status_codes"]}')
+    for route in uncovered:
+        print(f'⏭️  Nicht gemessen (kein Benchmark-Fall): {route}')
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'config': config,
+            'seed': args.seed,
+            'rows': counts,
+            'repeat': args.repeat,
+            'cold_cache': args.cold
+        },
+        'results': results,
+        'uncovered_routes': uncovered
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f'{datetime.now().strftime("%Y%m%d_%H%M%S")}_{args.scale}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'\n💾 Ergebnisse gespeichert: {output}')
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        if regressions:
+            print(f'\n⚠️  {regressions} Route(n) langsamer als {args.threshold:.0f} %')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Erzeugt reproduzierbare synthetische Testdaten für Benchmarks und Lasttests
+
+Die Daten landen in einer eigenen SQLite-Datei, die echte kaktus.db bleibt
+unberührt. Gleicher Seed und gleiche Größe ergeben identische Daten.
+
+    python datagen.py --scale 10k --db bench_10k.db
+    python datagen.py --scale 100k --actions-per-plant 30 --db bench_100k.db
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+# Voreinstellungen: Pflanzenanzahl und abgeleitete Mengen
+SCALES = {
+    '1k': {'plants': 1_000, 'sowings': 200, 'actions_per_plant': 20, 'diary_per_plant': 2, 'checklist_per_plant': 6, 'extra_species': 50},
+    '10k': {'plants': 10_000, 'sowings': 2_000, 'actions_per_plant': 20, 'diary_per_plant': 2, 'checklist_per_plant': 6, 'extra_species': 200},
+    '100k': {'plants': 100_000, 'sowings': 20_000, 'actions_per_plant': 20, 'diary_per_plant': 2, 'checklist_per_plant': 6, 'extra_species': 500},
+}
+
+LOCATIONS = ['Gewächshaus links', 'Gewächshaus rechts', 'Fensterbank Süd', 'Fensterbank West',
+             'Anzuchtregal', 'Frühbeet', 'Balkon', 'Wintergarten']
+SUBSTRATES = ['Mineralisch', 'Rein mineralisch', 'Mineralisch mit etwas Humus', 'Bims/Lava', 'Mineralisch (Aussaat)']
+ACTION_TYPES = ['water', 'water', 'water', 'fertilize', 'repot']
+ENTRY_TYPES = ['general', 'watering', 'fertilizing', 'repotting']
+
+CHUNK_SIZE = 20_000
+
+
+def use_database(path):
+    """Setzt die Datenbank für den anschließenden Import von app.py"""
+    os.environ['KAKTUS_DATABASE_URI'] = 'sqlite:///' + os.path.abspath(path)
+
+
+def _insert_chunked(db, model, rows):
+    """Fügt Zeilen blockweise per executemany ein"""
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            db.session.execute(model.__table__.insert(), chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(model.__table__.insert(), chunk)
+        count += len(chunk)
+    db.session.commit()
+    return count
+
+
+def generate_data(plants, sowings, actions_per_plant, diary_per_plant, checklist_per_plant,
+                  extra_species=0, seed=42, years=3, progress=print):
+    """Füllt die (leere) Datenbank mit synthetischen Daten und liefert die Zeilenzahlen"""
+    from app import (app, db, init_db, rebuild_germination_stats, backfill_species_care, next_due_date,
+                     Species, Sowing, Plant, DiaryEntry, PlantAction, CareChecklistItem, ChecklistTemplate)
+
+    rng = random.Random(seed)
+    today = date.today()
+    start = today - timedelta(days=365 * years)
+    now = datetime.utcnow()
+    counts = {}
+
+    def random_date(after=start):
+        offset = (today - after).days
+        return after + timedelta(days=rng.randint(0, max(offset, 0)))
+
+    init_db()
+    with app.app_context():
+        if Plant.query.first() is not None:
+            raise SystemExit('❌ Datenbank enthält bereits Pflanzen - bitte eine leere Datei verwenden')
+
+        # Zusätzliche Arten
+        counts['species'] = _insert_chunked(db, Species, ({
+            'name': f'Testart {i:05d}',
+            'substrate': rng.choice(SUBSTRATES),
+            'temperature': '18-28°C',
+            'germination_time': rng.choice(['3-14 Tage', '1-3 Wochen', '2-4 Wochen', 'Wochen-Monate']),
+            'care_notes': 'Synthetische Art für Benchmarks',
+            'temperature_min': rng.randint(5, 20),
+            'temperature_max': rng.randint(25, 35),
+            'watering_summer': rng.choice(['Mäßig, alle 2 Wochen', 'Sparsam', 'Reichlich', 'Minimal']),
+            'watering_winter': rng.choice(['Trocken', 'Absolut trocken', 'Sehr sparsam']),
+            'light_requirements': 'Hell',
+            'special_care': '',
+            'user_created': True,
+            'created_at': now,
+            'updated_at': now
+        } for i in range(extra_species)))
+        # Massen-Insert am ORM vorbei: Gießintervalle, Keimfenster und Schwellwerte nachziehen
+        backfill_species_care(db.session.connection())
+        db.session.commit()
+        species_ids = [row[0] for row in db.session.execute(db.select(Species.id))]
+        progress(f'   Arten: {len(species_ids)}')
+
+        # Aussaaten
+        def sowing_rows():
+            for i in range(sowings):
+                sowing_date = random_date()
+                germinated = rng.random() < 0.6 and (today - sowing_date).days > 7
+                seed_count = rng.randint(5, 100)
+                germination_date = sowing_date + timedelta(days=rng.randint(3, 60)) if germinated else None
+                if germination_date and germination_date > today:
+                    germination_date = today
+                yield {
+                    'species_id': rng.choice(species_ids),
+                    'sowing_date': sowing_date,
+                    'seed_count': seed_count,
+                    'pot_number': f'T{i:06d}',
+                    'germinated': germinated,
+                    'germination_date': germination_date,
+                    'germinated_count': rng.randint(0, seed_count) if germinated else 0,
+                    'notes': '',
+                    'created_at': now
+                }
+        counts['sowings'] = _insert_chunked(db, Sowing, sowing_rows())
+        # Massen-Insert am ORM vorbei: Keimungs-Statistik einmal komplett aufbauen
+        rebuild_germination_stats(db.session.connection())
+        db.session.commit()
+        progress(f'   Aussaaten: {counts["sowings"]}')
+
+        # Pflanzen
+        def plant_rows():
+            for i in range(plants):
+                purchase_date = random_date()
+                yield {
+                    'species_id': rng.choice(species_ids),
+                    'purchase_date': purchase_date,
+                    'location': rng.choice(LOCATIONS),
+                    'substrate': rng.choice(SUBSTRATES),
+                    'notes': '',
+                    'last_watered': random_date(purchase_date) if rng.random() < 0.9 else None,
+                    'last_fertilized': random_date(purchase_date) if rng.random() < 0.6 else None,
+                    'from_sowing': False,
+                    'created_at': now
+                }
+        counts['plants'] = _insert_chunked(db, Plant, plant_rows())
+        plant_rows_db = db.session.execute(db.select(Plant.id, Plant.species_id, Plant.purchase_date)).all()
+        progress(f'   Pflanzen: {counts["plants"]}')
+
+        # Pflegeaktionen
+        def action_rows():
+            for plant_id, _, purchase_date in plant_rows_db:
+                for _ in range(actions_per_plant):
+                    yield {
+                        'plant_id': plant_id,
+                        'action_type': rng.choice(ACTION_TYPES),
+                        'action_date': random_date(purchase_date),
+                        'notes': '',
+                        'created_at': now
+                    }
+        counts['plant_actions'] = _insert_chunked(db, PlantAction, action_rows())
+        progress(f'   Pflegeaktionen: {counts["plant_actions"]}')
+
+        # Tagebuch
+        def diary_rows():
+            for _, species_id, purchase_date in plant_rows_db:
+                for _ in range(diary_per_plant):
+                    yield {
+                        'date': random_date(purchase_date),
+                        'species_id': species_id if rng.random() < 0.8 else None,
+                        'note': 'Synthetischer Eintrag',
+                        'entry_type': rng.choice(ENTRY_TYPES),
+                        'created_at': now
+                    }
+        counts['diary_entries'] = _insert_chunked(db, DiaryEntry, diary_rows())
+        progress(f'   Tagebucheinträge: {counts["diary_entries"]}')
+
+        # Checklisten: Standard-Aufgaben kommen aus Vorlagen, gespeichert werden nur Häkchen
+        templates = db.session.execute(db.select(ChecklistTemplate.id, ChecklistTemplate.task, ChecklistTemplate.frequency)
+                                       .where(ChecklistTemplate.species_id.is_(None))
+                                       .order_by(ChecklistTemplate.sort_order)).all()
+
+        def checklist_rows():
+            for plant_id, _, _ in plant_rows_db:
+                for template_id, task, frequency in templates[:checklist_per_plant]:
+                    if rng.random() < 0.3:
+                        completed_date = today - timedelta(days=rng.randint(0, 40))
+                        yield {
+                            'plant_id': plant_id,
+                            'template_id': template_id,
+                            'task': task,
+                            'frequency': frequency,
+                            'completed': True,
+                            'completed_date': completed_date,
+                            'next_due': next_due_date(frequency, completed_date),
+                            'hidden': False,
+                            'created_at': now
+                        }
+        counts['checklist_items'] = _insert_chunked(db, CareChecklistItem, checklist_rows())
+        progress(f'   Checklisten-Einträge: {counts["checklist_items"]}')
+
+    return counts
+
+
+def add_arguments(parser):
+    """Gemeinsame Optionen für datagen, benchmark und loadtest"""
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k', help='Voreinstellung für die Datenmenge')
+    parser.add_argument('--plants', type=int, help='Anzahl Pflanzen (überschreibt --scale)')
+    parser.add_argument('--sowings', type=int, help='Anzahl Aussaaten')
+    parser.add_argument('--actions-per-plant', type=int, help='Pflegeaktionen pro Pflanze')
+    parser.add_argument('--diary-per-plant', type=int, help='Tagebucheinträge pro Pflanze')
+    parser.add_argument('--checklist-per-plant', type=int, help='Standard-Aufgaben pro Pflanze, von denen ein Teil abgehakt ist (max. 6)')
+    parser.add_argument('--extra-species', type=int, help='Zusätzliche synthetische Arten')
+    parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+
+def scale_from_args(args):
+    config = dict(SCALES[args.scale])
+    for key in config:
+        value = getattr(args, key, None)
+        if value is not None:
+            config[key] = value
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetische Testdaten erzeugen')
+    add_arguments(parser)
+    parser.add_argument('--db', required=True, help='Ziel-Datenbankdatei (darf noch keine Pflanzen enthalten)')
+    args = parser.parse_args()
+
+    config = scale_from_args(args)
+    use_database(args.db)
+    print(f'🌱 Erzeuge Testdaten ({config}) in {args.db} ...')
+    counts = generate_data(seed=args.seed, **config)
+    print(f'✅ Fertig: {counts}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
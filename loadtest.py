@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Lasttest: simuliert mehrere Geräte gleichzeitig im Gewächshaus
+
+Jeder virtuelle Nutzer läuft in einem eigenen Thread gegen einen laufenden
+Server und spielt eine Rolle nach:
+
+    gaertner   gießt Pflanzen (POST /api/plants/<id>/action) und lädt den Bestand
+    tagebuch   blättert durch Tagebuch und Bestand
+    dashboard  Tablet, das regelmäßig /api/dashboard-stats abruft
+
+Am Ende stehen Durchsatz, Latenz-Perzentile pro Aktion sowie SQLite-Lock-Fehler.
+
+    KAKTUS_DATABASE_URI=sqlite:////tmp/bench_10k.db python app.py    # Server (zweites Terminal)
+    python loadtest.py --users gaertner=3,tagebuch=2,dashboard=1 --duration 60
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import date, datetime
+
+from benchmark import percentile
+
+# Aktionen je Rolle: (Gewicht, Aktion)
+ROLES = {
+    'gaertner': [(7, 'water'), (3, 'plants')],
+    'tagebuch': [(6, 'diary'), (4, 'plants')],
+    'dashboard': [(1, 'dashboard')],
+}
+
+# Wartezeit zwischen zwei Aktionen einer Rolle in Sekunden (min, max)
+THINK_TIME = {
+    'gaertner': (0.2, 1.0),
+    'tagebuch': (0.5, 2.0),
+    'dashboard': (5.0, 10.0),
+}
+
+LOCK_MARKERS = ('database is locked', 'database is busy', 'sqlite_busy')
+
+
+class Results:
+    """Sammelt Messwerte aller Threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+
+    def record(self, action, elapsed_ms, error=None):
+        with self.lock:
+            if error is None:
+                self.latencies[action].append(elapsed_ms)
+            else:
+                self.errors[action][error] += 1
+
+
+def request(base_url, method, path, payload=None, timeout=30):
+    """Führt einen Request aus und liefert (Status, Body)"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'} if data else {})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def classify_error(status, body):
+    """Ordnet einen Fehler ein: lock, server, client"""
+    text = body.decode('utf-8', 'replace').lower()
+    if status == 503 or any(marker in text for marker in LOCK_MARKERS):
+        return 'lock'
+    if status >= 500:
+        return 'server'
+    return 'client'
+
+
+def run_action(base_url, action, plant_ids, rng):
+    if action == 'water':
+        plant_id = rng.choice(plant_ids)
+        return request(base_url, 'POST', f'/api/plants/{plant_id}/action',
+                       {'action_type': 'water', 'date': date.today().isoformat(), 'notes': 'Lasttest'})
+    if action == 'plants':
+        return request(base_url, 'GET', '/api/plants')
+    if action == 'diary':
+        return request(base_url, 'GET', '/api/diary')
+    if action == 'dashboard':
+        return request(base_url, 'GET', '/api/dashboard-stats')
+    raise ValueError(action)
+
+
+def virtual_user(role, base_url, plant_ids, deadline, results, seed, think_scale):
+    rng = random.Random(seed)
+    actions = [action for weight, action in ROLES[role] for _ in range(weight)]
+    low, high = THINK_TIME[role]
+    while time.monotonic() < deadline:
+        action = rng.choice(actions)
+        start = time.perf_counter()
+        try:
+            status, body = run_action(base_url, action, plant_ids, rng)
+        except OSError as e:
+            results.record(action, 0, f'verbindung: {type(e).__name__}')
+        else:
+            elapsed = (time.perf_counter() - start) * 1000
+            results.record(action, elapsed, None if status < 400 else classify_error(status, body))
+        time.sleep(rng.uniform(low, high) * think_scale)
+
+
+def parse_users(value):
+    users = {}
+    for part in value.split(','):
+        role, _, count = part.partition('=')
+        if role not in ROLES:
+            raise argparse.ArgumentTypeError(f'Unbekannte Rolle: {role} (verfügbar: {", ".join(ROLES)})')
+        users[role] = int(count or 1)
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gleichzeitige Nutzer gegen einen laufenden Server simulieren')
+    parser.add_argument('--url', default='http://localhost:5000', help='Basis-URL des Servers')
+    parser.add_argument('--users', type=parse_users, default=parse_users('gaertner=2,tagebuch=2,dashboard=1'),
+                        help='Nutzer je Rolle, z.B. gaertner=3,tagebuch=2,dashboard=1')
+    parser.add_argument('--duration', type=float, default=30, help='Dauer in Sekunden')
+    parser.add_argument('--think-scale', type=float, default=1.0,
+                        help='Faktor für die Wartezeit zwischen Aktionen (0 = Dauerfeuer)')
+    parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+    parser.add_argument('--output', help='Ergebnis zusätzlich als JSON speichern')
+    args = parser.parse_args()
+
+    status, body = request(args.url, 'GET', '/api/plants')
+    if status != 200:
+        print(f'❌ Server unter {args.url} antwortet nicht korrekt ({status})')
+        return 1
+    plant_ids = [p['id'] for p in json.loads(body)]
+    if not plant_ids:
+        print('❌ Keine Pflanzen vorhanden - bitte Testdaten mit datagen.py erzeugen')
+        return 1
+
+    total_users = sum(args.users.values())
+    print(f'🚀 {total_users} Nutzer ({args.users}) für {args.duration:.0f} s gegen {args.url} ...')
+
+    results = Results()
+    deadline = time.monotonic() + args.duration
+    threads = []
+    seed = args.seed
+    for role, count in args.users.items():
+        for _ in range(count):
+            seed += 1
+            thread = threading.Thread(target=virtual_user, daemon=True,
+                                      args=(role, args.url, plant_ids, deadline, results, seed, args.think_scale))
+            threads.append(thread)
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    report = {'meta': {'timestamp': datetime.now().isoformat(), 'url': args.url, 'users': args.users,
+                       'duration_s': round(wall, 2)},
+              'actions': {}}
+    total_ok = 0
+    total_errors = defaultdict(int)
+    print(f'\n{"Aktion":<12} {"OK":>7} {"Fehler":>7} {"req/s":>7} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    for action in sorted(set(results.latencies) | set(results.errors)):
+        latencies = results.latencies.get(action, [])
+        errors = dict(results.errors.get(action, {}))
+        for kind, count in errors.items():
+            total_errors[kind] += count
+        total_ok += len(latencies)
+        entry = {
+            'ok': len(latencies),
+            'errors': errors,
+            'throughput_rps': round(len(latencies) / wall, 2),
+            'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 99), 2) if latencies else None
+        }
+        report['actions'][action] = entry
+        print(f'{action:<12} {entry["ok"]:>7} {sum(errors.values()):>7} {entry["throughput_rps"]:>7.1f} '
+              f'{entry["p50_ms"] or 0:>9.1f} {entry["p95_ms"] or 0:>9.1f} {entry["p99_ms"] or 0:>9.1f}')
+
+    report['total'] = {'ok': total_ok, 'errors': dict(total_errors),
+                       'throughput_rps': round(total_ok / wall, 2)}
+    print(f'\nGesamt: {total_ok} erfolgreiche Requests, {total_ok / wall:.1f} req/s')
+    print(f'SQLite-Lock/Busy-Fehler: {total_errors.get("lock", 0)}')
+    other = {kind: count for kind, count in total_errors.items() if kind != 'lock'}
+    if other:
+        print(f'Sonstige Fehler: {other}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f'💾 Ergebnis gespeichert: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sensor-Simulator: schickt Temperatur- und Luftfeuchtewerte an /api/telemetry
+
+Pro Standort aus datagen.py laufen ein oder mehrere virtuelle Sensoren mit
+Tagesgang (mittags warm und trocken, nachts kühl und feucht) plus Rauschen.
+Die Werte werden gesammelt und gebündelt gesendet wie von einem echten
+Gateway. Mit --backfill-hours werden vorab vergangene Stunden nachgeliefert,
+damit Stunden- und Tagesaggregate sofort Daten haben.
+
+    python app.py                                                    # Server (zweites Terminal)
+    python sensor_simulator.py --interval 10 --batch 30 --duration 300
+    python sensor_simulator.py --backfill-hours 72 --duration 0      # nur Verlauf erzeugen
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from datagen import LOCATIONS
+from loadtest import request
+
+# Grundklima je Standort: (Mitteltemperatur °C, Tagesschwankung °C, mittlere Luftfeuchte %)
+CLIMATE = {
+    'Gewächshaus links': (24, 8, 45),
+    'Gewächshaus rechts': (25, 9, 40),
+    'Fensterbank Süd': (22, 5, 35),
+    'Fensterbank West': (21, 4, 40),
+    'Anzuchtregal': (26, 2, 75),
+    'Frühbeet': (18, 10, 60),
+    'Balkon': (16, 9, 60),
+    'Wintergarten': (20, 6, 50),
+}
+
+
+class VirtualSensor:
+    """Ein Sensor mit eigenem Versatz und Zufallsdrift"""
+
+    def __init__(self, name, location, rng):
+        self.name = name
+        self.location = location
+        self.rng = rng
+        mean, swing, humidity = CLIMATE.get(location, (20, 5, 50))
+        self.mean = mean + rng.uniform(-1, 1)
+        self.swing = swing
+        self.humidity = humidity
+        self.drift = 0.0
+
+    def read(self, ts):
+        # Tagesgang mit Maximum gegen 15 Uhr (UTC reicht für die Simulation)
+        phase = math.sin((ts % 86400) / 86400 * 2 * math.pi - 2 * math.pi * 9 / 24)
+        self.drift = max(-2.0, min(2.0, self.drift + self.rng.gauss(0, 0.05)))
+        temperature = self.mean + self.swing / 2 * phase + self.drift + self.rng.gauss(0, 0.2)
+        humidity = self.humidity - 15 * phase - 2 * self.drift + self.rng.gauss(0, 1.5)
+        return {'sensor': self.name, 'location': self.location, 'ts': int(ts),
+                'temperature': round(temperature, 2), 'humidity': round(max(5.0, min(99.0, humidity)), 1)}
+
+
+def send(base_url, readings, stats):
+    status, body = request(base_url, 'POST', '/api/telemetry', {'readings': readings})
+    if status != 202:
+        stats['failed'] += len(readings)
+        print(f'⚠️  {status}: {body.decode("utf-8", "replace")[:200]}')
+        return
+    result = json.loads(body)
+    stats['accepted'] += result['accepted']
+    stats['rejected'] += len(result['rejected'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Temperatur- und Feuchtesensoren gegen einen laufenden Server simulieren')
+    parser.add_argument('--url', default='http://localhost:5000', help='Basis-URL des Servers')
+    parser.add_argument('--sensors', type=int, default=1, help='Sensoren pro Standort')
+    parser.add_argument('--interval', type=float, default=10, help='Messintervall in Sekunden')
+    parser.add_argument('--batch', type=int, default=30, help='Messungen pro Sensor, die gesammelt gesendet werden')
+    parser.add_argument('--duration', type=float, default=60, help='Dauer des Live-Betriebs in Sekunden (0 = keiner)')
+    parser.add_argument('--backfill-hours', type=float, default=0, help='Vergangene Stunden vorab nachliefern')
+    parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sensors = [VirtualSensor(f'sim-{index + 1:02d}-{number + 1}', location, rng)
+               for index, location in enumerate(LOCATIONS) for number in range(args.sensors)]
+    stats = {'accepted': 0, 'rejected': 0, 'failed': 0}
+    chunk = args.batch * len(sensors)
+    started = time.perf_counter()
+
+    if args.backfill_hours > 0:
+        now = int(time.time())
+        steps = int(args.backfill_hours * 3600 / args.interval)
+        print(f'⏪ {steps * len(sensors)} Messwerte für die letzten {args.backfill_hours:g} h ...')
+        pending = []
+        for step in range(steps, 0, -1):
+            ts = now - step * args.interval
+            pending.extend(sensor.read(ts) for sensor in sensors)
+            if len(pending) >= chunk:
+                send(args.url, pending, stats)
+                pending = []
+        if pending:
+            send(args.url, pending, stats)
+
+    if args.duration > 0:
+        print(f'📡 {len(sensors)} Sensoren, alle {args.interval:g} s, Versand alle {args.batch} Messungen ...')
+        deadline = time.monotonic() + args.duration
+        pending = []
+        try:
+            while time.monotonic() < deadline:
+                pending.extend(sensor.read(time.time()) for sensor in sensors)
+                if len(pending) >= chunk:
+                    send(args.url, pending, stats)
+                    pending = []
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+        if pending:
+            send(args.url, pending, stats)
+
+    wall = time.perf_counter() - started
+    print(f'\nAngenommen: {stats["accepted"]}, abgelehnt: {stats["rejected"]}, nicht zugestellt: {stats["failed"]} '
+          f'({stats["accepted"] / wall:.0f} Werte/s)')
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
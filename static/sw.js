@@ -0,0 +1,47 @@
+// Service Worker: App-Shell (Seite + React/Babel) offline verfügbar machen
+// Die Daten selbst liegen im IndexedDB-Spiegel der Seite, /api/* geht immer ans Netz.
+
+const SHELL_CACHE = 'kaktus-shell-v1';
+const SHELL_FILES = [
+    '/',
+    'https://unpkg.com/react@18/umd/react.development.js',
+    'https://unpkg.com/react-dom@18/umd/react-dom.development.js',
+    'https://unpkg.com/@babel/standalone/babel.min.js'
+];
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(SHELL_FILES))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Alte Shell-Versionen entfernen
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== SHELL_CACHE).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.pathname.startsWith('/api/')) {
+        return;
+    }
+
+    // Netz zuerst, damit Updates sofort ankommen; ohne Verbindung aus dem Cache
+    event.respondWith(
+        fetch(event.request)
+            .then(response => {
+                if (response.ok) {
+                    const copy = response.clone();
+                    caches.open(SHELL_CACHE).then(cache => cache.put(event.request, copy));
+                }
+                return response;
+            })
+            .catch(() => caches.match(event.request).then(cached => cached || caches.match('/')))
+    );
+});
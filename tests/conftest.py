@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Gemeinsame Fixtures: jede Test-Funktion bekommt eine frische SQLite-Datenbank"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Vor dem Import von app.py setzen - die Datenbank-URI wird beim Import gelesen
+DB_DIR = tempfile.mkdtemp(prefix='kaktus-tests-')
+DB_PATH = os.path.join(DB_DIR, 'test.db')
+os.environ['KAKTUS_DATABASE_URI'] = 'sqlite:///' + DB_PATH
+
+import app as kaktus  # noqa: E402
+
+
+def _remove_database():
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App mit leerer, frisch initialisierter Datenbank (alle Standard-Arten geladen)"""
+    monkeypatch.chdir(tmp_path)
+    kaktus.app.config.update(TESTING=True, BACKUP_DIR=str(tmp_path / 'backups'), JOB_DIR=str(tmp_path / 'jobs'))
+    with kaktus.app.app_context():
+        kaktus.db.session.remove()
+        kaktus.db.engine.dispose()
+    _remove_database()
+    for caches in kaktus._cache_registry.values():
+        for cache in caches:
+            cache.clear()
+    kaktus.init_db()
+    yield kaktus.app
+    with kaktus.app.app_context():
+        kaktus.db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db(app):
+    """Session in einem App-Kontext, für direkte Prüfungen in der Datenbank"""
+    with app.app_context():
+        yield kaktus.db
+        kaktus.db.session.rollback()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Gießanalyse: Intervalle und Abweichung vom Gießhinweis der Art"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+
+def water_plant(client, species_id, dates):
+    plant_id = client.post('/api/plants', json={'species': species_id, 'purchase_date': '2024-01-01',
+                                                'location': 'Balkon', 'substrate': 'Bims'}).get_json()['id']
+    for date in dates:
+        client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water', 'date': date})
+    return plant_id
+
+
+def species_result(client, species_id):
+    results = client.get('/api/analytics/watering').get_json()['results']
+    return next(r for r in results if r['species_id'] == species_id)
+
+
+def test_drift_against_interval_guidance(client):
+    species_id = client.post('/api/species', json={'name': 'Testus intervallus',
+                                                   'watering_summer': 'Mäßig, alle 2 Wochen'}).get_json()['id']
+    water_plant(client, species_id, ['2024-06-01', '2024-06-11', '2024-06-21'])
+
+    summer = species_result(client, species_id)['summer']
+    assert summer['median_days'] == 10
+    assert summer['guidance_days'] == 14
+    assert summer['drift_days'] == -4
+    assert 'waterings_against_guidance' not in summer
+
+
+def test_keep_dry_guidance_counts_waterings(client):
+    species_id = client.post('/api/species', json={'name': 'Testus siccus',
+                                                   'watering_winter': 'Trocken halten'}).get_json()['id']
+    water_plant(client, species_id, ['2024-12-01', '2024-12-15', '2024-12-22'])
+
+    winter = species_result(client, species_id)['winter']
+    assert winter['guidance_days'] == 0
+    assert winter['drift_days'] is None
+    assert winter['waterings_against_guidance'] == 2
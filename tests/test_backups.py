@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Backups: Dateiname und Zielordner"""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+
+import app as kaktus
+from test_jobs import wait_for_job
+
+
+def test_backup_with_label_lands_in_backup_dir(app, client):
+    response = client.post('/api/backups', json={'label': 'vor_umtopfen-2024'})
+    assert response.status_code == 202
+    job = wait_for_job(client, response.get_json()['id'])
+    assert job['status'] == 'done'
+    assert job['result']['file'].startswith('kaktus_')
+    assert os.path.exists(os.path.join(app.config['BACKUP_DIR'], job['result']['file']))
+
+
+@pytest.mark.parametrize('label', ['../../escaped', 'a/b', '', 'x' * 41, 'mit leerzeichen', 42])
+def test_invalid_labels_are_rejected(app, client, label):
+    assert client.post('/api/backups', json={'label': label}).status_code == 400
+    assert client.post('/api/jobs', json={'kind': 'backup', 'params': {'label': label}}).status_code == 400
+    with pytest.raises(ValueError):
+        with app.app_context():
+            kaktus.create_backup(label=label)
+    assert not os.path.exists(os.path.join(app.config['BACKUP_DIR'], '..', '..', 'escaped.db.partial'))
+
+
+def test_cli_rejects_invalid_label(app):
+    result = CliRunner().invoke(kaktus.backup_command, ['--label', '../escaped'], obj=kaktus.app)
+    assert result.exit_code != 0
+    assert 'label' in result.output
+
+
+def test_backup_job_finishes_while_progress_is_written(app, client, monkeypatch):
+    # Jede Fortschrittsmeldung ist ein Schreibzugriff; bei schrittweiser Kopie begann die Kopie danach von vorn
+    monkeypatch.setitem(app.config, 'BACKUP_PAGES_PER_STEP', 1)
+    monkeypatch.setitem(app.config, 'BACKUP_STEP_PAUSE', 0)
+    job = wait_for_job(client, client.post('/api/backups', json={}).get_json()['id'])
+    assert job['status'] == 'done'
+
+
+def test_simultaneous_backup_jobs_all_finish(client):
+    ids = [client.post('/api/backups', json={}).get_json()['id'] for _ in range(3)]
+    assert [wait_for_job(client, job_id)['status'] for job_id in ids] == ['done'] * 3
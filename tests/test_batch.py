@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Offline-Sync über /api/batch: Savepoint je Änderung und einmalige Buchung pro Gerät"""
+
+
+def create_plant(client):
+    return client.post('/api/plants', json={'species': 1, 'purchase_date': '2024-04-01',
+                                            'location': 'Balkon', 'substrate': 'Bims'}).get_json()['id']
+
+
+def send(client, mutations, client_id='tablet'):
+    response = client.post('/api/batch', json={'client_id': client_id, 'mutations': mutations})
+    assert response.status_code == 200
+    return {r['id']: r for r in response.get_json()['results']}
+
+
+def action_count(client, plant_id):
+    return len(client.get(f'/api/plants/{plant_id}/actions').get_json())
+
+
+def test_failed_mutation_only_discards_itself(client):
+    plant_id = create_plant(client)
+    results = send(client, [
+        {'id': 'a', 'kind': 'plant_action', 'data': {'plant_id': plant_id, 'action_type': 'water'}},
+        {'id': 'b', 'kind': 'plant_action', 'data': {'plant_id': 999999, 'action_type': 'water'}},
+        {'id': 'c', 'kind': 'create_diary_entry', 'data': {'date': '2024-05-01'}},
+        {'id': 'd', 'kind': 'plant_action', 'data': {'plant_id': plant_id, 'action_type': 'fertilize'}},
+    ])
+
+    assert [results[key]['status'] for key in 'abcd'] == ['applied', 'error', 'error', 'applied']
+    assert results['b']['error'] == 'Pflanze nicht gefunden'
+    assert action_count(client, plant_id) == 2
+
+
+def test_resent_mutations_are_applied_once_per_client(client):
+    plant_id = create_plant(client)
+    mutation = {'id': 'm1', 'kind': 'plant_action', 'data': {'plant_id': plant_id, 'action_type': 'water'}}
+    first = send(client, [mutation])['m1']
+
+    again = send(client, [mutation])['m1']
+    assert again['status'] == 'duplicate'
+    assert again['previous_status'] == 'applied'
+    assert again['result']['action_id'] == first['result']['action_id']
+    assert action_count(client, plant_id) == 1
+
+    # Dieselbe ID von einem anderen Gerät ist eine eigene Änderung
+    assert send(client, [mutation], client_id='handy')['m1']['status'] == 'applied'
+    assert action_count(client, plant_id) == 2
+
+
+def test_batch_requires_client_id(client):
+    response = client.post('/api/batch', json={'mutations': []})
+    assert response.status_code == 400
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Benchmark-Fälle: jede Route wird gemessen oder bewusst ausgelassen"""
+
+import benchmark
+import datagen
+from test_jobs import wait_for_job
+
+
+def test_event_stream_is_not_benchmarked(app):
+    cases, uncovered = benchmark.build_cases(app)
+    assert '/api/events' not in {rule for _, _, rule, _ in cases}
+    assert not any('/api/events' in route for route in uncovered)
+
+
+def test_explicit_cases_succeed(app, client):
+    datagen.generate_data(plants=20, sowings=10, actions_per_plant=2, diary_per_plant=1, checklist_per_plant=2,
+                          progress=lambda *args: None)
+    context = benchmark.BenchContext(client, seed=1)
+    for name, method, rule, prepare in benchmark.CASES:
+        url, payload = prepare(context)
+        response = client.open(url, method=method, json=payload)
+        assert response.status_code < 400, (name, response.get_json())
+
+    # Gestartete Jobs (Backup, Archiv) vor dem Aufräumen der Testdatenbank abwarten
+    for job in client.get('/api/jobs').get_json():
+        assert wait_for_job(client, job['id'])['status'] == 'done'
+
+
+def test_only_the_job_download_is_left_uncovered(app):
+    _, uncovered = benchmark.build_cases(app)
+    assert uncovered == ['GET /api/jobs/<job_id>/download']
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Tagescache der berechneten Ansichten (cached_view)"""
+
+import app as kaktus
+
+
+def test_successful_view_is_cached(client):
+    assert client.get('/api/care-schedule').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/care-schedule').headers['X-Cache'] == 'HIT'
+
+
+def test_error_responses_are_not_cached(client):
+    first = client.get('/api/sowings/monitor?status=unbekannt')
+    second = client.get('/api/sowings/monitor?status=unbekannt')
+    assert first.status_code == second.status_code == 400
+    assert first.headers['X-Cache'] == second.headers['X-Cache'] == 'MISS'
+
+
+def test_write_invalidates_view(client):
+    client.get('/api/care-alerts')
+    assert client.get('/api/care-alerts').headers['X-Cache'] == 'HIT'
+    client.post('/api/plants', json={'species': 1, 'purchase_date': '2024-05-01',
+                                     'location': 'Balkon', 'substrate': 'Mineralisch'})
+    assert client.get('/api/care-alerts').headers['X-Cache'] == 'MISS'
+
+
+def test_due_checklist_is_cached_until_an_item_is_completed(client):
+    plant_id = client.post('/api/plants', json={'species': 1, 'purchase_date': '2024-05-01',
+                                                'location': 'Balkon', 'substrate': 'Mineralisch'}).get_json()['id']
+    first = client.get('/api/checklist/due?frequency=daily')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert client.get('/api/checklist/due?frequency=daily').headers['X-Cache'] == 'HIT'
+
+    item = first.get_json()['items'][0]
+    client.post(f'/api/plants/{plant_id}/checklist', json={'item_id': item['id'], 'completed': True})
+    after = client.get('/api/checklist/due?frequency=daily')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.get_json()['total'] == first.get_json()['total'] - 1
+
+
+def test_moving_a_sensor_invalidates_care_alerts(client, monkeypatch):
+    monkeypatch.setattr(kaktus, 'telemetry_buffer', kaktus.TelemetryBuffer())
+    reading = {'sensor': 'gh-1', 'ts': 1714564800, 'temperature': 21.5}
+    client.post('/api/telemetry', json={'readings': [{**reading, 'location': 'Balkon'}]})
+    client.get('/api/care-alerts')
+    assert client.get('/api/care-alerts').headers['X-Cache'] == 'HIT'
+
+    # Neue Messwerte allein verwerfen die Ansicht nicht, ein neuer Standort schon
+    client.post('/api/telemetry', json={'readings': [{**reading, 'ts': 1714564860}]})
+    assert client.get('/api/care-alerts').headers['X-Cache'] == 'HIT'
+    client.post('/api/telemetry', json={'readings': [{**reading, 'ts': 1714564920, 'location': 'Frühbeet'}]})
+    assert client.get('/api/care-alerts').headers['X-Cache'] == 'MISS'
+
+
+def test_unknown_species_does_not_reload_the_cache(app, monkeypatch):
+    loads = []
+    get_species_payload = kaktus.get_species_payload
+    monkeypatch.setattr(kaktus, 'get_species_payload', lambda: loads.append(1) or get_species_payload())
+
+    with app.app_context():
+        assert kaktus.species_name(1)
+        assert kaktus.species_name(999999) is None
+        assert kaktus.species_name(999999) is None
+        assert len(loads) == 1
+
+    # Eine neue Art aus einem anderen Prozess: hier ist nur die höhere Versionsnummer sichtbar
+    with app.app_context(), kaktus.db.engine.begin() as conn:
+        conn.execute(kaktus.text("INSERT INTO species (id, name) VALUES (999999, 'Testus remotus')"))
+        kaktus._bump_cache_versions(conn, ['species'])
+    with app.app_context():
+        assert kaktus.species_name(999999) == 'Testus remotus'
+        assert len(loads) == 2
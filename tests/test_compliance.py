@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Temperaturüberwachung: Zeit außerhalb des Bereichs der Art je Standort"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as kaktus
+
+pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def yesterday(client, monkeypatch):
+    """Unix-Zeit für Mitternacht (lokal) des Vortags - der Tag wird ausgewertet"""
+    monkeypatch.setattr(kaktus, 'telemetry_buffer', kaktus.TelemetryBuffer())
+    midnight = datetime.combine(datetime.now().date() - timedelta(days=1), datetime.min.time())
+    return int(midnight.timestamp())
+
+
+def send(client, sensor, start, temperatures, step=600):
+    readings = [{'sensor': sensor, 'location': 'Frühbeet', 'ts': start + i * step, 'temperature': t}
+                for i, t in enumerate(temperatures)]
+    assert client.post('/api/telemetry', json={'readings': readings}).status_code == 202
+
+
+def test_hours_below_minimum_raise_an_alert(client, yesterday):
+    species_id = client.post('/api/species', json={'name': 'Testus frigidus', 'temperature_min': 10,
+                                                   'temperature_max': 30}).get_json()['id']
+    plant_id = client.post('/api/plants', json={'species': species_id, 'purchase_date': '2024-04-01',
+                                                'location': 'Frühbeet', 'substrate': 'Bims'}).get_json()['id']
+    # 2 Stunden bei 5°C, danach 1 Stunde bei 15°C; zweiter Sensor bleibt im Bereich
+    send(client, 'fb-1', yesterday, [5.0] * 12 + [15.0] * 6)
+    send(client, 'fb-2', yesterday, [15.0] * 18)
+
+    result = client.get('/api/telemetry/compliance?location=Frühbeet').get_json()
+    [entry] = [e for e in result['results'] if e['species_id'] == species_id]
+    assert entry['below_hours'] == 2.0
+    assert entry['above_hours'] == 0
+    assert entry['coldest'] == 5.0
+    assert entry['plant_ids'] == [plant_id]
+    assert result['locations']['Frühbeet']['sensors'] == 2
+
+    alerts = [a for a in client.get('/api/care-alerts').get_json() if a.get('type') == 'temperature']
+    assert [(a['species'], a['priority']) for a in alerts] == [('Testus frigidus', 'medium')]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Debug-Ausgaben sind ohne KAKTUS_DEBUG / KAKTUS_SQL_DEBUG aus"""
+
+import app as kaktus
+
+
+def test_sql_headers_off_by_default(client):
+    response = client.get('/api/species')
+    assert response.status_code == 200
+    assert 'X-SQL-Queries' not in response.headers
+
+
+def test_debug_sql_route_disabled_by_default(client):
+    assert client.get('/api/debug/sql').status_code == 404
+
+
+def test_sql_debug_flag_enables_report(client, monkeypatch):
+    monkeypatch.setitem(kaktus.app.config, 'SQL_DEBUG', True)
+    response = client.get('/api/species')
+    assert 'X-SQL-Queries' in response.headers
+    assert client.get('/api/debug/sql').status_code == 200
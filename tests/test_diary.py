@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Tagebuch: Zeitleiste aus Einträgen, Aktionen und Keimungen; Historie beim Löschen"""
+
+import app as kaktus
+from sqlalchemy import text
+
+
+def create_plant(client, species=1):
+    response = client.post('/api/plants', json={'species': species, 'purchase_date': '2024-04-01',
+                                                'location': 'Balkon', 'substrate': 'Bims'})
+    return response.get_json()['id']
+
+
+def create_germinated_sowing(client, species=1):
+    sowing_id = client.post('/api/sowings', json={'species': species, 'sowing_date': '2024-03-01',
+                                                  'seed_count': 20, 'pot_number': 'A1'}).get_json()['id']
+    plant_id = client.post(f'/api/sowings/{sowing_id}/auto-transfer',
+                           json={'germination_date': '2024-03-15', 'germinated_count': 12}).get_json()['plant_id']
+    return sowing_id, plant_id
+
+
+def diary(client):
+    return client.get('/api/diary').get_json()
+
+
+def test_actions_keep_their_entry_type(client):
+    plant_id = create_plant(client)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water', 'date': '2024-05-01'})
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'fertilize', 'date': '2024-05-02',
+                                                        'notes': 'Kakteendünger'})
+
+    entries = {e['entry_type']: e for e in diary(client)}
+    assert entries['water']['note'] == '💧 Gegossen: Standard'
+    assert entries['fertilize']['note'] == '🌿 Gedüngt: Kakteendünger'
+    assert entries['water']['source'] == 'action'
+
+
+def test_deleting_a_plant_keeps_its_history(client):
+    plant_id = create_plant(client)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water', 'date': '2024-05-01'})
+    before = [(e['date'], e['note'], e['entry_type'], e['species']) for e in diary(client)]
+
+    assert client.delete(f'/api/plants/{plant_id}').status_code == 200
+
+    entries = diary(client)
+    assert [(e['date'], e['note'], e['entry_type'], e['species']) for e in entries] == before
+    assert [e['source'] for e in entries] == ['diary']
+
+
+def test_deleting_sowing_or_plant_keeps_the_germination(client):
+    sowing_id, plant_id = create_germinated_sowing(client)
+    note = '🌱 Keimung: 12 von 20 Samen gekeimt. Automatisch zum Bestand hinzugefügt.'
+    assert [e['note'] for e in diary(client)] == [note]
+
+    assert client.delete(f'/api/sowings/{sowing_id}').status_code == 200
+    assert [(e['note'], e['entry_type'], e['source']) for e in diary(client)] == [(note, 'germination', 'diary')]
+
+    # Die Pflanze hat keine Aussaat mehr - nichts wird doppelt gesichert
+    client.delete(f'/api/plants/{plant_id}')
+    assert len(diary(client)) == 1
+
+
+def test_deleting_a_species_keeps_history_without_species(client):
+    species_id = client.post('/api/species', json={'name': 'Testus testus'}).get_json()['id']
+    plant_id = create_plant(client, species_id)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'repot', 'date': '2024-05-01'})
+
+    assert client.delete(f'/api/species/{species_id}').status_code == 200
+
+    entries = diary(client)
+    assert [(e['entry_type'], e['species'], e['species_name']) for e in entries] == [('repot', None, 'Allgemein')]
+
+
+def test_collapsing_duplicate_entries_runs_once(app, client):
+    plant_id = create_plant(client)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water', 'date': '2024-05-01'})
+    # Zeile, wie sie ältere Versionen zusätzlich zur Aktion geschrieben haben
+    duplicate = {'date': '2024-05-01', 'species': 1, 'note': '💧 Gegossen: Standard', 'entry_type': 'water'}
+
+    with app.app_context(), kaktus.db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migration WHERE name = 'collapse_duplicate_diary_entries'"))
+    client.post('/api/diary', json=duplicate)
+    kaktus.upgrade_database()
+    assert [e['source'] for e in diary(client)] == ['action']
+
+    # Danach bleiben gleichlautende Einträge unangetastet
+    client.post('/api/diary', json=duplicate)
+    kaktus.upgrade_database()
+    assert sorted(e['source'] for e in diary(client)) == ['action', 'diary']
+
+
+def test_timeline_is_paged_newest_first(client):
+    plant_id = create_plant(client)
+    # Gleiches Datum und gleiche IDs aus verschiedenen Quellen: die Position unterscheidet sie
+    for day in ('2024-05-01', '2024-05-01', '2024-05-02', '2024-05-03'):
+        client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water', 'date': day})
+        client.post('/api/diary', json={'date': day, 'note': 'Notiz'})
+
+    pages, before = [], None
+    while True:
+        response = client.get('/api/diary?limit=3' + (f'&before={before}' if before else ''))
+        pages.append(response.get_json())
+        before = response.headers.get('X-Next-Before')
+        if not before:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 2]
+    entries = [e for page in pages for e in page]
+    assert entries == diary(client)
+    assert len({e['id'] for e in entries}) == 8
+    assert [e['date'] for e in entries] == sorted((e['date'] for e in entries), reverse=True)
+
+
+def test_invalid_position_is_a_bad_request(client):
+    for before in ('gestern', '2024-05-01.kommentar.1', '2024-13-01.diary.1'):
+        assert client.get(f'/api/diary?before={before}').status_code == 400
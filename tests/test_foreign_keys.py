@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Löschen über Fremdschlüssel: CASCADE, SET NULL und Umbau älterer Datenbanken"""
+
+from sqlalchemy import text
+
+import app as kaktus
+from test_jobs import wait_for_job
+
+
+def create_plant(client, species=1, **extra):
+    return client.post('/api/plants', json={'species': species, 'purchase_date': '2024-04-01',
+                                            'location': 'Balkon', 'substrate': 'Bims', **extra}).get_json()['id']
+
+
+def count(app, sql):
+    with app.app_context(), kaktus.db.engine.connect() as conn:
+        return conn.scalar(text(sql))
+
+
+def test_deleting_a_plant_cascades_to_actions_and_checklist(app, client):
+    plant_id = create_plant(client)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water'})
+    client.post(f'/api/plants/{plant_id}/checklist', json={'task': 'Stacheln zählen', 'frequency': 'weekly'})
+
+    assert client.delete(f'/api/plants/{plant_id}').status_code == 200
+    assert count(app, f'SELECT COUNT(*) FROM plant_action WHERE plant_id = {plant_id}') == 0
+    assert count(app, f'SELECT COUNT(*) FROM care_checklist_item WHERE plant_id = {plant_id}') == 0
+
+
+def test_deleting_a_species_cascades_and_nulls_diary_entries(app, client):
+    species_id = client.post('/api/species', json={'name': 'Testus testus'}).get_json()['id']
+    create_plant(client, species_id)
+    client.post('/api/sowings', json={'species': species_id, 'sowing_date': '2024-03-01',
+                                      'seed_count': 10, 'pot_number': 'B2'})
+    entry_id = client.post('/api/diary', json={'date': '2024-05-01', 'species': species_id,
+                                               'note': 'Blüht'}).get_json()['id']
+
+    assert client.delete(f'/api/species/{species_id}').status_code == 200
+    assert count(app, f'SELECT COUNT(*) FROM plant WHERE species_id = {species_id}') == 0
+    assert count(app, f'SELECT COUNT(*) FROM sowing WHERE species_id = {species_id}') == 0
+    assert count(app, f'SELECT species_id IS NULL FROM diary_entry WHERE id = {entry_id}') == 1
+
+
+def test_deleting_a_sowing_keeps_its_plants(app, client):
+    sowing_id = client.post('/api/sowings', json={'species': 1, 'sowing_date': '2024-03-01',
+                                                  'seed_count': 10, 'pot_number': 'C3'}).get_json()['id']
+    plant_id = client.post(f'/api/sowings/{sowing_id}/auto-transfer',
+                           json={'germination_date': '2024-03-20', 'germinated_count': 4}).get_json()['plant_id']
+
+    assert client.delete(f'/api/sowings/{sowing_id}').status_code == 200
+    assert count(app, f'SELECT sowing_id IS NULL FROM plant WHERE id = {plant_id}') == 1
+
+
+def test_old_tables_are_rebuilt_and_orphans_removed(app, client):
+    plant_id = create_plant(client)
+    client.post(f'/api/plants/{plant_id}/action', json={'action_type': 'water'})
+
+    # Stand vor den ON-DELETE-Regeln: Fremdschlüssel ohne Aktion, dazu eine verwaiste Aktion
+    with app.app_context(), kaktus.db.engine.connect() as conn:
+        conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = OFF')
+        with conn.begin():
+            conn.execute(text('ALTER TABLE plant_action RENAME TO old_plant_action'))
+            conn.execute(text(
+                'CREATE TABLE plant_action (id INTEGER PRIMARY KEY, plant_id INTEGER NOT NULL REFERENCES plant (id), '
+                'action_type VARCHAR(50) NOT NULL, action_date DATE NOT NULL, notes TEXT, created_at DATETIME)'))
+            conn.execute(text('INSERT INTO plant_action SELECT id, plant_id, action_type, action_date, notes, created_at '
+                              'FROM old_plant_action'))
+            conn.execute(text('DROP TABLE old_plant_action'))
+            conn.execute(text("INSERT INTO plant_action (plant_id, action_type, action_date) "
+                              "VALUES (999999, 'water', '2024-05-01')"))
+        conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = ON')
+
+    kaktus.upgrade_database()
+
+    with app.app_context(), kaktus.db.engine.connect() as conn:
+        actions = {row.table: row.on_delete for row in conn.execute(text('PRAGMA foreign_key_list(plant_action)'))}
+        assert actions == {'plant': 'CASCADE'}
+        assert conn.scalar(text('SELECT COUNT(*) FROM plant_action WHERE plant_id = 999999')) == 0
+        assert conn.scalar(text(f'SELECT COUNT(*) FROM plant_action WHERE plant_id = {plant_id}')) == 1
+        # Indizes sind nach dem Umbau wieder da
+        indexes = {row.name for row in conn.execute(text('PRAGMA index_list(plant_action)'))}
+        assert 'ix_plant_action_plant_date' in indexes
+
+
+def test_purge_orphans_job(app, client):
+    with app.app_context(), kaktus.db.engine.connect() as conn:
+        conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = OFF')
+        with conn.begin():
+            conn.execute(text("INSERT INTO plant (species_id, purchase_date, location, substrate) "
+                              "VALUES (999999, '2024-04-01', 'Balkon', 'Bims')"))
+        conn.connection.dbapi_connection.execute('PRAGMA foreign_keys = ON')
+
+    response = client.post('/api/jobs', json={'kind': 'purge_orphans'})
+    job = wait_for_job(client, response.get_json()['id'])
+    assert job['status'] == 'done'
+    assert job['result']['removed'] == {'plant': 1}
+
+
+def test_unknown_species_is_a_bad_request(app, client):
+    sowing = {'species': 999999, 'sowing_date': '2024-03-01', 'seed_count': 10, 'pot_number': 'D4'}
+    plant = {'species': 999999, 'purchase_date': '2024-04-01', 'location': 'Balkon', 'substrate': 'Bims'}
+    for url, body in (('/api/sowings', sowing), ('/api/plants', plant),
+                      ('/api/diary', {'date': '2024-05-01', 'note': 'x', 'species': 999999}),
+                      ('/api/checklist-templates', {'task': 'x', 'frequency': 'daily', 'species': 999999}),
+                      ('/api/plants', {**plant, 'species': 'Echinopsis'})):
+        response = client.post(url, json=body)
+        assert response.status_code == 400, url
+        assert 'Art-ID' in response.get_json()['error']
+
+    # Gültige IDs dürfen auch als Text kommen (Formularwerte)
+    assert client.post('/api/plants', json={**plant, 'species': '1'}).status_code == 200
+    assert count(app, 'SELECT COUNT(*) FROM sowing') == 0
+
+
+def test_unknown_species_in_batch_only_fails_that_mutation(client):
+    response = client.post('/api/batch', json={'client_id': 'tablet', 'mutations': [
+        {'id': 'a', 'kind': 'create_plant', 'data': {'species': 999999, 'purchase_date': '2024-04-01',
+                                                     'location': 'Balkon', 'substrate': 'Bims'}},
+        {'id': 'b', 'kind': 'create_plant', 'data': {'species': 1, 'purchase_date': '2024-04-01',
+                                                     'location': 'Balkon', 'substrate': 'Bims'}}]})
+    assert [r['status'] for r in response.get_json()['results']] == ['error', 'applied']
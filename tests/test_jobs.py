@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Hintergrund-Jobs: Import"""
+
+import time
+from datetime import datetime, timedelta
+
+import app as kaktus
+
+
+def wait_for_job(client, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/jobs/{job_id}').get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'Job {job_id} nicht fertig geworden')
+
+
+def run_job(client, kind, params):
+    response = client.post('/api/jobs', json={'kind': kind, 'params': params})
+    assert response.status_code == 202
+    return wait_for_job(client, response.get_json()['id'])
+
+
+def plant_row(species=1):
+    return {'species': species, 'purchase_date': '2024-04-01', 'location': 'Balkon', 'substrate': 'Bims'}
+
+
+def plant_count(app):
+    with app.app_context():
+        return kaktus.Plant.query.count()
+
+
+def test_import_by_name_and_id(client, app):
+    job = run_job(client, 'import', {
+        'plants': [plant_row(1), plant_row('Ancistrocactus pallidus')],
+        'diary': [{'date': '2024-04-02', 'note': 'Importiert'}],
+    })
+    assert job['status'] == 'done'
+    assert job['result']['imported'] == {'plants': 2, 'sowings': 0, 'diary': 1}
+    assert plant_count(app) == 2
+
+
+def test_import_rejects_unknown_species_id_before_writing(client, app):
+    job = run_job(client, 'import', {'plants': [plant_row(1)] * 600 + [plant_row(999999)]})
+    assert job['status'] == 'failed'
+    assert 'plants[600]' in job['error']
+    assert plant_count(app) == 0
+
+
+def test_import_is_all_or_nothing_on_database_errors(client, app):
+    # 600 gültige Pflanzen (mehr als ein Block), danach ein Eintrag, der erst beim Flush scheitert
+    job = run_job(client, 'import', {'plants': [plant_row(1)] * 600,
+                                     'diary': [{'date': '2024-04-02', 'note': None}]})
+    assert job['status'] == 'failed'
+    assert plant_count(app) == 0
+
+
+def _add_job(job_id, status, heartbeat_at):
+    kaktus.db.session.add(kaktus.Job(id=job_id, kind='export', status=status, owner='anderer-host:1:abcd',
+                                     heartbeat_at=heartbeat_at, created_at=heartbeat_at))
+    kaktus.db.session.commit()
+
+
+def test_recovery_keeps_jobs_of_live_processes(app):
+    now = datetime.utcnow()
+    with app.app_context():
+        _add_job('lebt', 'running', now)
+        _add_job('wartet', 'queued', now - timedelta(seconds=30))
+        _add_job('tot', 'running', now - timedelta(hours=1))
+    # Ein zweiter Prozess (Worker, datagen.py, benchmark.py) ruft init_db auf
+    kaktus.init_db()
+    with app.app_context():
+        status = dict(kaktus.db.session.execute(kaktus.db.select(kaktus.Job.id, kaktus.Job.status)).all())
+    assert status == {'lebt': 'running', 'wartet': 'queued', 'tot': 'failed'}
+
+
+def test_submitted_jobs_record_owner(client, app):
+    job = run_job(client, 'recompute_alerts', {})
+    with app.app_context():
+        stored = kaktus.db.session.get(kaktus.Job, job['id'])
+        assert stored.owner == kaktus.job_owner()
+        assert stored.heartbeat_at is not None
+
+
+def test_old_jobs_are_purged_by_the_maintenance_job(client, app, tmp_path, monkeypatch):
+    old = datetime.utcnow() - timedelta(days=app.config['JOB_RETENTION_DAYS'] + 1)
+    result_file = tmp_path / 'alt_export.csv'
+    result_file.write_text('id\n')
+    with app.app_context():
+        _add_job('alt', 'done', old)
+        _add_job('ohne-datei', 'failed', old)
+        kaktus.db.session.get(kaktus.Job, 'alt').result_file = str(result_file)
+        kaktus.db.session.get(kaktus.Job, 'ohne-datei').result_file = str(tmp_path / 'fehlt.csv')
+        kaktus.db.session.commit()
+
+    # Schlägt der Commit fehl, bleibt die Datei zum noch vorhandenen Job erhalten
+    def locked():
+        raise kaktus.OperationalError('COMMIT', {}, Exception('database is locked'))
+    with app.app_context():
+        monkeypatch.setattr(kaktus.db.session, 'commit', locked)
+        try:
+            kaktus.purge_old_jobs()
+        except kaktus.OperationalError:
+            kaktus.db.session.rollback()
+        monkeypatch.undo()
+    assert result_file.exists()
+
+    # Neue Jobs räumen nicht mehr auf, das erledigt der tägliche Wartungsjob
+    run_job(client, 'recompute_alerts', {})
+    with app.app_context():
+        assert kaktus.db.session.get(kaktus.Job, 'alt') is not None
+
+    job = run_job(client, 'purge_jobs', {})
+    assert job['result']['removed'] == 2
+    assert not result_file.exists()
+    with app.app_context():
+        assert kaktus.db.session.get(kaktus.Job, 'alt') is None
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Request-Metriken und Profiler, auch bei Fehlern in der View"""
+
+import pytest
+
+import app as kaktus
+
+
+def requests_total(client, endpoint, status):
+    line = f'kaktus_requests_total{{endpoint="{endpoint}",method="GET",status="{status}"}} '
+    for row in client.get('/api/metrics').get_data(as_text=True).splitlines():
+        if row.startswith(line):
+            return int(row[len(line):])
+    return 0
+
+
+def test_requests_are_counted_with_status(client):
+    before = requests_total(client, 'get_job', 404)
+    assert client.get('/api/jobs/gibtsnicht').status_code == 404
+    assert requests_total(client, 'get_job', 404) == before + 1
+
+
+def test_failed_view_is_counted_and_stops_the_profiler(client, tmp_path, monkeypatch):
+    def broken(job_id):
+        raise RuntimeError('kaputt')
+
+    before = requests_total(client, 'get_job', 500)
+    monkeypatch.setitem(kaktus.app.view_functions, 'get_job', broken)
+    monkeypatch.setitem(kaktus.app.config, 'PROFILE_SAMPLE_RATE', 1.0)
+    monkeypatch.setitem(kaktus.app.config, 'PROFILE_DIR', str(tmp_path / 'profiles'))
+
+    with pytest.raises(RuntimeError):
+        client.get('/api/jobs/egal')
+
+    monkeypatch.setitem(kaktus.app.config, 'PROFILE_SAMPLE_RATE', 0)
+    assert requests_total(client, 'get_job', 500) == before + 1
+    assert [p.name.split('_2')[0] for p in (tmp_path / 'profiles').iterdir()] == ['get_job']
+    # Der Profiler ist gestoppt: ein neuer lässt sich im selben Thread wieder starten
+    monkeypatch.setitem(kaktus.app.config, 'PROFILE_SAMPLE_RATE', 1.0)
+    assert client.get('/api/metrics').status_code == 200
+    assert len(list((tmp_path / 'profiles').iterdir())) == 2
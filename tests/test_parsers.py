@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Pflegetexte → Tage: Gießhinweise und Keimfenster"""
+
+import pytest
+from sqlalchemy import text
+
+import app as kaktus
+
+
+@pytest.mark.parametrize('guidance, days', [
+    # Standardtext neuer Arten und Stenocactus zacatecasensis: gießen, sobald es trocken ist
+    ('Mäßig, wenn Substrat trocken', 14),
+    ('Gießen wenn trocken', 14),
+    ('Reichlich, aber zwischendurch trocken werden lassen', 7),
+    ('Mäßig, alle 2 Wochen', 14),
+    ('Alle 10 Tage', 10),
+    ('Regelmäßig, aber mäßig', 14),
+    ('Sehr sparsam bis gar nicht', 28),
+    ('Sparsam, wenn geschrumpft', 21),
+    ('Minimal, nur nebeln', 42),
+    ('Fast trocken', 42),
+    # Ausdrücklich trocken halten
+    ('Absolut trocken', 0),
+    ('Trocken halten', 0),
+    ('Knochentrocken und kalt', 0),
+    ('Trocken (zieht ein)', 0),
+    ('Warm und trocken', 0),
+    ('Nebeln statt gießen', 0),
+    ('', None),
+    ('Nach Gefühl', None),
+])
+def test_parse_watering_interval(guidance, days):
+    assert kaktus.parse_watering_interval(guidance) == days
+
+
+@pytest.mark.parametrize('window, days', [
+    ('3-14 Tage', (3, 14)),
+    ('2-4 Wochen', (14, 28)),
+    ('1 Woche', (7, 7)),
+    ('Wochen-Monate', (14, 60)),
+    ('unbekannt', None),
+])
+def test_parse_germination_window(window, days):
+    assert kaktus.parse_germination_window(window) == days
+
+
+def test_seeded_species_get_watering_days(db):
+    species = kaktus.Species.query.filter_by(name='Stenocactus zacatecasensis').one()
+    assert species.water_days_summer == 14
+
+
+def test_existing_database_is_reparsed_once(app, db):
+    # Stand vor der Korrektur: "Mäßig, wenn Substrat trocken" als "trocken halten" gespeichert
+    with db.engine.begin() as conn:
+        conn.execute(text("UPDATE species SET water_days_summer = 0 WHERE name = 'Stenocactus zacatecasensis'"))
+        conn.execute(text("UPDATE care_threshold SET water_warn_days = NULL WHERE season = 'summer' AND species_id = "
+                          "(SELECT id FROM species WHERE name = 'Stenocactus zacatecasensis')"))
+        conn.execute(text("DELETE FROM schema_migration WHERE name = 'reparse_watering_guidance'"))
+    kaktus.upgrade_database()
+
+    with db.engine.connect() as conn:
+        assert conn.scalar(text("SELECT water_days_summer FROM species "
+                                "WHERE name = 'Stenocactus zacatecasensis'")) == 14
+        assert conn.scalar(text("SELECT t.water_warn_days FROM care_threshold t JOIN species s ON s.id = t.species_id "
+                                "WHERE s.name = 'Stenocactus zacatecasensis' AND t.season = 'summer'")) == 14
+
+    # Als erledigt vermerkt - spätere Starts rechnen nicht erneut
+    with db.engine.connect() as conn:
+        assert conn.scalar(text("SELECT COUNT(*) FROM schema_migration "
+                                "WHERE name = 'reparse_watering_guidance'")) == 1
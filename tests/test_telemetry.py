@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Telemetrie: Annahme, Puffer, Duplikate und Aggregate"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import app as kaktus
+
+# 2024-05-01 12:00:00 UTC, Anfang einer Stunde
+HOUR = 1714564800
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    """Eigener Puffer pro Test, ohne Schreib-Thread (POST schreibt sofort)"""
+    buffer = kaktus.TelemetryBuffer()
+    monkeypatch.setattr(kaktus, 'telemetry_buffer', buffer)
+    return buffer
+
+
+def reading(ts, temperature, sensor='gh-1', **extra):
+    return {'sensor': sensor, 'location': 'Gewächshaus links', 'ts': ts, 'temperature': temperature, **extra}
+
+
+def hourly(client, sensor='gh-1'):
+    response = client.get(f'/api/telemetry?sensor={sensor}&resolution=hour&from={HOUR}&to={HOUR + 3599}')
+    return response.get_json()['sensors'][0]['points']
+
+
+def test_readings_are_written_once_and_rolled_up(client, buffer):
+    readings = [reading(HOUR, 20.0, humidity=40), reading(HOUR + 60, 24.0, humidity=50)]
+    response = client.post('/api/telemetry', json={'readings': readings + [readings[0]]})
+    assert response.status_code == 202
+    assert response.get_json()['buffered'] == 0
+
+    # Erneut gesendete Werte zählen nicht doppelt in den Aggregaten
+    client.post('/api/telemetry', json={'readings': readings})
+    [point] = hourly(client)
+    assert point['count'] == 2
+    assert point['temperature_avg'] == 22.0
+    assert (point['temperature_min'], point['temperature_max']) == (20.0, 24.0)
+    assert point['humidity_avg'] == 45.0
+
+    [sensor] = client.get('/api/telemetry/sensors').get_json()
+    assert (sensor['sensor'], sensor['location']) == ('gh-1', 'Gewächshaus links')
+
+
+def test_invalid_readings_are_rejected_individually(client, buffer):
+    response = client.post('/api/telemetry', json={'readings': [
+        reading(HOUR, 21.5), reading(HOUR + 60, 120), {'sensor': 'gh-1'}, 'kaputt']})
+    body = response.get_json()
+    assert response.status_code == 202
+    assert body['accepted'] == 1
+    assert [error['index'] for error in body['rejected']] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('payload', [[reading(HOUR, 21.5)], {'readings': {'sensor': 'gh-1'}}, 'text'])
+def test_payload_must_be_an_object_with_a_list(client, buffer, payload):
+    assert client.post('/api/telemetry', json=payload).status_code == 400
+
+
+def test_failed_batch_is_written_row_by_row(client, buffer, monkeypatch):
+    write_readings = kaktus.write_readings
+
+    def fail_on_broken(readings):
+        if any(name == 'kaputt' for name, *_ in readings):
+            raise IntegrityError('INSERT INTO sensor', {}, Exception('UNIQUE constraint failed: sensor.name'))
+        return write_readings(readings)
+
+    monkeypatch.setattr(kaktus, 'write_readings', fail_on_broken)
+    response = client.post('/api/telemetry', json={'readings': [
+        reading(HOUR, 21.5), reading(HOUR, 21.5, sensor='kaputt'), reading(HOUR + 60, 22.5)]})
+    assert response.status_code == 202
+
+    # Der nicht speicherbare Wert wird verworfen und hält die übrigen nicht auf
+    assert len(buffer) == 0
+    assert hourly(client)[0]['count'] == 2
+    client.post('/api/telemetry', json={'readings': [reading(HOUR + 120, 23.5)]})
+    assert hourly(client)[0]['count'] == 3
+
+
+def test_lock_errors_keep_the_readings(client, buffer, monkeypatch):
+    write_readings = kaktus.write_readings
+
+    def locked_once(readings):
+        monkeypatch.setattr(kaktus, 'write_readings', write_readings)
+        raise OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+
+    monkeypatch.setattr(kaktus, 'write_readings', locked_once)
+    response = client.post('/api/telemetry', json={'readings': [reading(HOUR, 21.5)]})
+    assert response.get_json()['buffered'] == 1
+
+    client.post('/api/telemetry', json={'readings': [reading(HOUR + 60, 22.5)]})
+    assert len(buffer) == 0
+    assert hourly(client)[0]['count'] == 2
+
+
+@pytest.mark.parametrize('broken', [
+    {'ts': 1e30}, {'ts': float('inf')}, {'ts': 0}, {'ts': '9' * 30},
+    {'location': {'raum': 'Balkon'}}, {'location': 'x' * 101}, {'sensor': ['gh-1']}, {'sensor': ''},
+])
+def test_readings_that_cannot_be_stored_are_rejected(client, buffer, broken):
+    response = client.post('/api/telemetry', json={'readings': [reading(HOUR, 21.5), {**reading(HOUR + 60, 22.5), **broken}]})
+    assert response.get_json()['accepted'] == 1
+    assert [error['index'] for error in response.get_json()['rejected']] == [1]
+    assert len(buffer) == 0
+
+
+def test_existing_sensor_is_reused_and_relocated(client, buffer):
+    client.post('/api/telemetry', json={'readings': [reading(HOUR, 21.5)]})
+    client.post('/api/telemetry', json={'readings': [
+        {'sensor': 'gh-1', 'location': 'Balkon', 'ts': HOUR + 60, 'temperature': 18}]})
+
+    sensors = client.get('/api/telemetry/sensors').get_json()
+    assert [(s['sensor'], s['location']) for s in sensors] == [('gh-1', 'Balkon')]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Schreibende Routen antworten bei dauerhaft gesperrter Datenbank mit 503 statt 500"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app as kaktus
+
+
+def _locked(*args, **kwargs):
+    raise OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setitem(kaktus.app.config, 'WRITE_RETRIES', 2)
+    monkeypatch.setitem(kaktus.app.config, 'WRITE_RETRY_BACKOFF', 0)
+
+
+@pytest.mark.parametrize('path, payload', [
+    ('/api/jobs', {'kind': 'export'}),
+    ('/api/backups', {}),
+    ('/api/archive', {'days': 365}),
+])
+def test_job_routes_return_503_when_locked(client, monkeypatch, no_backoff, path, payload):
+    monkeypatch.setattr(kaktus, 'submit_job', _locked)
+    response = client.post(path, json=payload)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_retry_succeeds_after_transient_lock(client, monkeypatch, no_backoff):
+    calls = []
+    original = kaktus.submit_job
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            _locked()
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(kaktus, 'submit_job', flaky)
+    response = client.post('/api/jobs', json={'kind': 'recompute_alerts'})
+    assert response.status_code == 202
+    assert len(calls) == 2